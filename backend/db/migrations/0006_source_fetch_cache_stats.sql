@@ -0,0 +1,3 @@
+ALTER TABLE source_fetch_events ADD COLUMN cache_hits INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE source_fetch_events ADD COLUMN cache_misses INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE source_fetch_events ADD COLUMN cache_not_modified INTEGER NOT NULL DEFAULT 0;
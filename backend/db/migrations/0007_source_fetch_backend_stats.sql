@@ -0,0 +1 @@
+ALTER TABLE source_fetch_events ADD COLUMN backend_stats_json TEXT NOT NULL DEFAULT '{}';
@@ -0,0 +1,12 @@
+CREATE TABLE IF NOT EXISTS backend_scoreboard (
+  host TEXT NOT NULL,
+  backend TEXT NOT NULL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  successes INTEGER NOT NULL DEFAULT 0,
+  success_ewma REAL NOT NULL DEFAULT 0,
+  latency_ewma_ms REAL NOT NULL DEFAULT 0,
+  last_success_at TEXT,
+  last_failure_at TEXT,
+  updated_at TEXT NOT NULL,
+  PRIMARY KEY (host, backend)
+);
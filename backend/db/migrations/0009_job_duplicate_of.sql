@@ -0,0 +1,4 @@
+ALTER TABLE jobs ADD COLUMN duplicate_of TEXT NOT NULL DEFAULT '';
+
+CREATE INDEX IF NOT EXISTS idx_jobs_duplicate_of
+  ON jobs(duplicate_of);
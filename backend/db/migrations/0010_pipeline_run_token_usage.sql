@@ -0,0 +1,4 @@
+ALTER TABLE pipeline_runs ADD COLUMN llm_prompt_tokens INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE pipeline_runs ADD COLUMN llm_completion_tokens INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE pipeline_runs ADD COLUMN llm_cached_tokens INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE pipeline_runs ADD COLUMN llm_cost_usd REAL NOT NULL DEFAULT 0;
@@ -0,0 +1,4 @@
+ALTER TABLE pipeline_runs ADD COLUMN derived_from TEXT;
+UPDATE pipeline_runs
+SET derived_from = json_extract(summary_json, '$.rerank_of')
+WHERE json_valid(summary_json) AND json_extract(summary_json, '$.rerank_of') IS NOT NULL;
@@ -12,10 +12,14 @@ from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
 from job_search.auth import normalize_auth_config, validate_auth_config
+from job_search.backend_scoreboard import scoreboard_from_config
 from job_search.cover_letter import generate_cover_letter
+from job_search.json_io import load_json
 from job_search.models import CoverLetterRecord
 from job_search.models import FeedbackEventRecord
 from job_search.observability import emit_metric, log_event
+from job_search.paths import CONFIG
+from job_search.rerank import rerank_run
 from job_search.ui_pages import board_html as _board_page_html
 from job_search.ui_pages import dashboard_html as _dashboard_page_html
 from job_search.ui_pages import workspace_html as _workspace_page_html
@@ -262,6 +266,7 @@ def _is_api_get_path(path: str) -> bool:
         "/applications/workspace",
         "/cover-letters",
         "/sources/health",
+        "/sources/backends",
         "/metrics",
         "/feedback",
     }
@@ -273,6 +278,8 @@ def _is_api_get_path(path: str) -> bool:
 
 
 def _is_api_post_path(path: str) -> bool:
+    if path.startswith("/runs/") and path.endswith("/rerank"):
+        return True
     return path in {
         "/applications",
         "/applications/bulk",
@@ -292,6 +299,7 @@ _LEGACY_GET_API_PATHS = {
     "/applications/workspace",
     "/cover-letters",
     "/sources/health",
+    "/sources/backends",
     "/metrics",
     "/feedback",
 }
@@ -542,6 +550,16 @@ def build_handler(repo, profile: dict | None = None, auth_config: dict | None =
                 self._write_json(200, {"sources": rows})
                 return True
 
+            if path == "/sources/backends":
+                # Same thresholds as the pipeline, so "dead" here means the pipeline skips it too.
+                runtime_cfg = load_json(CONFIG / "runtime.json", default={})
+                scoreboard = scoreboard_from_config(
+                    repo.get_backend_scoreboard(),
+                    runtime_cfg.get("backend_scoreboard") if isinstance(runtime_cfg, dict) else None,
+                )
+                self._write_json(200, {"hosts": scoreboard.summary()})
+                return True
+
             if path == "/metrics":
                 self._write_json(200, {"api_metrics": api_metrics})
                 return True
@@ -588,6 +606,25 @@ def build_handler(repo, profile: dict | None = None, auth_config: dict | None =
                     self._write_json(409, {"started": False, "message": "pipeline already running", "run": run_state})
                 return True
 
+            if path.startswith("/runs/") and path.endswith("/rerank"):
+                run_id = path[len("/runs/") : -len("/rerank")].strip("/")
+                if not run_id:
+                    self._not_found()
+                    return True
+                run_state = run_controller.get_active()
+                if run_state.get("running"):
+                    # The running pipeline writes the same cache and run tables.
+                    self._write_json(409, {"message": "pipeline already running", "run": run_state})
+                    return True
+                payload = self._read_json_body() if int(self.headers.get("Content-Length") or 0) > 0 else {}
+                try:
+                    summary = rerank_run(repo, run_id, adaptive=bool(payload.get("adaptive", False)), user_id=user_id)
+                except LookupError:
+                    self._not_found()
+                    return True
+                self._write_json(201, {"run": summary})
+                return True
+
             if path == "/applications":
                 payload = self._read_json_body()
                 job_url = str(payload.get("job_url") or "").strip()
@@ -0,0 +1,151 @@
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+# Backends without history rank below a proven winner but above one that keeps failing.
+_PRIOR_SUCCESS = 0.75
+
+
+def scoreboard_host(url: str) -> str:
+    host = (urlparse(str(url or "")).hostname or "").strip().lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class BackendScoreboard:
+    """Per-host success-rate and latency EWMAs used to order fetch backends.
+
+    The backend with the best recent success rate (then lowest latency) goes first. A backend
+    is "dead" once it has `min_attempts` and its success EWMA drops below `dead_threshold`;
+    dead backends are skipped except for a probe that goes first on every `probe_every`-th fetch.
+    """
+
+    def __init__(
+        self,
+        rows: list[dict] | None = None,
+        alpha: float = 0.3,
+        dead_threshold: float = 0.2,
+        min_attempts: int = 3,
+        probe_every: int = 10,
+    ):
+        self.alpha = min(1.0, max(0.01, float(alpha)))
+        self.dead_threshold = float(dead_threshold)
+        self.min_attempts = max(1, int(min_attempts))
+        self.probe_every = max(1, int(probe_every))
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, str], dict] = {}
+        self._orders: dict[tuple[str, str], int] = {}
+        self._dirty: set[tuple[str, str]] = set()
+        for row in rows or []:
+            key = (str(row.get("host") or ""), str(row.get("backend") or ""))
+            if key[0] and key[1]:
+                self._entries[key] = {
+                    "attempts": int(row.get("attempts", 0) or 0),
+                    "successes": int(row.get("successes", 0) or 0),
+                    "success_ewma": float(row.get("success_ewma", _PRIOR_SUCCESS) or 0.0),
+                    "latency_ewma_ms": float(row.get("latency_ewma_ms", 0.0) or 0.0),
+                    "last_success_at": row.get("last_success_at"),
+                    "last_failure_at": row.get("last_failure_at"),
+                    "updated_at": row.get("updated_at"),
+                }
+
+    def _is_dead(self, entry: dict | None) -> bool:
+        return bool(entry) and entry["attempts"] >= self.min_attempts and entry["success_ewma"] < self.dead_threshold
+
+    def order(self, host: str, backends: list[str]) -> list[str]:
+        with self._lock:
+            live, dead = [], []
+            for backend in backends:
+                entry = self._entries.get((host, backend))
+                (dead if self._is_dead(entry) else live).append((backend, entry))
+            live.sort(
+                key=lambda item: (
+                    -round(item[1]["success_ewma"] if item[1] else _PRIOR_SUCCESS, 1),
+                    item[1]["latency_ewma_ms"] if item[1] else 0.0,
+                )
+            )
+            ordered = [backend for backend, _ in live]
+            probes, rest = [], []
+            for backend, _ in dead:
+                key = (host, backend)
+                count = self._orders.get(key, 0)
+                self._orders[key] = count + 1
+                (probes if count % self.probe_every == self.probe_every - 1 else rest).append(backend)
+            # A probe has to run before the winner, otherwise a recovered backend is never noticed.
+            # With every backend dead the whole fallback chain is still tried.
+            return probes + (ordered or rest)
+
+    def record(self, host: str, backend: str, ok: bool, latency_ms: int):
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            key = (host, backend)
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = {
+                    "attempts": 0,
+                    "successes": 0,
+                    "success_ewma": 1.0 if ok else 0.0,
+                    "latency_ewma_ms": float(latency_ms),
+                    "last_success_at": None,
+                    "last_failure_at": None,
+                    "updated_at": now,
+                }
+                self._entries[key] = entry
+            else:
+                entry["success_ewma"] += self.alpha * ((1.0 if ok else 0.0) - entry["success_ewma"])
+                entry["latency_ewma_ms"] += self.alpha * (float(latency_ms) - entry["latency_ewma_ms"])
+            entry["attempts"] += 1
+            entry["successes"] += 1 if ok else 0
+            entry["last_success_at" if ok else "last_failure_at"] = now
+            entry["updated_at"] = now
+            self._dirty.add(key)
+
+    def rows(self, dirty_only: bool = False) -> list[dict]:
+        with self._lock:
+            keys = sorted(self._dirty if dirty_only else self._entries)
+            out = []
+            for host, backend in keys:
+                entry = self._entries[(host, backend)]
+                out.append(
+                    {
+                        "host": host,
+                        "backend": backend,
+                        "attempts": int(entry["attempts"]),
+                        "successes": int(entry["successes"]),
+                        "success_ewma": round(float(entry["success_ewma"]), 4),
+                        "latency_ewma_ms": round(float(entry["latency_ewma_ms"]), 1),
+                        "last_success_at": entry["last_success_at"],
+                        "last_failure_at": entry["last_failure_at"],
+                        "updated_at": entry["updated_at"],
+                    }
+                )
+            return out
+
+    def summary(self) -> list[dict]:
+        """Rows grouped by host in current preference order, with a status per backend."""
+        by_host: dict[str, list[dict]] = {}
+        for row in self.rows():
+            by_host.setdefault(row["host"], []).append(row)
+        out = []
+        for host in sorted(by_host):
+            rows = {r["backend"]: r for r in by_host[host]}
+            with self._lock:
+                live = [b for b in rows if not self._is_dead(self._entries.get((host, b)))]
+                live.sort(key=lambda b: (-round(rows[b]["success_ewma"], 1), rows[b]["latency_ewma_ms"]))
+            backends = []
+            for idx, backend in enumerate(live + [b for b in rows if b not in live]):
+                status = "dead" if backend not in live else ("preferred" if idx == 0 else "fallback")
+                backends.append({**rows[backend], "rank": idx + 1, "status": status})
+            out.append({"host": host, "backends": backends})
+        return out
+
+
+def scoreboard_from_config(rows: list[dict] | None, cfg: dict | None) -> BackendScoreboard:
+    """Scoreboard over stored `rows` with the thresholds of `runtime.json` `backend_scoreboard`."""
+    cfg = cfg if isinstance(cfg, dict) else {}
+    return BackendScoreboard(
+        rows,
+        alpha=float(cfg.get("alpha", 0.3)),
+        dead_threshold=float(cfg.get("dead_threshold", 0.2)),
+        min_attempts=int(cfg.get("min_attempts", 3)),
+        probe_every=int(cfg.get("probe_every", 10)),
+    )
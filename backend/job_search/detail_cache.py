@@ -0,0 +1,130 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+_TRACKING_PARAMS = {"from", "tk", "vjs", "advn", "rc", "src", "ref", "refid", "cid", "campaign"}
+_DETAIL_FIELDS = ("title", "company", "location", "published", "description", "remote_hint")
+
+
+def normalize_detail_url(url: str) -> str:
+    """Cache key for a job detail page: lowercased host, no fragment, no tracking params."""
+    parts = urlparse(str(url or "").strip())
+    if not parts.scheme or not parts.netloc:
+        return str(url or "").strip().lower()
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=False)
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunparse(("https", host, path, "", urlencode(query), ""))
+
+
+def listing_fingerprint(job: dict) -> str:
+    """Fingerprint of the listing card; a changed title/company means the cached detail is stale."""
+    basis = "|".join(
+        " ".join(str(job.get(key) or "").lower().split()) for key in ("title", "company")
+    )
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
+
+
+class DetailCache:
+    """Cross-run store of extracted detail-page fields, keyed by normalized job URL.
+
+    Entries expire after `ttl_hours` or when the listing fingerprint no longer matches.
+    Only raw detail-page fields are stored, never the LLM-normalized `jobs` rows, so a hit
+    feeds the same text into the LLM cache key as the original fetch did.
+    """
+
+    def __init__(self, path: Path, ttl_hours: float = 168):
+        self.path = Path(path)
+        self.ttl = timedelta(hours=max(0.0, float(ttl_hours)))
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "stores": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS detail_pages (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                detail_json TEXT NOT NULL,
+                fetched_at TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def _incr(self, key: str):
+        self.stats[key] = int(self.stats.get(key, 0)) + 1
+
+    def get(self, job: dict) -> dict | None:
+        url = str(job.get("url") or "").strip()
+        if not url:
+            return None
+        key = normalize_detail_url(url)
+        fingerprint = listing_fingerprint(job)
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fingerprint, detail_json, fetched_at FROM detail_pages WHERE url_key = ?",
+                (key,),
+            ).fetchone()
+            if row is not None:
+                stored_fingerprint, detail_json, fetched_at = row
+                try:
+                    fresh = now - datetime.fromisoformat(fetched_at) <= self.ttl
+                except ValueError:
+                    fresh = False
+                if fresh and stored_fingerprint == fingerprint:
+                    self._incr("hits")
+                    return json.loads(detail_json)
+                self._incr("stale")
+
+        with self._lock:
+            self._incr("misses")
+        return None
+
+    def put(self, job: dict, detail: dict, kind: str):
+        url = str(job.get("url") or "").strip()
+        if not url or not isinstance(detail, dict):
+            return
+        payload = {k: detail[k] for k in _DETAIL_FIELDS if k in detail}
+        if not str(payload.get("description") or "").strip():
+            return
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO detail_pages (url_key, url, kind, fingerprint, detail_json, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_key) DO UPDATE SET
+                    url = excluded.url,
+                    kind = excluded.kind,
+                    fingerprint = excluded.fingerprint,
+                    detail_json = excluded.detail_json,
+                    fetched_at = excluded.fetched_at
+                """,
+                (
+                    normalize_detail_url(url),
+                    url,
+                    kind,
+                    listing_fingerprint(job),
+                    json.dumps(payload, ensure_ascii=False),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            self._conn.commit()
+            self._incr("stores")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,106 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+class FetchArchiveError(RuntimeError):
+    pass
+
+
+class FetchArchive:
+    """Content-addressed, gzip-compressed store of raw fetch results.
+
+    Bodies live once under `objects/<sha[:2]>/<sha>.gz`; every run appends one JSON line per
+    fetch (URL, backend, status, content type, body hash) to `runs/<run_id>.jsonl`.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}.gz"
+
+    def _run_index_path(self, run_id: str) -> Path:
+        safe = "".join(ch for ch in str(run_id) if ch.isalnum() or ch in "-_")
+        if not safe:
+            raise FetchArchiveError(f"invalid run id: {run_id!r}")
+        return self.root / "runs" / f"{safe}.jsonl"
+
+    def has_run(self, run_id: str) -> bool:
+        return self._run_index_path(run_id).exists()
+
+    def put_body(self, body: str) -> str:
+        data = str(body or "").encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(gzip.compress(data))
+            tmp.replace(path)
+        return digest
+
+    def get_body(self, digest: str) -> str:
+        path = self._object_path(digest)
+        if not path.exists():
+            raise FetchArchiveError(f"archived body {digest} is missing")
+        return gzip.decompress(path.read_bytes()).decode("utf-8")
+
+    def record(self, run_id: str, url: str, result) -> dict:
+        entry = {
+            "url": str(url),
+            "final_url": str(result.url or url),
+            "backend": str(result.backend),
+            "status_code": result.status_code,
+            "content_type": str(result.content_type or ""),
+            "sha256": self.put_body(result.text),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        index_path = self._run_index_path(run_id)
+        with self._lock:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            with index_path.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def load_run(self, run_id: str) -> list[dict]:
+        index_path = self._run_index_path(run_id)
+        if not index_path.exists():
+            raise FetchArchiveError(f"no fetch archive for run {run_id}")
+        entries = []
+        for line in index_path.read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+        return entries
+
+
+class ArchiveReplay:
+    """Serves a recorded run's fetches by URL; repeated URLs replay in recorded order."""
+
+    def __init__(self, archive: FetchArchive, run_id: str):
+        self.archive = archive
+        self.run_id = run_id
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[dict]] = {}
+        self._served: dict[str, int] = {}
+        self.stats = {"served": 0, "missing": 0}
+        for entry in archive.load_run(run_id):
+            self._entries.setdefault(entry["url"], []).append(entry)
+
+    def lookup(self, url: str) -> tuple[dict, str]:
+        with self._lock:
+            entries = self._entries.get(str(url))
+            if not entries:
+                self.stats["missing"] += 1
+                raise FetchArchiveError(f"{url} was not fetched in run {self.run_id}")
+            idx = self._served.get(url, 0)
+            self._served[url] = idx + 1
+            self.stats["served"] += 1
+            entry = entries[min(idx, len(entries) - 1)]
+        return entry, self.archive.get_body(entry["sha256"])
@@ -1,10 +1,22 @@
+import hashlib
 import json
+import os
 import subprocess
-from dataclasses import dataclass
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from pathlib import Path
+from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
+from job_search.backend_scoreboard import BackendScoreboard, scoreboard_host
+from job_search.fetch_archive import ArchiveReplay, FetchArchive, FetchArchiveError
+from job_search.http_pool import HostConnectionPool, pooled_get
 from job_search.paths import BASE
+from job_search.playwright_worker import PlaywrightWorker, default_worker_command
 
 
 class FetchBackendError(RuntimeError):
@@ -18,6 +30,8 @@ class FetchResult:
     url: str
     status_code: int | None = None
     content_type: str = "text/plain"
+    cache_status: str = ""
+    timings: dict = field(default_factory=dict)
 
 
 DEFAULT_USER_AGENT = (
@@ -41,13 +55,231 @@ def _coerce_headers(headers: dict | None) -> dict:
     return out
 
 
+class FetchStats:
+    """Thread-safe counters for fetches issued while a collector is active."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = {}
+        self._backends: dict[str, dict] = {}
+
+    def incr(self, key: str, value: int = 1):
+        with self._lock:
+            self._counters[key] = int(self._counters.get(key, 0)) + int(value)
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return int(self._counters.get(key, 0))
+
+    def observe_backend(self, backend: str, ok: bool, total_ms: int, timings: dict | None = None):
+        with self._lock:
+            row = self._backends.setdefault(backend, {"requests": 0, "failures": 0, "total_ms": 0})
+            row["requests"] += 1
+            row["failures"] += 0 if ok else 1
+            row["total_ms"] += int(total_ms)
+            for key, value in (timings or {}).items():
+                row[key] = int(row.get(key, 0)) + int(value)
+
+    def backend_summary(self) -> dict:
+        """Per-backend request counts with average timings (ms) per request."""
+        with self._lock:
+            out = {}
+            for backend, row in self._backends.items():
+                requests = max(1, int(row["requests"]))
+                summary = {"requests": int(row["requests"]), "failures": int(row["failures"])}
+                for key, value in row.items():
+                    if key.endswith("_ms"):
+                        summary[f"avg_{key}"] = int(value / requests)
+                    elif key not in summary:
+                        summary[key] = int(value)
+                out[backend] = summary
+            return out
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+
+_FETCH_STATS: ContextVar[FetchStats | None] = ContextVar("fetch_stats", default=None)
+
+
+@contextmanager
+def collect_fetch_stats():
+    stats = FetchStats()
+    token = _FETCH_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _FETCH_STATS.reset(token)
+
+
+def _record_fetch_stat(key: str, value: int = 1):
+    stats = _FETCH_STATS.get()
+    if stats is not None:
+        stats.incr(key, value)
+
+
+class HttpValidatorCache:
+    """On-disk store of response bodies plus their ETag/Last-Modified validators, one file per URL."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _entry_path(self, url: str) -> Path:
+        digest = hashlib.sha256(str(url).encode("utf-8", errors="ignore")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def get(self, url: str) -> dict | None:
+        path = self._entry_path(url)
+        if not path.exists():
+            return None
+        try:
+            entry = json.loads(path.read_text())
+        except Exception:
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url:
+            return None
+        if not entry.get("etag") and not entry.get("last_modified"):
+            return None
+        return entry
+
+    def put(self, url: str, body: str, etag: str, last_modified: str, content_type: str, status_code: int):
+        if not etag and not last_modified:
+            return
+        path = self._entry_path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": content_type,
+            "status_code": int(status_code),
+            "stored_at": datetime.now(timezone.utc).isoformat(),
+            "body": body,
+        }
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False))
+        tmp.replace(path)
+
+
+_HTTP_CACHE: HttpValidatorCache | None = None
+
+
+def configure_http_cache(root: Path | None) -> HttpValidatorCache | None:
+    """Enable (or with None, disable) conditional requests for the http backend."""
+    global _HTTP_CACHE
+    _HTTP_CACHE = HttpValidatorCache(root) if root is not None else None
+    return _HTTP_CACHE
+
+
+def _conditional_headers(url: str, headers: dict) -> tuple[dict, dict | None]:
+    cache = _HTTP_CACHE
+    if cache is None:
+        return headers, None
+    entry = cache.get(url)
+    if entry is None:
+        _record_fetch_stat("cache_misses")
+        return headers, None
+    _record_fetch_stat("cache_hits")
+    out = dict(headers)
+    if entry.get("etag"):
+        out["If-None-Match"] = str(entry["etag"])
+    if entry.get("last_modified"):
+        out["If-Modified-Since"] = str(entry["last_modified"])
+    return out, entry
+
+
+def _not_modified_result(url: str, entry: dict, backend: str) -> FetchResult:
+    _record_fetch_stat("cache_not_modified")
+    body = str(entry.get("body") or "")
+    _record_fetch_stat("cache_bytes_saved", len(body.encode("utf-8", errors="ignore")))
+    return FetchResult(
+        text=body,
+        backend=backend,
+        url=url,
+        status_code=int(entry.get("status_code") or 200),
+        content_type=str(entry.get("content_type") or "text/html"),
+        cache_status="not_modified",
+    )
+
+
+def _store_validators(url: str, result: FetchResult, etag: str, last_modified: str):
+    cache = _HTTP_CACHE
+    if cache is None or int(result.status_code or 0) != 200:
+        return
+    try:
+        cache.put(
+            url,
+            body=result.text,
+            etag=etag,
+            last_modified=last_modified,
+            content_type=result.content_type,
+            status_code=int(result.status_code or 200),
+        )
+    except OSError:
+        # The cache is an optimization; a full disk must not fail the fetch.
+        pass
+
+
 def _fetch_http(url: str, timeout_sec: int, headers: dict | None) -> FetchResult:
-    req = Request(url, headers=_coerce_headers(headers))
-    with urlopen(req, timeout=max(1, int(timeout_sec))) as resp:
-        text = resp.read().decode("utf-8", errors="ignore")
-        status = int(getattr(resp, "status", 200))
-        ctype = str(resp.headers.get("content-type") or "text/html")
-        return FetchResult(text=text, backend="http", url=str(resp.geturl() or url), status_code=status, content_type=ctype)
+    req_headers, cached = _conditional_headers(url, _coerce_headers(headers))
+    req = Request(url, headers=req_headers)
+    try:
+        started = time.monotonic()
+        with urlopen(req, timeout=max(1, int(timeout_sec))) as resp:
+            ttfb_ms = int((time.monotonic() - started) * 1000)
+            started = time.monotonic()
+            text = resp.read().decode("utf-8", errors="ignore")
+            transfer_ms = int((time.monotonic() - started) * 1000)
+            status = int(getattr(resp, "status", 200))
+            ctype = str(resp.headers.get("content-type") or "text/html")
+            result = FetchResult(
+                text=text,
+                backend="http",
+                url=str(resp.geturl() or url),
+                status_code=status,
+                content_type=ctype,
+                cache_status="revalidated" if cached else "",
+                timings={"ttfb_ms": ttfb_ms, "transfer_ms": transfer_ms},
+            )
+            _store_validators(url, result, str(resp.headers.get("etag") or ""), str(resp.headers.get("last-modified") or ""))
+            return result
+    except HTTPError as e:
+        if int(getattr(e, "code", 0)) == 304 and cached is not None:
+            return _not_modified_result(url, cached, backend="http")
+        raise
+
+
+_HTTP_POOL = HostConnectionPool()
+
+
+def reset_http_pools():
+    """Close pooled keep-alive connections and forget cached DNS answers (call at run end)."""
+    _HTTP_POOL.close()
+    _HTTP_POOL.dns_cache.clear()
+
+
+def _fetch_http_pooled(url: str, timeout_sec: int, headers: dict | None) -> FetchResult:
+    req_headers, cached = _conditional_headers(url, _coerce_headers(headers))
+    resp = pooled_get(_HTTP_POOL, url, headers=req_headers, timeout_sec=max(1, int(timeout_sec)))
+    status = int(resp["status"])
+    if status == 304 and cached is not None:
+        result = _not_modified_result(url, cached, backend="http_pooled")
+        result.timings = dict(resp["timings"])
+        return result
+    if status < 200 or status >= 400:
+        raise FetchBackendError(f"http_pooled returned status {status} for {url}")
+    result = FetchResult(
+        text=resp["body"].decode("utf-8", errors="ignore"),
+        backend="http_pooled",
+        url=str(resp["url"] or url),
+        status_code=status,
+        content_type=str(resp["headers"].get("content-type") or "text/html"),
+        cache_status="revalidated" if cached else "",
+        timings=dict(resp["timings"]),
+    )
+    _store_validators(url, result, str(resp["headers"].get("etag") or ""), str(resp["headers"].get("last-modified") or ""))
+    return result
 
 
 def _fetch_curl_cffi(url: str, timeout_sec: int, headers: dict | None) -> FetchResult:
@@ -69,7 +301,47 @@ def _fetch_curl_cffi(url: str, timeout_sec: int, headers: dict | None) -> FetchR
     return FetchResult(text=str(resp.text or ""), backend="curl_cffi", url=str(getattr(resp, "url", url)), status_code=status, content_type=ctype)
 
 
+_PLAYWRIGHT_WORKER: PlaywrightWorker | None = None
+
+
+def configure_playwright_worker(max_pages: int | None, command: list[str] | None = None) -> PlaywrightWorker | None:
+    """Route `playwright_cli` through one long-lived worker process; `None` restores per-URL processes.
+
+    The worker is spawned on first use, so runs that never fall through to Playwright pay nothing.
+    """
+    global _PLAYWRIGHT_WORKER
+    previous, _PLAYWRIGHT_WORKER = _PLAYWRIGHT_WORKER, None
+    if previous is not None:
+        previous.close()
+    if max_pages is not None:
+        _PLAYWRIGHT_WORKER = PlaywrightWorker(command or default_worker_command(max_pages))
+    return _PLAYWRIGHT_WORKER
+
+
+def _playwright_payload_result(payload, url: str) -> FetchResult:
+    if not isinstance(payload, dict):
+        raise FetchBackendError("playwright_cli returned unexpected payload")
+    if not bool(payload.get("ok")):
+        raise FetchBackendError(str(payload.get("error") or "playwright_cli returned ok=false"))
+
+    html = str(payload.get("html") or "")
+    if not html:
+        raise FetchBackendError("playwright_cli returned empty html")
+    status = int(payload.get("status") or 200)
+    resolved_url = str(payload.get("url") or url)
+    timings = {k: int(v) for k, v in (payload.get("timings") or {}).items() if isinstance(v, (int, float))}
+    return FetchResult(text=html, backend="playwright_cli", url=resolved_url, status_code=status, content_type="text/html", timings=timings)
+
+
 def _fetch_playwright_cli(url: str, timeout_sec: int, headers: dict | None) -> FetchResult:
+    worker = _PLAYWRIGHT_WORKER
+    if worker is not None:
+        try:
+            payload = worker.fetch(url, timeout_sec=timeout_sec, user_agent=_coerce_headers(headers).get("User-Agent", ""))
+        except Exception as e:
+            raise FetchBackendError(f"playwright_cli worker failed: {e}") from e
+        return _playwright_payload_result(payload, url)
+
     script_path = BASE / "scripts" / "playwright_fetch.mjs"
     if not script_path.exists():
         raise FetchBackendError(f"missing Playwright script: {script_path}")
@@ -95,79 +367,198 @@ def _fetch_playwright_cli(url: str, timeout_sec: int, headers: dict | None) -> F
         payload = json.loads(cp.stdout)
     except Exception as e:
         raise FetchBackendError(f"playwright_cli invalid JSON: {e}") from e
+    return _playwright_payload_result(payload, url)
 
-    if not isinstance(payload, dict):
-        raise FetchBackendError("playwright_cli returned unexpected payload")
-    if not bool(payload.get("ok")):
-        raise FetchBackendError(str(payload.get("error") or "playwright_cli returned ok=false"))
 
-    html = str(payload.get("html") or "")
-    if not html:
-        raise FetchBackendError("playwright_cli returned empty html")
-    status = int(payload.get("status") or 200)
-    resolved_url = str(payload.get("url") or url)
-    return FetchResult(text=html, backend="playwright_cli", url=resolved_url, status_code=status, content_type="text/html")
+def _run_openclaw(binary: list[str], args: list[str], timeout_sec: int, what: str) -> subprocess.CompletedProcess:
+    cp = subprocess.run([*binary, "browser", *args], capture_output=True, text=True, timeout=max(5, timeout_sec))
+    if cp.returncode != 0:
+        raise FetchBackendError((cp.stderr or cp.stdout or f"openclaw {what} failed").strip())
+    return cp
 
 
-def _fetch_openclaw_snapshot(url: str, timeout_sec: int, headers: dict | None) -> FetchResult:
-    timeout_ms = max(1000, int(timeout_sec) * 1000)
-    start_cp = subprocess.run(
-        ["openclaw", "browser", "start", "--browser-profile", "openclaw", "--json"],
-        capture_output=True,
-        text=True,
-        timeout=max(5, timeout_sec + 5),
-    )
-    if start_cp.returncode != 0:
-        raise FetchBackendError((start_cp.stderr or start_cp.stdout or "openclaw start failed").strip())
-
-    open_cp = subprocess.run(
-        ["openclaw", "browser", "open", url, "--browser-profile", "openclaw", "--json"],
-        capture_output=True,
-        text=True,
-        timeout=max(5, timeout_sec + 5),
-    )
-    if open_cp.returncode != 0:
-        raise FetchBackendError((open_cp.stderr or open_cp.stdout or "openclaw open failed").strip())
-
-    snap_cp = subprocess.run(
-        [
-            "openclaw",
-            "browser",
-            "snapshot",
-            "--browser-profile",
-            "openclaw",
-            "--json",
-            "--limit",
-            "18000",
-        ],
-        capture_output=True,
-        text=True,
-        timeout=max(5, timeout_sec + 10),
-    )
-    if snap_cp.returncode != 0:
-        raise FetchBackendError((snap_cp.stderr or snap_cp.stdout or "openclaw snapshot failed").strip())
+def _openclaw_snapshot_result(stdout: str, url: str, timings: dict) -> FetchResult:
     try:
-        payload = json.loads(snap_cp.stdout)
+        payload = json.loads(stdout)
     except Exception as e:
         raise FetchBackendError(f"openclaw snapshot invalid json: {e}") from e
     snap = str(payload.get("snapshot") or "")
     if not snap:
         raise FetchBackendError("openclaw snapshot was empty")
-    return FetchResult(text=snap, backend="openclaw_snapshot", url=str(payload.get("url") or url), status_code=200, content_type="text/openclaw-snapshot")
+    return FetchResult(
+        text=snap,
+        backend="openclaw_snapshot",
+        url=str(payload.get("url") or url),
+        status_code=200,
+        content_type="text/openclaw-snapshot",
+        timings=timings,
+    )
+
+
+def _openclaw_open_and_snapshot(binary: list[str], profile: str, url: str, timeout_sec: int, timings: dict) -> FetchResult:
+    started = time.monotonic()
+    _run_openclaw(binary, ["open", url, "--browser-profile", profile, "--json"], timeout_sec + 5, "open")
+    timings["open_ms"] = int((time.monotonic() - started) * 1000)
+    started = time.monotonic()
+    snap_cp = _run_openclaw(
+        binary,
+        ["snapshot", "--browser-profile", profile, "--json", "--limit", "18000"],
+        timeout_sec + 10,
+        "snapshot",
+    )
+    timings["snapshot_ms"] = int((time.monotonic() - started) * 1000)
+    return _openclaw_snapshot_result(snap_cp.stdout, url, timings)
+
+
+class OpenClawSession:
+    """Keeps one OpenClaw browser profile running across fetches.
+
+    `browser start` runs once (again only after a failed open), and open+snapshot pairs are
+    serialized because they drive the same browser tab.
+    """
+
+    def __init__(self, profile: str = "openclaw", binary: list[str] | None = None):
+        self.profile = profile
+        self.binary = list(binary or ["openclaw"])
+        self._lock = threading.Lock()
+        self._running = False
+        self.stats = {"starts": 0, "fetches": 0, "failures": 0, "start_ms": 0, "open_ms": 0, "snapshot_ms": 0}
+
+    def fetch(self, url: str, timeout_sec: int) -> FetchResult:
+        with self._lock:
+            timings = {"start_ms": 0}
+            if not self._running:
+                started = time.monotonic()
+                _run_openclaw(self.binary, ["start", "--browser-profile", self.profile, "--json"], timeout_sec + 5, "start")
+                timings["start_ms"] = int((time.monotonic() - started) * 1000)
+                self._running = True
+                self.stats["starts"] += 1
+            try:
+                result = _openclaw_open_and_snapshot(self.binary, self.profile, url, timeout_sec, timings)
+            except Exception:
+                self.stats["failures"] += 1
+                # The browser may have gone away underneath us; start it again on the next fetch.
+                self._running = False
+                raise
+            self.stats["fetches"] += 1
+            for key in ("start_ms", "open_ms", "snapshot_ms"):
+                self.stats[key] += int(timings.get(key, 0))
+            return result
+
+    def close(self):
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            try:
+                subprocess.run(
+                    [*self.binary, "browser", "stop", "--browser-profile", self.profile, "--json"],
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                )
+            except Exception:
+                pass
+
+
+_OPENCLAW_SESSION: OpenClawSession | None = None
+_OPENCLAW_LOCK = threading.Lock()
+
+
+def configure_openclaw_session(enabled: bool, binary: list[str] | None = None) -> OpenClawSession | None:
+    """Share one OpenClaw browser across `openclaw_snapshot` fetches; disabling stops the browser."""
+    global _OPENCLAW_SESSION
+    previous, _OPENCLAW_SESSION = _OPENCLAW_SESSION, None
+    if previous is not None:
+        previous.close()
+    if enabled:
+        _OPENCLAW_SESSION = OpenClawSession(binary=binary)
+    return _OPENCLAW_SESSION
+
+
+def _fetch_openclaw_snapshot(url: str, timeout_sec: int, headers: dict | None) -> FetchResult:
+    session = _OPENCLAW_SESSION
+    if session is not None:
+        return session.fetch(url, timeout_sec=int(timeout_sec))
+
+    timings = {}
+    # Without a session every fetch still drives the same profile's tab, so open+snapshot pairs
+    # from concurrent fetches must not interleave.
+    with _OPENCLAW_LOCK:
+        started = time.monotonic()
+        _run_openclaw(["openclaw"], ["start", "--browser-profile", "openclaw", "--json"], timeout_sec + 5, "start")
+        timings["start_ms"] = int((time.monotonic() - started) * 1000)
+        return _openclaw_open_and_snapshot(["openclaw"], "openclaw", url, int(timeout_sec), timings)
+
+
+def _observe_backend(backend: str, ok: bool, started: float, timings: dict | None = None):
+    stats = _FETCH_STATS.get()
+    if stats is not None:
+        stats.observe_backend(backend, ok=ok, total_ms=int((time.monotonic() - started) * 1000), timings=timings)
 
 
 _BACKEND_IMPL = {
     "http": _fetch_http,
+    "http_pooled": _fetch_http_pooled,
     "curl_cffi": _fetch_curl_cffi,
     "playwright_cli": _fetch_playwright_cli,
     "openclaw_snapshot": _fetch_openclaw_snapshot,
 }
 
 
+_BACKEND_SCOREBOARD: BackendScoreboard | None = None
+
+
+def configure_backend_scoreboard(scoreboard: BackendScoreboard | None) -> BackendScoreboard | None:
+    """Let `fetch_with_backends` reorder backends per host from `scoreboard`; `None` keeps config order."""
+    global _BACKEND_SCOREBOARD
+    _BACKEND_SCOREBOARD = scoreboard
+    return scoreboard
+
+
+_FETCH_ARCHIVE: tuple[FetchArchive, str] | None = None
+_FETCH_REPLAY: ArchiveReplay | None = None
+
+
+def configure_fetch_archive(archive: FetchArchive | None, run_id: str = "") -> None:
+    """Record every successful fetch of this run into `archive`; `None` stops recording."""
+    global _FETCH_ARCHIVE
+    _FETCH_ARCHIVE = (archive, run_id) if archive is not None else None
+
+
+def configure_fetch_replay(replay: ArchiveReplay | None) -> None:
+    """Serve fetches exclusively from a recorded run (no network); `None` goes back to live fetching."""
+    global _FETCH_REPLAY
+    _FETCH_REPLAY = replay
+
+
+def _replay_fetch(replay: ArchiveReplay, url: str) -> FetchResult:
+    try:
+        entry, body = replay.lookup(url)
+    except FetchArchiveError as e:
+        raise FetchBackendError(str(e)) from e
+    return FetchResult(
+        text=body,
+        backend=str(entry.get("backend") or "replay"),
+        url=str(entry.get("final_url") or url),
+        status_code=entry.get("status_code"),
+        content_type=str(entry.get("content_type") or "text/plain"),
+        cache_status="replay",
+    )
+
+
 def fetch_with_backends(url: str, backends: list[str], timeout_sec: int = 30, headers: dict | None = None) -> FetchResult:
+    replay = _FETCH_REPLAY
+    if replay is not None:
+        return _replay_fetch(replay, url)
+
     candidates = [str(x or "").strip() for x in (backends or []) if str(x or "").strip()]
     if not candidates:
         candidates = ["http"]
+    scoreboard = _BACKEND_SCOREBOARD
+    host = scoreboard_host(url)
+    if scoreboard is not None and host and len(candidates) > 1:
+        candidates = scoreboard.order(host, candidates)
 
     last_error: Exception | None = None
     for backend in candidates:
@@ -175,11 +566,25 @@ def fetch_with_backends(url: str, backends: list[str], timeout_sec: int = 30, he
         if impl is None:
             last_error = FetchBackendError(f"unknown backend: {backend}")
             continue
+        started = time.monotonic()
         try:
-            return impl(url=url, timeout_sec=timeout_sec, headers=headers)
+            result = impl(url=url, timeout_sec=timeout_sec, headers=headers)
         except Exception as e:
+            _observe_backend(backend, ok=False, started=started)
+            if scoreboard is not None and host:
+                scoreboard.record(host, backend, ok=False, latency_ms=int((time.monotonic() - started) * 1000))
             last_error = e
             continue
+        _observe_backend(backend, ok=True, started=started, timings=result.timings)
+        if scoreboard is not None and host:
+            scoreboard.record(host, backend, ok=True, latency_ms=int((time.monotonic() - started) * 1000))
+        archive = _FETCH_ARCHIVE
+        if archive is not None:
+            try:
+                archive[0].record(archive[1], url, result)
+            except OSError:
+                _record_fetch_stat("archive_errors")
+        return result
     if last_error is None:
         raise FetchBackendError(f"no backends configured for {url}")
     raise FetchBackendError(str(last_error))
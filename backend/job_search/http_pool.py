@@ -0,0 +1,196 @@
+import gzip
+import http.client
+import socket
+import ssl
+import threading
+import time
+import zlib
+from urllib.parse import urljoin, urlsplit
+
+
+class PooledHttpError(RuntimeError):
+    pass
+
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+_MAX_REDIRECTS = 5
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    BrokenPipeError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+)
+
+
+class DnsCache:
+    """Memoizes getaddrinfo results for the lifetime of a pipeline run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, int], tuple] = {}
+
+    def resolve(self, host: str, port: int) -> tuple:
+        key = (host, int(port))
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None:
+            return cached
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        if not infos:
+            raise OSError(f"could not resolve {host}")
+        family, _, _, _, sockaddr = infos[0]
+        resolved = (family, sockaddr[0])
+        with self._lock:
+            self._entries[key] = resolved
+        return resolved
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class HostConnectionPool:
+    """Keeps idle keep-alive connections per (scheme, host, port)."""
+
+    def __init__(self, max_idle_per_host: int = 4, dns_cache: DnsCache | None = None):
+        self.max_idle_per_host = max(1, int(max_idle_per_host))
+        self.dns_cache = dns_cache or DnsCache()
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        self._ssl_context = ssl.create_default_context()
+
+    def _new_connection(self, scheme: str, host: str, port: int, timeout: float) -> http.client.HTTPConnection:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        dns_cache = self.dns_cache
+
+        def _create_connection(address, timeout=None, source_address=None):
+            _, ip = dns_cache.resolve(address[0], address[1])
+            return socket.create_connection((ip, address[1]), timeout, source_address)
+
+        # HTTPSConnection still wraps with server_hostname=self.host, so SNI and cert checks use the real name.
+        conn._create_connection = _create_connection
+        return conn
+
+    def acquire(self, scheme: str, host: str, port: int, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.get(key) or []
+            conn = idle.pop() if idle else None
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            return conn, True
+        return self._new_connection(scheme, host, port, timeout), False
+
+    def release(self, scheme: str, host: str, port: int, conn: http.client.HTTPConnection):
+        key = (scheme, host, port)
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+def decode_body(raw: bytes, content_encoding: str) -> bytes:
+    encoding = str(content_encoding or "").strip().lower()
+    if encoding in {"", "identity"}:
+        return raw
+    if encoding in {"gzip", "x-gzip"}:
+        return gzip.decompress(raw)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(raw)
+        except zlib.error:
+            # Some servers send raw deflate streams without the zlib header.
+            return zlib.decompress(raw, -zlib.MAX_WBITS)
+    raise PooledHttpError(f"unsupported content-encoding: {encoding}")
+
+
+def pooled_get(pool: HostConnectionPool, url: str, headers: dict, timeout_sec: float) -> dict:
+    """GET `url` over a pooled keep-alive connection, following redirects.
+
+    Returns status, headers, decoded body bytes, final URL and per-request timings
+    (connect/ttfb/transfer in ms, plus whether the connection was reused).
+    """
+    request_headers = dict(headers)
+    request_headers.setdefault("Accept-Encoding", "gzip, deflate")
+    request_headers.setdefault("Connection", "keep-alive")
+    current_url = url
+    timings = {"connect_ms": 0, "ttfb_ms": 0, "transfer_ms": 0, "reused": 0, "redirects": 0}
+
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urlsplit(current_url)
+        scheme = (parts.scheme or "http").lower()
+        if scheme not in {"http", "https"}:
+            raise PooledHttpError(f"unsupported scheme for http_pooled: {scheme}")
+        host = parts.hostname or ""
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        status, resp_headers, raw, will_close = None, None, b"", True
+        for attempt in range(2):
+            conn, reused = pool.acquire(scheme, host, port, timeout=timeout_sec)
+            try:
+                if conn.sock is None:
+                    started = time.monotonic()
+                    conn.connect()
+                    timings["connect_ms"] += int((time.monotonic() - started) * 1000)
+                started = time.monotonic()
+                conn.request("GET", path, headers=request_headers)
+                resp = conn.getresponse()
+                timings["ttfb_ms"] += int((time.monotonic() - started) * 1000)
+                started = time.monotonic()
+                raw = resp.read()
+                timings["transfer_ms"] += int((time.monotonic() - started) * 1000)
+                status = int(resp.status)
+                resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+                will_close = bool(resp.will_close)
+                timings["reused"] += 1 if reused else 0
+                break
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                # A reused socket may have been closed by the server while idle; retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+
+        if will_close:
+            conn.close()
+        else:
+            pool.release(scheme, host, port, conn)
+
+        if status in _REDIRECT_CODES and resp_headers.get("location"):
+            current_url = urljoin(current_url, resp_headers["location"])
+            timings["redirects"] += 1
+            continue
+
+        body = decode_body(raw, resp_headers.get("content-encoding", ""))
+        return {
+            "status": status,
+            "headers": resp_headers,
+            "body": body,
+            "url": current_url,
+            "timings": timings,
+        }
+    raise PooledHttpError(f"too many redirects for {url}")
@@ -1,13 +1,25 @@
 import json
 import html as html_lib
-import random
 import re
 import time
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
 from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
+from job_search.detail_cache import DetailCache
 from job_search.fetch_backends import FetchBackendError, fetch_with_backends
+from job_search.rate_limit import HOST_LIMITER, delay_range_to_pace, map_in_context, rate_limit_host
+
+_DETAIL_CACHE: DetailCache | None = None
+
+
+def configure_detail_cache(cache: DetailCache | None) -> DetailCache | None:
+    """Let detail enrichment reuse pages extracted in earlier runs; `None` closes and disables it."""
+    global _DETAIL_CACHE
+    previous, _DETAIL_CACHE = _DETAIL_CACHE, cache
+    if previous is not None and previous is not cache:
+        previous.close()
+    return cache
 
 
 def fetch_url(url: str, timeout: int = 20) -> str:
@@ -274,6 +286,8 @@ _INDEED_DETAIL_MIN_DESC_CHARS = 700
 _INDEED_DETAIL_MAX_JOBS = 20
 _INDEED_DETAIL_DELAY_MIN_MS = 150
 _INDEED_DETAIL_DELAY_MAX_MS = 450
+_KARRIERE_DETAIL_MIN_DESC_CHARS = 300
+_DEFAULT_HOST_CONCURRENCY = 3
 
 
 def _clean_snapshot_value(raw: str) -> str:
@@ -541,6 +555,7 @@ def _normalize_stepstone_strategy(source: dict) -> dict:
         "detail_delay_min_ms": delay_min_ms,
         "detail_delay_max_ms": delay_max_ms,
         "detail_enrich": enrich_details,
+        "max_concurrency": max(1, int(strategy.get("max_concurrency", _DEFAULT_HOST_CONCURRENCY))),
     }
 
 
@@ -567,6 +582,7 @@ def _normalize_indeed_strategy(source: dict) -> dict:
         "detail_delay_min_ms": delay_min_ms,
         "detail_delay_max_ms": delay_max_ms,
         "detail_enrich": enrich_details,
+        "max_concurrency": max(1, int(strategy.get("max_concurrency", _DEFAULT_HOST_CONCURRENCY))),
     }
 
 
@@ -761,6 +777,51 @@ def _merge_indeed_detail(job: dict, detail: dict):
         job["remote_hint"] = True
 
 
+def _pace_host(url: str, strategy: dict, default_min_ms: int, default_max_ms: int):
+    interval_sec, jitter_sec = delay_range_to_pace(
+        int(strategy.get("detail_delay_min_ms", default_min_ms)),
+        int(strategy.get("detail_delay_max_ms", default_max_ms)),
+    )
+    HOST_LIMITER.configure_host(
+        rate_limit_host(url),
+        interval_sec=interval_sec,
+        jitter_sec=jitter_sec,
+        max_in_flight=int(strategy.get("max_concurrency", _DEFAULT_HOST_CONCURRENCY)),
+    )
+
+
+def _select_detail_targets(enrichable: list[dict], detail_max_jobs: int, merge) -> list[dict]:
+    """Apply cached details and return the jobs that still need a detail fetch, within budget."""
+    detail_cache = _DETAIL_CACHE
+    targets = []
+    seen_urls = set()
+    for job in enrichable:
+        url = str(job.get("url") or "").strip()
+        if not url or url in seen_urls:
+            continue
+        # Cached details are free, so they do not count against detail_max_jobs.
+        cached = detail_cache.get(job) if detail_cache else None
+        if cached is not None:
+            seen_urls.add(url)
+            merge(job, cached)
+            continue
+        if len(targets) >= detail_max_jobs:
+            continue
+        seen_urls.add(url)
+        targets.append(job)
+    return targets
+
+
+def _fetch_pages_paced(urls: list[str], fetch_page, max_workers: int) -> list:
+    """Fetch listing/detail URLs concurrently; HOST_LIMITER keeps each host at its configured pace."""
+
+    def _run(url: str):
+        with HOST_LIMITER.acquire(url):
+            return fetch_page(url)
+
+    return map_in_context(_run, urls, max_workers=max_workers)
+
+
 def _enrich_indeed_with_detail_pages(jobs: list[dict], strategy: dict):
     if not jobs:
         return jobs
@@ -774,8 +835,6 @@ def _enrich_indeed_with_detail_pages(jobs: list[dict], strategy: dict):
 
     detail_backends = [str(x) for x in strategy.get("detail_backends", _INDEED_DEFAULT_DETAIL_BACKENDS)]
     timeout_sec = max(8, int(strategy.get("timeout_sec", 45)))
-    delay_min_ms = max(0, int(strategy.get("detail_delay_min_ms", _INDEED_DETAIL_DELAY_MIN_MS)))
-    delay_max_ms = max(delay_min_ms, int(strategy.get("detail_delay_max_ms", _INDEED_DETAIL_DELAY_MAX_MS)))
 
     enrichable = [
         j
@@ -787,27 +846,31 @@ def _enrich_indeed_with_detail_pages(jobs: list[dict], strategy: dict):
     if not enrichable:
         return jobs
 
-    processed = 0
-    seen_urls = set()
-    for job in enrichable:
-        if processed >= detail_max_jobs:
-            break
-        url = str(job.get("url") or "").strip()
-        if not url or url in seen_urls:
-            continue
-        seen_urls.add(url)
-        processed += 1
+    targets = _select_detail_targets(enrichable, detail_max_jobs, _merge_indeed_detail)
+    if not targets:
+        return jobs
+    for job in targets:
+        _pace_host(job["url"], strategy, _INDEED_DETAIL_DELAY_MIN_MS, _INDEED_DETAIL_DELAY_MAX_MS)
 
+    def _fetch_detail(url: str):
         try:
             fetched = fetch_with_backends(url=url, backends=detail_backends, timeout_sec=timeout_sec)
-            detail = _extract_indeed_jobposting_from_html(fetched.text)
-            _merge_indeed_detail(job, detail)
+            return _extract_indeed_jobposting_from_html(fetched.text)
         except Exception:
-            continue
+            return None
 
-        if delay_max_ms > 0:
-            sleep_ms = random.randint(delay_min_ms, delay_max_ms)
-            time.sleep(sleep_ms / 1000.0)
+    details = _fetch_pages_paced(
+        [str(j.get("url") or "").strip() for j in targets],
+        _fetch_detail,
+        max_workers=int(strategy.get("max_concurrency", _DEFAULT_HOST_CONCURRENCY)),
+    )
+    detail_cache = _DETAIL_CACHE
+    for job, detail in zip(targets, details):
+        if detail is None:
+            continue
+        if detail_cache is not None:
+            detail_cache.put(job, detail, kind="indeed")
+        _merge_indeed_detail(job, detail)
 
     return jobs
 
@@ -819,26 +882,33 @@ def fetch_indeed_jobs(source_name: str, source_type: str, base_url: str, pages:
     listing_backends = [str(x) for x in strategy.get("listing_backends", _INDEED_DEFAULT_LISTING_BACKENDS)]
     fetched_at = datetime.now(timezone.utc).isoformat()
 
-    out = []
-    blocked_errors: list[str] = []
-    for page in range(1, max(1, pages) + 1):
-        page_url = _indeed_page_url(base_url, page)
+    page_urls = [_indeed_page_url(base_url, page) for page in range(1, max(1, pages) + 1)]
+    _pace_host(base_url, strategy, _INDEED_DETAIL_DELAY_MIN_MS, _INDEED_DETAIL_DELAY_MAX_MS)
+
+    def _fetch_page(page_url: str):
         try:
-            fetched = fetch_with_backends(url=page_url, backends=listing_backends, timeout_sec=timeout_sec)
-            rows = parse_indeed_listing_html(
-                html_text=fetched.text,
-                source_name=source_name,
-                source_type=source_type,
-                fetched_at=fetched_at,
-                source_url=page_url,
-            )
-            out.extend(rows)
-            if not rows:
-                status_code = int(fetched.status_code or 0)
-                if status_code >= 400 or _looks_like_indeed_block_page(fetched.text):
-                    blocked_errors.append(f"listing blocked (status={status_code}) for {page_url}")
+            return fetch_with_backends(url=page_url, backends=listing_backends, timeout_sec=timeout_sec)
         except FetchBackendError:
+            return None
+
+    out = []
+    blocked_errors: list[str] = []
+    fetched_pages = _fetch_pages_paced(page_urls, _fetch_page, max_workers=strategy["max_concurrency"])
+    for page_url, fetched in zip(page_urls, fetched_pages):
+        if fetched is None:
             continue
+        rows = parse_indeed_listing_html(
+            html_text=fetched.text,
+            source_name=source_name,
+            source_type=source_type,
+            fetched_at=fetched_at,
+            source_url=page_url,
+        )
+        out.extend(rows)
+        if not rows:
+            status_code = int(fetched.status_code or 0)
+            if status_code >= 400 or _looks_like_indeed_block_page(fetched.text):
+                blocked_errors.append(f"listing blocked (status={status_code}) for {page_url}")
 
     if not out and blocked_errors:
         raise FetchBackendError("; ".join(blocked_errors)[:400])
@@ -1005,24 +1075,18 @@ def _enrich_stepstone_with_detail_pages(jobs: list[dict], strategy: dict):
 
     detail_backends = [str(x) for x in strategy.get("detail_backends", _STEPSTONE_DEFAULT_DETAIL_BACKENDS)]
     timeout_sec = max(5, int(strategy.get("timeout_sec", 35)))
-    delay_min_ms = max(0, int(strategy.get("detail_delay_min_ms", _STEPSTONE_DETAIL_DELAY_MIN_MS)))
-    delay_max_ms = max(delay_min_ms, int(strategy.get("detail_delay_max_ms", _STEPSTONE_DETAIL_DELAY_MAX_MS)))
 
     enrichable = [j for j in jobs if len(str(j.get("description") or "").strip()) < detail_min_chars]
     if not enrichable:
         return jobs
 
-    processed = 0
-    seen_urls = set()
-    for job in enrichable:
-        if processed >= detail_max_jobs:
-            break
-        url = str(job.get("url") or "").strip()
-        if not url or url in seen_urls:
-            continue
-        seen_urls.add(url)
-        processed += 1
+    targets = _select_detail_targets(enrichable, detail_max_jobs, _merge_stepstone_detail)
+    if not targets:
+        return jobs
+    for job in targets:
+        _pace_host(job["url"], strategy, _STEPSTONE_DETAIL_DELAY_MIN_MS, _STEPSTONE_DETAIL_DELAY_MAX_MS)
 
+    def _fetch_detail(url: str):
         try:
             fetched = fetch_with_backends(
                 url=url,
@@ -1030,16 +1094,23 @@ def _enrich_stepstone_with_detail_pages(jobs: list[dict], strategy: dict):
                 timeout_sec=timeout_sec,
             )
             if fetched.backend == "openclaw_snapshot":
-                detail = _extract_stepstone_detail_from_snapshot(fetched.text)
-            else:
-                detail = _extract_stepstone_jobposting_from_html(fetched.text)
-            _merge_stepstone_detail(job, detail)
+                return _extract_stepstone_detail_from_snapshot(fetched.text)
+            return _extract_stepstone_jobposting_from_html(fetched.text)
         except Exception:
-            continue
+            return None
 
-        if delay_max_ms > 0:
-            sleep_ms = random.randint(delay_min_ms, delay_max_ms)
-            time.sleep(sleep_ms / 1000.0)
+    details = _fetch_pages_paced(
+        [str(j.get("url") or "").strip() for j in targets],
+        _fetch_detail,
+        max_workers=int(strategy.get("max_concurrency", _DEFAULT_HOST_CONCURRENCY)),
+    )
+    detail_cache = _DETAIL_CACHE
+    for job, detail in zip(targets, details):
+        if detail is None:
+            continue
+        if detail_cache is not None:
+            detail_cache.put(job, detail, kind="stepstone")
+        _merge_stepstone_detail(job, detail)
 
     return jobs
 
@@ -1141,28 +1212,34 @@ def fetch_stepstone_jobs(source_name: str, source_type: str, base_url: str, page
     listing_backends = [str(x) for x in strategy.get("listing_backends", _STEPSTONE_DEFAULT_LISTING_BACKENDS)]
     fetched_at = datetime.now(timezone.utc).isoformat()
 
-    out = []
-    for page in range(1, max(1, pages) + 1):
-        page_url = _stepstone_page_url(base_url, page)
+    page_urls = [_stepstone_page_url(base_url, page) for page in range(1, max(1, pages) + 1)]
+    _pace_host(base_url, strategy, _STEPSTONE_DETAIL_DELAY_MIN_MS, _STEPSTONE_DETAIL_DELAY_MAX_MS)
+
+    def _fetch_page(page_url: str):
         try:
-            fetched = fetch_with_backends(url=page_url, backends=listing_backends, timeout_sec=timeout_sec)
-            if fetched.backend == "openclaw_snapshot":
-                rows = parse_stepstone_snapshot(
-                    snapshot=fetched.text,
-                    source_name=source_name,
-                    source_type=source_type,
-                    fetched_at=fetched_at,
-                )
-            else:
-                rows = parse_stepstone_listing_html(
-                    html_text=fetched.text,
-                    source_name=source_name,
-                    source_type=source_type,
-                    fetched_at=fetched_at,
-                )
-            out.extend(rows)
+            return fetch_with_backends(url=page_url, backends=listing_backends, timeout_sec=timeout_sec)
         except FetchBackendError:
+            return None
+
+    out = []
+    for fetched in _fetch_pages_paced(page_urls, _fetch_page, max_workers=strategy["max_concurrency"]):
+        if fetched is None:
             continue
+        if fetched.backend == "openclaw_snapshot":
+            rows = parse_stepstone_snapshot(
+                snapshot=fetched.text,
+                source_name=source_name,
+                source_type=source_type,
+                fetched_at=fetched_at,
+            )
+        else:
+            rows = parse_stepstone_listing_html(
+                html_text=fetched.text,
+                source_name=source_name,
+                source_type=source_type,
+                fetched_at=fetched_at,
+            )
+        out.extend(rows)
 
     # Keep first occurrence order by URL.
     deduped = []
@@ -1200,15 +1277,11 @@ def fetch_stepstone_via_browser(source_name: str, source_type: str, base_url: st
     )
 
 
-def enrich_job_detail(job):
-    url = job.get("url", "")
-    if "karriere.at/jobs/" not in url:
-        return job
-    try:
-        html = fetch_url(url, timeout=20)
-    except Exception:
-        return job
+def _is_karriere_detail_url(url: str) -> bool:
+    return "karriere.at/jobs/" in str(url or "")
+
 
+def _merge_karriere_detail(job: dict, html: str) -> dict:
     title = job.get("title", "")
     company = job.get("company", "")
     published = str(job.get("published") or "").strip()
@@ -1252,6 +1325,112 @@ def enrich_job_detail(job):
     }
 
 
+def enrich_job_detail(job):
+    url = job.get("url", "")
+    if not _is_karriere_detail_url(url):
+        return job
+    detail_cache = _DETAIL_CACHE
+    cached = detail_cache.get(job) if detail_cache is not None else None
+    if cached is not None:
+        return {**job, **cached}
+    try:
+        html = fetch_url(url, timeout=20)
+    except Exception:
+        return job
+    merged = _merge_karriere_detail(job, html)
+    if detail_cache is not None:
+        detail_cache.put(job, merged, kind="karriere")
+    return merged
+
+
+def _percentile(values: list[int], pct: float) -> int:
+    if not values:
+        return 0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round((pct / 100.0) * (len(ordered) - 1)))))
+    return int(ordered[idx])
+
+
+# Failed detail fetches kept verbatim in the run summary; the rest only show up in the counters.
+_ENRICHMENT_ERROR_SAMPLES = 10
+
+
+def enrich_job_details(
+    jobs: list[dict],
+    max_workers: int = 6,
+    per_domain_concurrency: int = 2,
+    requests_per_second: float = 3.0,
+    timeout: int = 20,
+) -> tuple[list[dict], dict]:
+    """Batch variant of enrich_job_detail that fetches detail pages on a worker pool.
+
+    Returns the jobs in input order (merged exactly like enrich_job_detail) plus
+    aggregate latency/failure stats and the first few fetch errors for the run summary.
+    """
+    out = list(jobs or [])
+    detail_cache = _DETAIL_CACHE
+    targets = []
+    cache_hits = 0
+    for idx, job in enumerate(out):
+        if not _is_karriere_detail_url(job.get("url", "")):
+            continue
+        cached = detail_cache.get(job) if detail_cache is not None else None
+        if cached is not None:
+            out[idx] = {**job, **cached}
+            cache_hits += 1
+        else:
+            targets.append(idx)
+    interval_sec = 1.0 / float(requests_per_second) if float(requests_per_second) > 0 else 0.0
+    for idx in targets:
+        HOST_LIMITER.configure_host(
+            rate_limit_host(out[idx].get("url", "")),
+            interval_sec=interval_sec,
+            max_in_flight=per_domain_concurrency,
+        )
+
+    def _fetch_detail(job: dict) -> tuple[str | None, str | None, int]:
+        url = str(job.get("url") or "")
+        with HOST_LIMITER.acquire(url):
+            started = time.monotonic()
+            try:
+                html = fetch_url(url, timeout=timeout)
+                return html, None, int((time.monotonic() - started) * 1000)
+            except Exception as e:
+                return None, str(e)[:220], int((time.monotonic() - started) * 1000)
+
+    latencies = []
+    errors = []
+    failed = 0
+    if targets:
+        results = map_in_context(lambda idx: _fetch_detail(out[idx]), targets, max_workers=max(1, int(max_workers)))
+        for idx, (html, error, latency_ms) in zip(targets, results):
+            job = out[idx]
+            latencies.append(latency_ms)
+            if html is not None:
+                out[idx] = _merge_karriere_detail(job, html)
+                if detail_cache is not None:
+                    detail_cache.put(job, out[idx], kind="karriere")
+                continue
+            failed += 1
+            if len(errors) < _ENRICHMENT_ERROR_SAMPLES:
+                errors.append({"url": str(job.get("url") or ""), "error": error})
+
+    stats = {
+        "candidates": len(targets),
+        "cache_hits": cache_hits,
+        "enriched": len(targets) - failed,
+        "failed": failed,
+        "latency_ms": {
+            "avg": int(sum(latencies) / len(latencies)) if latencies else 0,
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "max": max(latencies) if latencies else 0,
+        },
+        "errors": errors,
+    }
+    return out, stats
+
+
 def dedupe_jobs(jobs):
     seen = set()
     out = []
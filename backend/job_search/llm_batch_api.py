@@ -0,0 +1,220 @@
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from job_search.json_io import load_json, save_json
+from job_search.llm_scoring import _resolve_openai_api_key, openai_base_url
+
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+# Fields of a job the output validation needs when results arrive in a later process.
+_STATE_JOB_FIELDS = ("source", "source_type", "url", "title", "company", "location", "description", "published")
+
+
+class BatchApiError(RuntimeError):
+    pass
+
+
+class BatchApiClient:
+    """Minimal client for the OpenAI Files + Batches endpoints (upload, create, poll, download)."""
+
+    def __init__(self, api_key: str | None = None, base_url: str | None = None, timeout_sec: int = 60):
+        self.api_key = api_key if api_key is not None else _resolve_openai_api_key()
+        if not self.api_key:
+            raise BatchApiError("OPENAI_API_KEY is missing")
+        self.base_url = (base_url or openai_base_url()).rstrip("/")
+        self.timeout_sec = int(timeout_sec)
+
+    def _request(self, method: str, path: str, body: bytes | None = None, content_type: str = "") -> bytes:
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        if content_type:
+            headers["Content-Type"] = content_type
+        req = Request(f"{self.base_url}{path}", data=body, headers=headers, method=method)
+        try:
+            with urlopen(req, timeout=self.timeout_sec) as resp:
+                return resp.read()
+        except HTTPError as e:
+            detail = e.read().decode("utf-8", errors="ignore")[:300] if hasattr(e, "read") else ""
+            raise BatchApiError(f"{method} {path} failed with HTTP {e.code}: {detail}") from e
+
+    def _json(self, method: str, path: str, payload: dict | None = None) -> dict:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        raw = self._request(method, path, body, "application/json" if body is not None else "")
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except ValueError as e:
+            raise BatchApiError(f"{method} {path} returned invalid JSON") from e
+
+    def upload_jsonl(self, lines: list[str], filename: str = "batch_input.jsonl") -> str:
+        boundary = f"----jobsearch{uuid.uuid4().hex}"
+        content = ("\n".join(lines) + "\n").encode("utf-8")
+        body = b"".join(
+            [
+                f'--{boundary}\r\nContent-Disposition: form-data; name="purpose"\r\n\r\nbatch\r\n'.encode("utf-8"),
+                (
+                    f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+                    "Content-Type: application/jsonl\r\n\r\n"
+                ).encode("utf-8"),
+                content,
+                f"\r\n--{boundary}--\r\n".encode("utf-8"),
+            ]
+        )
+        raw = self._request("POST", "/files", body, f"multipart/form-data; boundary={boundary}")
+        file_id = str(json.loads(raw.decode("utf-8")).get("id") or "")
+        if not file_id:
+            raise BatchApiError("file upload returned no id")
+        return file_id
+
+    def create_batch(self, input_file_id: str, metadata: dict | None = None) -> dict:
+        return self._json(
+            "POST",
+            "/batches",
+            {
+                "input_file_id": input_file_id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": "24h",
+                "metadata": metadata or {},
+            },
+        )
+
+    def get_batch(self, batch_id: str) -> dict:
+        return self._json("GET", f"/batches/{batch_id}")
+
+    def download_file(self, file_id: str) -> str:
+        return self._request("GET", f"/files/{file_id}/content").decode("utf-8", errors="ignore")
+
+
+def batch_request_line(custom_id: str, model: str, system_prompt: str, user_prompt: str) -> str:
+    return json.dumps(
+        {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "response_format": {"type": "json_object"},
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+            },
+        },
+        ensure_ascii=False,
+    )
+
+
+def parse_batch_output(text: str) -> dict[str, dict | str]:
+    """custom_id -> parsed JSON content of the completion, or an error string."""
+    out: dict[str, dict | str] = {}
+    for line in str(text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            continue
+        custom_id = str(row.get("custom_id") or "")
+        if not custom_id:
+            continue
+        response = row.get("response") or {}
+        if row.get("error") or int(response.get("status_code") or 0) != 200:
+            out[custom_id] = str(row.get("error") or f"HTTP {response.get('status_code')}")[:220]
+            continue
+        try:
+            content = json.loads(response["body"]["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            out[custom_id] = "malformed batch result"
+            continue
+        out[custom_id] = content if isinstance(content, dict) else "malformed batch result"
+    return out
+
+
+class LlmBatchState:
+    """The one in-flight batch job, persisted so a later process can collect its results."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> dict | None:
+        try:
+            state = load_json(self.path, default={})
+        except ValueError:
+            return None
+        return state if state.get("batch_id") else None
+
+    def save(self, state: dict):
+        save_json(self.path, state)
+
+    def clear(self):
+        if self.path.exists():
+            self.path.unlink()
+
+
+def submit_llm_batch(
+    client: BatchApiClient,
+    state_store: LlmBatchState,
+    run_id: str,
+    items: list[tuple[dict, str, str, str]],
+    model: str,
+    prompt_version: str,
+) -> dict:
+    """Upload `items` (job, cache_key, system_prompt, user_prompt) as one batch and persist the state."""
+    lines, jobs = [], {}
+    for idx, (job, cache_key, system_prompt, user_prompt) in enumerate(items):
+        custom_id = f"job-{idx}"
+        lines.append(batch_request_line(custom_id, model, system_prompt, user_prompt))
+        jobs[custom_id] = {"cache_key": cache_key, "job": {k: job.get(k) for k in _STATE_JOB_FIELDS}}
+    input_file_id = client.upload_jsonl(lines, filename=f"llm_parse_{run_id}.jsonl")
+    batch = client.create_batch(input_file_id, metadata={"run_id": run_id, "prompt_version": prompt_version})
+    state = {
+        "batch_id": str(batch.get("id") or ""),
+        "input_file_id": input_file_id,
+        "status": str(batch.get("status") or "validating"),
+        "run_id": run_id,
+        "model": model,
+        "prompt_version": prompt_version,
+        "submitted_at": datetime.now(timezone.utc).isoformat(),
+        "jobs": jobs,
+    }
+    if not state["batch_id"]:
+        raise BatchApiError("batch creation returned no id")
+    state_store.save(state)
+    return state
+
+
+def poll_llm_batch(
+    client: BatchApiClient,
+    state_store: LlmBatchState,
+    state: dict,
+    wait_sec: float = 0,
+    poll_interval_sec: float = 30,
+) -> tuple[dict, dict[str, dict | str] | None]:
+    """Poll until the batch is terminal or `wait_sec` passes.
+
+    Returns (state, results); results is None while the batch is still running. Once the
+    batch is terminal the persisted state is cleared.
+    """
+    deadline = time.monotonic() + max(0.0, float(wait_sec))
+    while True:
+        batch = client.get_batch(state["batch_id"])
+        state = {**state, "status": str(batch.get("status") or "")}
+        if state["status"] in BATCH_TERMINAL_STATUSES:
+            break
+        state_store.save(state)
+        if time.monotonic() + poll_interval_sec > deadline:
+            return state, None
+        time.sleep(max(0.1, float(poll_interval_sec)))
+
+    results: dict[str, dict | str] = {}
+    for file_key in ("output_file_id", "error_file_id"):
+        file_id = str(batch.get(file_key) or "")
+        if file_id:
+            results.update(parse_batch_output(client.download_file(file_id)))
+    for custom_id in state.get("jobs", {}):
+        results.setdefault(custom_id, f"batch {state['status']} without a result")
+    state_store.clear()
+    return state, results
@@ -0,0 +1,359 @@
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from job_search.llm_parsing import load_llm_parse_cache
+
+# Columns added after the first release of the table; created on open when missing.
+_UPGRADE_COLUMNS = (
+    ("job_url", "TEXT NOT NULL DEFAULT ''"),
+    ("last_hit_at", "TEXT"),
+)
+
+
+@dataclass(frozen=True)
+class CacheMaintenancePolicy:
+    """What `LlmParseCache.evict` removes; zero/empty values disable a rule."""
+
+    ttl_days: float = 0
+    max_entries: int = 0
+    max_bytes: int = 0
+    purge_models: tuple[str, ...] = ()
+    purge_prompt_versions: tuple[str, ...] = ()
+    keep_prompt_versions: tuple[str, ...] = ()
+    reclaim_unseen_runs: int = 0
+
+
+def maintenance_policy_from_config(cfg: dict) -> CacheMaintenancePolicy:
+    cfg = cfg if isinstance(cfg, dict) else {}
+
+    def _names(key: str) -> tuple[str, ...]:
+        return tuple(str(x).strip() for x in (cfg.get(key) or []) if str(x).strip())
+
+    return CacheMaintenancePolicy(
+        ttl_days=max(0.0, float(cfg.get("ttl_days", 0) or 0)),
+        max_entries=max(0, int(cfg.get("max_entries", 0) or 0)),
+        max_bytes=max(0, int(float(cfg.get("max_mb", 0) or 0) * 1024 * 1024)),
+        purge_models=_names("purge_models"),
+        purge_prompt_versions=_names("purge_prompt_versions"),
+        keep_prompt_versions=_names("keep_prompt_versions"),
+        reclaim_unseen_runs=max(0, int(cfg.get("reclaim_unseen_runs", 0) or 0)),
+    )
+
+
+class LlmParseCache:
+    """SQLite-backed store of LLM parse+score results keyed by `llm_parse_cache_keys`.
+
+    Lookups and inserts touch one row each, so a run no longer parses and rewrites the whole
+    cache. The database is opened on first use; at that point a legacy `llm_parse_cache.json`
+    next to it is imported once and renamed to `*.migrated`.
+    """
+
+    def __init__(self, path: Path, legacy_json_path: Path | None = None):
+        self.path = Path(path)
+        self.legacy_json_path = Path(legacy_json_path) if legacy_json_path else None
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._hit_keys: set[str] = set()
+        self.migrated_entries = 0
+        # Per prompt_version lookups/hits of this process, for the run summary.
+        self.stats: dict[str, dict[str, int]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_parse_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL DEFAULT '',
+                prompt_version TEXT NOT NULL DEFAULT '',
+                payload_json TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(llm_parse_cache)").fetchall()}
+        for column, ddl in _UPGRADE_COLUMNS:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE llm_parse_cache ADD COLUMN {column} {ddl}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_parse_cache_job_url ON llm_parse_cache(job_url)")
+        conn.commit()
+        self._conn = conn
+        self._migrate_legacy_json(conn)
+        return conn
+
+    def _migrate_legacy_json(self, conn: sqlite3.Connection):
+        legacy = self.legacy_json_path
+        if legacy is None or not legacy.exists():
+            return
+        entries = load_llm_parse_cache(legacy).get("entries") or {}
+        rows = []
+        for key, value in entries.items():
+            if not isinstance(value, dict):
+                continue
+            rows.append(
+                (
+                    str(key),
+                    str(value.get("model") or ""),
+                    str(value.get("prompt_version") or ""),
+                    json.dumps(value, ensure_ascii=False),
+                    str(value.get("updated_at") or datetime.now(timezone.utc).isoformat()),
+                )
+            )
+        # Rows written by this store are newer than anything in the old snapshot.
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO llm_parse_cache (cache_key, model, prompt_version, payload_json, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+        )
+        conn.commit()
+        legacy.replace(legacy.with_name(legacy.name + ".migrated"))
+        self.migrated_entries = len(rows)
+
+    def lookup(self, keys: list[str], prompt_version: str = "") -> tuple[str, dict] | tuple[None, None]:
+        """First hit among `keys` (primary key first, then legacy keys)."""
+        keys = [str(k) for k in keys if k]
+        if not keys:
+            return None, None
+        with self._lock:
+            counters = self.stats.setdefault(str(prompt_version or ""), {"lookups": 0, "hits": 0})
+            counters["lookups"] += 1
+            conn = self._connect()
+            placeholders = ",".join("?" for _ in keys)
+            rows = dict(
+                conn.execute(
+                    f"SELECT cache_key, payload_json FROM llm_parse_cache WHERE cache_key IN ({placeholders})",
+                    keys,
+                ).fetchall()
+            )
+        for key in keys:
+            if key not in rows:
+                continue
+            try:
+                value = json.loads(rows[key])
+            except ValueError:
+                continue
+            if isinstance(value, dict):
+                with self._lock:
+                    counters["hits"] += 1
+                    # Hit times are flushed in one statement on close instead of a write per hit.
+                    self._hit_keys.add(key)
+                return key, value
+        return None, None
+
+    def latest_for_url(self, job_url: str, model: str = "", prompt_version: str = "") -> dict | None:
+        """Newest entry stored for `job_url`, optionally limited to one model and prompt version.
+
+        Used where the listing fields the cache key was built from are no longer at hand (offline re-ranking).
+        """
+        job_url = str(job_url or "").strip()
+        if not job_url:
+            return None
+        clauses, params = ["job_url = ?"], [job_url]
+        if model:
+            clauses.append("model = ?")
+            params.append(str(model))
+        if prompt_version:
+            clauses.append("prompt_version = ?")
+            params.append(str(prompt_version))
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                f"""
+                SELECT cache_key, payload_json FROM llm_parse_cache
+                WHERE {" AND ".join(clauses)}
+                ORDER BY updated_at DESC
+                LIMIT 1
+                """,
+                params,
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = json.loads(row[1])
+        except ValueError:
+            return None
+        if not isinstance(value, dict):
+            return None
+        with self._lock:
+            self._hit_keys.add(row[0])
+        return value
+
+    def get(self, key: str) -> dict | None:
+        return self.lookup([key])[1]
+
+    def put(self, key: str, value: dict, model: str = "", prompt_version: str = "", job_url: str = ""):
+        now = datetime.now(timezone.utc).isoformat()
+        payload = {**value, "updated_at": now, "model": model, "prompt_version": prompt_version}
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                """
+                INSERT INTO llm_parse_cache (cache_key, model, prompt_version, payload_json, updated_at, job_url)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    model = excluded.model,
+                    prompt_version = excluded.prompt_version,
+                    payload_json = excluded.payload_json,
+                    updated_at = excluded.updated_at,
+                    job_url = excluded.job_url
+                """,
+                (
+                    str(key),
+                    str(model or ""),
+                    str(prompt_version or ""),
+                    json.dumps(payload, ensure_ascii=False),
+                    now,
+                    str(job_url or "").strip(),
+                ),
+            )
+            conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            return int(conn.execute("SELECT COUNT(*) FROM llm_parse_cache").fetchone()[0])
+
+    def _flush_hits(self, conn: sqlite3.Connection):
+        if not self._hit_keys:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        conn.executemany(
+            "UPDATE llm_parse_cache SET last_hit_at = ? WHERE cache_key = ?",
+            [(now, key) for key in sorted(self._hit_keys)],
+        )
+        conn.commit()
+        self._hit_keys.clear()
+
+    def summary(self) -> dict:
+        """Entries and payload bytes per prompt_version, with this run's hit rate."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                """
+                SELECT prompt_version, COUNT(*), COALESCE(SUM(LENGTH(CAST(payload_json AS BLOB))), 0)
+                FROM llm_parse_cache
+                GROUP BY prompt_version
+                ORDER BY prompt_version ASC
+                """
+            ).fetchall()
+            stats = {k: dict(v) for k, v in self.stats.items()}
+        by_version = {}
+        for version in sorted({str(r[0]) for r in rows} | set(stats)):
+            counters = stats.get(version, {"lookups": 0, "hits": 0})
+            row = next((r for r in rows if str(r[0]) == version), None)
+            by_version[version] = {
+                "entries": int(row[1]) if row else 0,
+                "bytes": int(row[2]) if row else 0,
+                "lookups": counters["lookups"],
+                "hits": counters["hits"],
+                "hit_rate": round(counters["hits"] / counters["lookups"], 4) if counters["lookups"] else 0.0,
+            }
+        return {
+            "entries": sum(v["entries"] for v in by_version.values()),
+            "bytes": sum(v["bytes"] for v in by_version.values()),
+            "migrated_entries": self.migrated_entries,
+            "by_prompt_version": by_version,
+        }
+
+    def evict(
+        self,
+        policy: CacheMaintenancePolicy,
+        recent_urls: set[str] | None = None,
+        recent_since: str | None = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """Apply `policy`; returns the number of rows removed per rule.
+
+        URL reclamation only considers rows with a recorded job URL that were last written or
+        hit before `recent_since` (the oldest run in the window), so fresh entries survive.
+        """
+        removed = {"purged": 0, "expired": 0, "unseen": 0, "over_size": 0}
+        with self._lock:
+            conn = self._connect()
+            self._flush_hits(conn)
+
+            def _delete(keys: list[str]) -> int:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start : start + 500]
+                    placeholders = ",".join("?" for _ in chunk)
+                    conn.execute(f"DELETE FROM llm_parse_cache WHERE cache_key IN ({placeholders})", chunk)
+                return len(keys)
+
+            rows = conn.execute(
+                """
+                SELECT cache_key, model, prompt_version, job_url, COALESCE(last_hit_at, updated_at) AS used_at
+                FROM llm_parse_cache
+                """
+            ).fetchall()
+            doomed: dict[str, str] = {}
+            cutoff = (
+                (datetime.now(timezone.utc) - timedelta(days=policy.ttl_days)).isoformat() if policy.ttl_days > 0 else ""
+            )
+            for cache_key, model, prompt_version, job_url, used_at in rows:
+                if (
+                    model in policy.purge_models
+                    or prompt_version in policy.purge_prompt_versions
+                    or (policy.keep_prompt_versions and prompt_version not in policy.keep_prompt_versions)
+                ):
+                    doomed[cache_key] = "purged"
+                elif cutoff and str(used_at or "") < cutoff:
+                    doomed[cache_key] = "expired"
+                elif (
+                    recent_urls is not None
+                    and recent_since
+                    and job_url
+                    and job_url not in recent_urls
+                    and str(used_at or "") < recent_since
+                ):
+                    doomed[cache_key] = "unseen"
+            for reason in ("purged", "expired", "unseen"):
+                removed[reason] = _delete([k for k, r in doomed.items() if r == reason])
+
+            if policy.max_entries > 0 or policy.max_bytes > 0:
+                survivors = conn.execute(
+                    """
+                    SELECT cache_key, LENGTH(CAST(payload_json AS BLOB))
+                    FROM llm_parse_cache
+                    ORDER BY COALESCE(last_hit_at, updated_at) DESC, cache_key ASC
+                    """
+                ).fetchall()
+                kept_entries, kept_bytes, overflow = 0, 0, []
+                for cache_key, size in survivors:
+                    size = int(size or 0)
+                    if (policy.max_entries and kept_entries >= policy.max_entries) or (
+                        policy.max_bytes and kept_bytes + size > policy.max_bytes
+                    ):
+                        overflow.append(cache_key)
+                        continue
+                    kept_entries += 1
+                    kept_bytes += size
+                removed["over_size"] = _delete(overflow)
+
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+        return removed
+
+    def vacuum(self):
+        with self._lock:
+            self._connect().execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_hits(self._conn)
+                self._conn.close()
+                self._conn = None
+
@@ -0,0 +1,233 @@
+import re
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from urllib.error import HTTPError
+
+_RATE_LIMITED_RE = re.compile(r"\b429\b|too many requests", re.IGNORECASE)
+
+
+def is_rate_limited_error(error: BaseException) -> bool:
+    """True for an HTTP 429 (or an error whose message names one); drives requeues and AIMD cuts."""
+    if isinstance(error, HTTPError):
+        return int(getattr(error, "code", 0) or 0) == 429
+    return bool(_RATE_LIMITED_RE.search(str(error)))
+
+
+class AimdController:
+    """Additive-increase/multiplicative-decrease concurrency limit, updated on every completion.
+
+    A success grows the window by 1/window (about +1 per window of completions). A 429 cuts it by
+    `decrease_factor`; a completion slower than `latency_target_sec` or a timeout trims it by
+    `latency_decrease_factor`. Only jobs started after the previous cut can cut again, so a burst of
+    429s from requests already in flight counts as one congestion signal.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 64,
+        decrease_factor: float = 0.5,
+        latency_target_sec: float = 0.0,
+        latency_decrease_factor: float = 0.9,
+        clock=time.monotonic,
+    ):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.decrease_factor = min(0.95, max(0.1, float(decrease_factor)))
+        self.latency_target_sec = max(0.0, float(latency_target_sec))
+        self.latency_decrease_factor = min(0.99, max(self.decrease_factor, float(latency_decrease_factor)))
+        self._clock = clock
+        self._window = float(min(self.maximum, max(self.minimum, int(initial))))
+        self._last_decrease_at = float("-inf")
+        self.stats = {
+            "increases": 0,
+            "decreases": 0,
+            "rate_limited": 0,
+            "slow": 0,
+            "timeouts": 0,
+            "peak_limit": self.limit,
+            "min_limit": self.limit,
+        }
+
+    @property
+    def limit(self) -> int:
+        return int(self._window)
+
+    def _resize(self, window: float):
+        before = self.limit
+        self._window = min(float(self.maximum), max(float(self.minimum), window))
+        if self.limit > before:
+            self.stats["increases"] += 1
+        elif self.limit < before:
+            self.stats["decreases"] += 1
+        self.stats["peak_limit"] = max(self.stats["peak_limit"], self.limit)
+        self.stats["min_limit"] = min(self.stats["min_limit"], self.limit)
+
+    def _decrease(self, started_at: float, factor: float):
+        if started_at < self._last_decrease_at:
+            return
+        self._last_decrease_at = self._clock()
+        self._resize(self._window * factor)
+
+    def on_success(self, started_at: float, latency_sec: float):
+        if self.latency_target_sec and latency_sec > self.latency_target_sec:
+            self.stats["slow"] += 1
+            self._decrease(started_at, self.latency_decrease_factor)
+            return
+        self._resize(self._window + 1.0 / self._window)
+
+    def on_rate_limited(self, started_at: float):
+        self.stats["rate_limited"] += 1
+        self._decrease(started_at, self.decrease_factor)
+
+    def on_timeout(self, started_at: float):
+        self.stats["timeouts"] += 1
+        self._decrease(started_at, self.latency_decrease_factor)
+
+
+def run_work_queue(
+    items: list,
+    fn,
+    controller: AimdController,
+    on_done,
+    timeout_sec: float = 0,
+    is_rate_limited=is_rate_limited_error,
+    clock=time.monotonic,
+    rate_limit_retries: int = 0,
+) -> dict:
+    """Run `fn(item)` for every item on one persistent pool, keeping `controller.limit` jobs in flight.
+
+    `on_done(item, result, error)` is called on the calling thread as each job finishes. A job past
+    its `timeout_sec` deadline is reported as a TimeoutError and its slot is handed to the next item;
+    the abandoned call keeps its pool thread until it returns, and the pool shrinks by one until then.
+    A rate-limited job is put back at the front of the queue up to `rate_limit_retries` times, so `fn`
+    should not retry 429s itself: the controller only reacts to the ones it sees.
+    """
+    pool_size = controller.maximum
+    executor = ThreadPoolExecutor(max_workers=pool_size)
+    pending = deque((item, 0) for item in items)
+    running: dict = {}
+    abandoned: set = set()
+    completed = failed = requeued = 0
+    try:
+        while pending or running:
+            abandoned = {f for f in abandoned if not f.done()}
+            slots = min(controller.limit, pool_size - len(abandoned))
+            while pending and len(running) < slots:
+                item, attempt = pending.popleft()
+                running[executor.submit(fn, item)] = (item, clock(), attempt)
+            if not running:
+                wait(abandoned, return_when=FIRST_COMPLETED)
+                continue
+
+            wait_timeout = None
+            if timeout_sec > 0:
+                next_deadline = min(started for _, started, _ in running.values()) + timeout_sec
+                wait_timeout = max(0.0, next_deadline - clock())
+            done, _ = wait(list(running), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+            now = clock()
+            for future in done:
+                item, started, attempt = running.pop(future)
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, e
+                if error is None:
+                    completed += 1
+                    controller.on_success(started, now - started)
+                elif is_rate_limited(error):
+                    controller.on_rate_limited(started)
+                    if attempt < rate_limit_retries:
+                        requeued += 1
+                        pending.appendleft((item, attempt + 1))
+                        continue
+                    failed += 1
+                else:
+                    failed += 1
+                on_done(item, result, error)
+
+            if timeout_sec > 0:
+                for future, (item, started, _) in list(running.items()):
+                    if now - started < timeout_sec:
+                        continue
+                    running.pop(future)
+                    if not future.cancel():
+                        abandoned.add(future)
+                    failed += 1
+                    controller.on_timeout(started)
+                    on_done(item, None, TimeoutError(f"operation timed out after {timeout_sec:g}s"))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return {
+        "completed": completed,
+        "failed": failed,
+        "requeued": requeued,
+        "final_limit": controller.limit,
+        **controller.stats,
+    }
+
+
+def run_in_rounds(
+    items: list,
+    fn,
+    on_done,
+    initial: int,
+    minimum: int,
+    maximum: int,
+    round_multiplier: int = 2,
+    is_rate_limited=is_rate_limited_error,
+) -> dict:
+    """Round-based executor: a fresh pool per round, resized only after the slowest job of the round.
+
+    Halves the worker count after a round with rate limits and grows it by a third after a clean one.
+    """
+    worker_count = initial
+    stats = {"completed": 0, "failed": 0, "rate_limited": 0, "rounds": 0, "peak_limit": worker_count}
+    cursor = 0
+    while cursor < len(items):
+        batch = items[cursor : cursor + max(worker_count, worker_count * round_multiplier)]
+        cursor += len(batch)
+        stats["rounds"] += 1
+
+        round_success = 0
+        round_failures = 0
+        round_rate_limited = 0
+        with ThreadPoolExecutor(max_workers=worker_count) as executor:
+            futures = {executor.submit(fn, item): item for item in batch}
+            for future in as_completed(futures):
+                try:
+                    result, error = future.result(), None
+                    round_success += 1
+                except Exception as e:
+                    result, error = None, e
+                    round_failures += 1
+                    if is_rate_limited(e):
+                        round_rate_limited += 1
+                on_done(futures[future], result, error)
+
+        stats["completed"] += round_success
+        stats["failed"] += round_failures
+        stats["rate_limited"] += round_rate_limited
+        if round_rate_limited > 0:
+            new_worker_count = max(minimum, worker_count // 2)
+            if new_worker_count != worker_count:
+                print(
+                    "LLM concurrency backoff: "
+                    f"{worker_count} -> {new_worker_count} (rate_limited={round_rate_limited})"
+                )
+                worker_count = new_worker_count
+            continue
+
+        if round_failures == 0 and round_success > 0 and worker_count < maximum:
+            new_worker_count = min(maximum, worker_count + max(1, worker_count // 3))
+            if new_worker_count != worker_count:
+                print(
+                    "LLM concurrency scale-up: "
+                    f"{worker_count} -> {new_worker_count} (round_success={round_success})"
+                )
+                worker_count = new_worker_count
+                stats["peak_limit"] = max(stats["peak_limit"], worker_count)
+    stats["final_limit"] = worker_count
+    return stats
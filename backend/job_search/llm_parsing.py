@@ -5,8 +5,9 @@ import re
 from pathlib import Path
 from urllib.parse import urlparse
 
+from job_search.detail_cache import normalize_detail_url
 from job_search.json_io import save_json
-from job_search.llm_scoring import call_openai_json
+from job_search.llm_scoring import LlmStreamAborted, call_openai_json
 
 
 def _hash_text(text: str) -> str:
@@ -422,8 +423,10 @@ def normalize_llm_parse_output(job: dict, llm_out: dict, description_max_chars:
     raw_description = _cleanup_snapshot_dump(raw_description)
     raw_noisy = _looks_like_snapshot_dump(str(job.get("description") or ""))
     llm_noisy = _looks_like_snapshot_dump(str(normalized.get("description") or ""))
+    # Span-selected text is verbatim source text with boilerplate removed, so it is kept as is.
+    from_spans = normalized.get("description_source") == "spans"
     # Prefer fuller source text only when the source text is not noisy.
-    if len(raw_description) > len(llm_description) and not raw_noisy:
+    if len(raw_description) > len(llm_description) and not raw_noisy and not from_spans:
         llm_description = raw_description
     if llm_noisy and raw_description and not raw_noisy:
         llm_description = raw_description
@@ -450,6 +453,29 @@ def save_llm_parse_cache(path: Path, cache_obj):
 
 
 def llm_parse_cache_key(job: dict, model: str, prompt_version: str, description_chars: int = 6000) -> str:
+    """Content-canonical key: normalized URL, title, company and a description fingerprint.
+
+    Source name/type and `published` (often a relative date re-resolved every day) are left out
+    so an unchanged posting keeps its key; `reapply_source_fields` restores them on a hit.
+    """
+    clipped_description = _trim_text(_normalized_space(str(job.get("description") or "")).lower(), description_chars)
+    stable_blob = json.dumps(
+        {
+            "url": normalize_detail_url(str(job.get("url") or "")),
+            "title": _normalized_space(str(job.get("title") or "")).lower(),
+            "company": _normalized_space(str(job.get("company") or "")).lower(),
+            "description_hash": _hash_text(clipped_description),
+            "model": str(model or ""),
+            "prompt_version": str(prompt_version or ""),
+            "description_chars": int(description_chars) if str(description_chars or "").strip() else 0,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return _hash_text(stable_blob)
+
+
+def _llm_parse_source_cache_key(job: dict, model: str, prompt_version: str, description_chars: int = 6000) -> str:
     description = str(job.get("description") or "")
     clipped_description = _trim_text(description, description_chars)
     stable_blob = json.dumps(
@@ -498,99 +524,242 @@ def _llm_parse_legacy_cache_key(job: dict, model: str, prompt_version: str, desc
 
 
 def llm_parse_cache_keys(job: dict, model: str, prompt_version: str, description_chars: int = 6000) -> list[str]:
-    primary = llm_parse_cache_key(job=job, model=model, prompt_version=prompt_version, description_chars=description_chars)
-    legacy = _llm_parse_legacy_cache_key(
-        job=job,
-        model=model,
-        prompt_version=prompt_version,
-        description_chars=description_chars,
-    )
-    if legacy == primary:
-        return [primary]
-    return [primary, legacy]
+    """Canonical key first, then the older source-specific keys still present in existing caches."""
+    keys = []
+    for key_fn in (llm_parse_cache_key, _llm_parse_source_cache_key, _llm_parse_legacy_cache_key):
+        key = key_fn(job=job, model=model, prompt_version=prompt_version, description_chars=description_chars)
+        if key not in keys:
+            keys.append(key)
+    return keys
+
+
+def reapply_source_fields(job: dict, cached: dict) -> dict:
+    """Cached output for the current sighting: the listing's own `published` wins over the cached one."""
+    out = dict(cached or {})
+    published = str(job.get("published") or "").strip()
+    if published:
+        out["published"] = published
+    return out
+
+
+def cascade_needs_escalation(first_pass: dict, min_score: int, min_confidence: float) -> bool:
+    """Whether a first-pass (cheap model) parse goes on to the main model: postings scoring at least
+    `min_score`, or parsed with confidence below `min_confidence`. Non-postings stop at the first pass."""
+    if not bool(first_pass.get("is_job_posting", True)):
+        return False
+    try:
+        score = int(first_pass.get("score", 0))
+        confidence = float(first_pass.get("confidence", 0.0))
+    except (TypeError, ValueError):
+        return True
+    return score >= min_score or confidence < min_confidence
 
 
-def llm_parse_job(
-    job: dict,
-    profile: dict,
-    constraints: dict,
-    model: str,
-    description_max_chars: int = 2500,
-    input_description_max_chars: int = 20000,
-) -> dict:
-    raw_description = str(job.get("description") or "")
-    input_description = _trim_text(raw_description, input_description_max_chars)
-    system_prompt = (
-        "You are a strict job posting evaluator. "
-        "Return ONLY valid JSON with keys: "
-        "is_job_posting (boolean), title (string), company (string), location (string), "
-        "remote_hint (boolean), description (string), published (string), "
-        "score (0-100 integer), tier (A|B|C), reasons (array of short strings), "
-        "summary (string max 180 chars), quality_flags (array of short strings), confidence (number 0..1). "
-        "Company must be only the company name, never a sentence, role title, or description fragment. "
-        "If unknown, return an empty string. "
-        "If this item looks like navigation text, recommendation widgets, or mixed/ambiguous listing content, "
-        "set is_job_posting=false."
-    )
+_PARSE_OUTPUT_KEYS = (
+    "is_job_posting (boolean), title (string), company (string), location (string), "
+    "remote_hint (boolean), description (string), published (string), "
+    "score (0-100 integer), tier (A|B|C), reasons (array of short strings), "
+    "summary (string max 180 chars), quality_flags (array of short strings), confidence (number 0..1). "
+)
+_PARSE_OUTPUT_KEYS_STREAM = (
+    "is_job_posting (boolean), score (0-100 integer), tier (A|B|C), title (string), company (string), "
+    "location (string), remote_hint (boolean), description (string), published (string), "
+    "reasons (array of short strings), summary (string max 180 chars), quality_flags (array of short strings), "
+    "confidence (number 0..1). "
+)
+_PARSE_OUTPUT_KEYS_SPANS = (
+    "is_job_posting (boolean), title (string), company (string), location (string), "
+    "remote_hint (boolean), description_spans (array of [first, last] line-number pairs from "
+    "description_lines that cover the actual posting text, in order; leave out navigation, cookie notices, "
+    "similar-job lists and other boilerplate), published (string), "
+    "score (0-100 integer), tier (A|B|C), reasons (array of short strings), "
+    "summary (string max 180 chars), quality_flags (array of short strings), confidence (number 0..1). "
+)
+_PARSE_OUTPUT_KEYS_SPANS_STREAM = (
+    "is_job_posting (boolean), score (0-100 integer), tier (A|B|C), title (string), company (string), "
+    "location (string), remote_hint (boolean), description_spans (array of [first, last] line-number pairs from "
+    "description_lines that cover the actual posting text, in order; leave out navigation, cookie notices, "
+    "similar-job lists and other boilerplate), published (string), "
+    "reasons (array of short strings), "
+    "summary (string max 180 chars), quality_flags (array of short strings), confidence (number 0..1). "
+)
+_EXTRACT_OUTPUT_KEYS = (
+    "is_job_posting (boolean), title (string), company (string), location (string), remote_hint (boolean), "
+    "description (string), published (string), skills (array of technologies and skills the posting asks for), "
+    "seniority (junior|mid|senior|lead|unknown), summary (string max 180 chars), "
+    "quality_flags (array of short strings), confidence (number 0..1). "
+)
+_EXTRACT_OUTPUT_KEYS_SPANS = (
+    "is_job_posting (boolean), title (string), company (string), location (string), remote_hint (boolean), "
+    "description_spans (array of [first, last] line-number pairs from description_lines that cover the actual "
+    "posting text, in order; leave out navigation, cookie notices, similar-job lists and other boilerplate), "
+    "published (string), skills (array of technologies and skills the posting asks for), "
+    "seniority (junior|mid|senior|lead|unknown), summary (string max 180 chars), "
+    "quality_flags (array of short strings), confidence (number 0..1). "
+)
+_SENIORITY_LEVELS = {"junior", "mid", "senior", "lead"}
+# Streaming asks for the drop decision first so a non-posting can be cancelled after a few tokens.
+_STREAM_FIELD_ORDER = (
+    "Emit the keys in exactly the listed order, starting with is_job_posting and score. "
+)
+_EXTRACT_STREAM_FIELD_ORDER = "Emit the keys in exactly the listed order, starting with is_job_posting. "
+_IS_JOB_POSTING_RE = re.compile(r'"is_job_posting"\s*:\s*(true|false)')
+_SPAN_LINE_MAX_CHARS = 400
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_PARSE_GUIDANCE = (
+    "Company must be only the company name, never a sentence, role title, or description fragment. "
+    "If unknown, return an empty string. "
+    "If this item looks like navigation text, recommendation widgets, or mixed/ambiguous listing content, "
+    "set is_job_posting=false."
+)
 
-    user_prompt = json.dumps(
-        {
-            "candidate_profile": {
-                "location": profile.get("location"),
-                "target_titles": profile.get("target_titles", []),
-                "must_have_any": profile.get("must_have_any", []),
-                "skills": profile.get("skills", []),
-                "preferred_keywords": profile.get("preferred_keywords", []),
-                "exclude_keywords": profile.get("exclude_keywords", []),
-                "local_first": bool(profile.get("local_first", True)),
-            },
-            "constraints": constraints,
-            "raw_item": {
-                "source": str(job.get("source") or ""),
-                "source_type": str(job.get("source_type") or ""),
-                "url": str(job.get("url") or ""),
-                "title": str(job.get("title") or ""),
-                "company": str(job.get("company") or ""),
-                "location": str(job.get("location") or ""),
-                "description": input_description,
-                "published": str(job.get("published") or ""),
-            },
-            "rules": {
-                "preserve_truthful_fields": True,
-                "avoid_inventing": True,
-                "description_max_chars": (int(description_max_chars) if int(description_max_chars) > 0 else "no_limit"),
-                "input_description_max_chars": (
-                    int(input_description_max_chars) if int(input_description_max_chars) > 0 else "no_limit"
-                ),
-                "company_rules": {
-                    "max_words": 8,
-                    "must_not_include_role_words": True,
-                    "must_not_be_sentence": True,
-                    "if_unsure_return_empty": True,
-                },
-                "score_policy": {
-                    "A": "strong fit and worth applying now",
-                    "B": "decent fit, review",
-                    "C": "weak fit or skip",
-                },
-            },
+
+def _parse_candidate_profile(profile: dict) -> dict:
+    return {
+        "location": profile.get("location"),
+        "target_titles": profile.get("target_titles", []),
+        "must_have_any": profile.get("must_have_any", []),
+        "skills": profile.get("skills", []),
+        "preferred_keywords": profile.get("preferred_keywords", []),
+        "exclude_keywords": profile.get("exclude_keywords", []),
+        "local_first": bool(profile.get("local_first", True)),
+    }
+
+
+def _streamed_posting_decision(partial_text: str) -> bool | None:
+    """Keep streaming once the model says this is a job posting; cancel as soon as it says it is not."""
+    match = _IS_JOB_POSTING_RE.search(partial_text)
+    return None if match is None else match.group(1) == "true"
+
+
+def uses_description_spans(prompt_version: str) -> bool:
+    """Prompt versions ending in "-spans" ask for line ranges instead of a rewritten description."""
+    return str(prompt_version or "").strip().lower().endswith("-spans")
+
+
+def uses_profile_free_extraction(prompt_version: str) -> bool:
+    """Prompt versions with an "extract" part (e.g. "v6-extract", "v6-extract-spans") ask only for
+    profile-independent fields; the score is computed locally against the current profile."""
+    return "extract" in str(prompt_version or "").strip().lower().split("-")
+
+
+def _parse_output_keys(prompt_version: str, stream: bool = False) -> str:
+    spans = uses_description_spans(prompt_version)
+    if uses_profile_free_extraction(prompt_version):
+        return _EXTRACT_OUTPUT_KEYS_SPANS if spans else _EXTRACT_OUTPUT_KEYS
+    if spans:
+        return _PARSE_OUTPUT_KEYS_SPANS_STREAM if stream else _PARSE_OUTPUT_KEYS_SPANS
+    return _PARSE_OUTPUT_KEYS_STREAM if stream else _PARSE_OUTPUT_KEYS
+
+
+def _parse_context(profile: dict, constraints: dict, prompt_version: str) -> dict:
+    """Profile part of the user prompt; empty for extraction, so its output can outlive profile edits."""
+    if uses_profile_free_extraction(prompt_version):
+        return {}
+    return {"candidate_profile": _parse_candidate_profile(profile), "constraints": constraints}
+
+
+def description_lines(text: str) -> list[str]:
+    """Non-empty lines of `text`; long lines are split at sentence ends so spans stay selective."""
+    lines = []
+    for line in str(text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        chunk = ""
+        for sentence in _SENTENCE_END_RE.split(line):
+            if chunk and len(chunk) + 1 + len(sentence) > _SPAN_LINE_MAX_CHARS:
+                lines.append(chunk)
+                chunk = sentence
+            else:
+                chunk = f"{chunk} {sentence}" if chunk else sentence
+        if chunk:
+            lines.append(chunk)
+    return lines
+
+
+def join_description_spans(lines: list[str], spans) -> str:
+    """Text of the 1-based inclusive `spans` ([first, last] pairs or single numbers) over `lines`."""
+    keep = set()
+    for span in spans if isinstance(spans, list) else []:
+        try:
+            if isinstance(span, (list, tuple)) and len(span) == 2:
+                first, last = int(span[0]), int(span[1])
+            else:
+                first = last = int(span)
+        except (TypeError, ValueError):
+            continue
+        keep.update(range(max(1, first), min(len(lines), last) + 1))
+    return "\n".join(lines[idx - 1] for idx in sorted(keep))
+
+
+def _parse_raw_item(job: dict, input_description: str, lines: list[str] | None = None) -> dict:
+    item = {
+        "source": str(job.get("source") or ""),
+        "source_type": str(job.get("source_type") or ""),
+        "url": str(job.get("url") or ""),
+        "title": str(job.get("title") or ""),
+        "company": str(job.get("company") or ""),
+        "location": str(job.get("location") or ""),
+        "description": input_description,
+        "published": str(job.get("published") or ""),
+    }
+    if lines is not None:
+        del item["description"]
+        item["description_lines"] = [f"{idx}| {line}" for idx, line in enumerate(lines, start=1)]
+    return item
+
+
+def _parse_rules(
+    description_max_chars: int, input_description_max_chars: int, spans: bool = False, extract: bool = False
+) -> dict:
+    rules = {
+        "preserve_truthful_fields": True,
+        "avoid_inventing": True,
+        "description_max_chars": (int(description_max_chars) if int(description_max_chars) > 0 else "no_limit"),
+        "input_description_max_chars": (
+            int(input_description_max_chars) if int(input_description_max_chars) > 0 else "no_limit"
+        ),
+        "company_rules": {
+            "max_words": 8,
+            "must_not_include_role_words": True,
+            "must_not_be_sentence": True,
+            "if_unsure_return_empty": True,
         },
-        ensure_ascii=False,
-    )
+        "score_policy": {
+            "A": "strong fit and worth applying now",
+            "B": "decent fit, review",
+            "C": "weak fit or skip",
+        },
+    }
+    if spans:
+        del rules["description_max_chars"]
+        rules["description_output"] = "line spans only, never rewritten text"
+    if extract:
+        del rules["score_policy"]
+    return rules
 
-    out = call_openai_json(model=model, system_prompt=system_prompt, user_prompt=user_prompt)
 
+def _validate_parse_output(
+    job: dict,
+    out: dict,
+    input_description: str,
+    description_max_chars: int,
+    lines: list[str] | None = None,
+    extract: bool = False,
+) -> dict:
     title = str(out.get("title", "")).strip()[:220]
     company = _resolve_company(job=job, llm_company=str(out.get("company", "")), llm_description=input_description)
     location = str(out.get("location", "")).strip()[:180]
-    model_description = str(out.get("description", "")).strip()
+    span_description = join_description_spans(lines, out.get("description_spans")) if lines is not None else ""
+    model_description = span_description or str(out.get("description", "")).strip()
     raw_description_clean = str(job.get("description") or "").strip()
     model_description = _cleanup_snapshot_dump(model_description)
     raw_description_clean = _cleanup_snapshot_dump(raw_description_clean)
     description_candidate = model_description or raw_description_clean
     raw_noisy = _looks_like_snapshot_dump(str(job.get("description") or ""))
-    model_noisy = _looks_like_snapshot_dump(str(out.get("description") or ""))
-    if len(raw_description_clean) > len(description_candidate) and not raw_noisy:
+    model_noisy = _looks_like_snapshot_dump(span_description or str(out.get("description") or ""))
+    if len(raw_description_clean) > len(description_candidate) and not raw_noisy and not span_description:
         description_candidate = raw_description_clean
     if model_noisy and raw_description_clean and not raw_noisy:
         description_candidate = raw_description_clean
@@ -620,7 +789,7 @@ def llm_parse_job(
     if not description:
         description = _trim_text(raw_description_clean, description_max_chars)
 
-    return {
+    validated = {
         "is_job_posting": is_job_posting,
         "title": title,
         "company": company,
@@ -635,3 +804,189 @@ def llm_parse_job(
         "quality_flags": quality_flags,
         "confidence": confidence,
     }
+    if span_description and description_candidate == model_description:
+        validated["description_source"] = "spans"
+    if extract:
+        # Profile-dependent fields are filled in by the local scoring pass.
+        for key in ("score", "tier", "reasons"):
+            del validated[key]
+        skills = out.get("skills") if isinstance(out.get("skills"), list) else []
+        validated["skills"] = [str(x).strip()[:60] for x in skills if str(x).strip()][:20]
+        seniority = str(out.get("seniority", "")).strip().lower()
+        validated["seniority"] = seniority if seniority in _SENIORITY_LEVELS else "unknown"
+    return validated
+
+
+def llm_parse_job(
+    job: dict,
+    profile: dict,
+    constraints: dict,
+    model: str,
+    description_max_chars: int = 2500,
+    input_description_max_chars: int = 20000,
+    prompt_version: str = "",
+    stream: bool = False,
+) -> dict:
+    """Parse and score one posting. With `stream`, a response that opens with is_job_posting=false
+    is cancelled right there and returned as a non-posting with score 0."""
+    system_prompt, user_prompt = build_llm_parse_prompts(
+        job, profile, constraints, description_max_chars, input_description_max_chars, prompt_version, stream
+    )
+    if not stream:
+        out = call_openai_json(model=model, system_prompt=system_prompt, user_prompt=user_prompt)
+    else:
+        try:
+            out = call_openai_json(
+                model=model,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                stream=True,
+                stream_decision=_streamed_posting_decision,
+            )
+        except LlmStreamAborted:
+            out = {"is_job_posting": False, "score": 0, "quality_flags": ["not a job posting (stream aborted)"]}
+    return validate_llm_parse_output(job, out, description_max_chars, input_description_max_chars, prompt_version)
+
+
+def build_llm_parse_prompts(
+    job: dict,
+    profile: dict,
+    constraints: dict,
+    description_max_chars: int = 2500,
+    input_description_max_chars: int = 20000,
+    prompt_version: str = "",
+    stream: bool = False,
+) -> tuple[str, str]:
+    """(system, user) prompts of a single-job parse request."""
+    input_description = _trim_text(str(job.get("description") or ""), input_description_max_chars)
+    spans = uses_description_spans(prompt_version)
+    extract = uses_profile_free_extraction(prompt_version)
+    stream_order = _EXTRACT_STREAM_FIELD_ORDER if extract else _STREAM_FIELD_ORDER
+    system_prompt = (
+        "You are a strict job posting evaluator. "
+        "Return ONLY valid JSON with keys: "
+        + _parse_output_keys(prompt_version, stream)
+        + (stream_order if stream else "")
+        + _PARSE_GUIDANCE
+    )
+    user_prompt = json.dumps(
+        {
+            **_parse_context(profile, constraints, prompt_version),
+            "raw_item": _parse_raw_item(job, input_description, description_lines(input_description) if spans else None),
+            "rules": _parse_rules(description_max_chars, input_description_max_chars, spans=spans, extract=extract),
+        },
+        ensure_ascii=False,
+    )
+    return system_prompt, user_prompt
+
+
+def validate_llm_parse_output(
+    job: dict,
+    out: dict,
+    description_max_chars: int = 2500,
+    input_description_max_chars: int = 20000,
+    prompt_version: str = "",
+) -> dict:
+    """Shape a raw model response for `job` the same way `llm_parse_job` does."""
+    input_description = _trim_text(str(job.get("description") or ""), input_description_max_chars)
+    lines = description_lines(input_description) if uses_description_spans(prompt_version) else None
+    return _validate_parse_output(
+        job, out, input_description, description_max_chars, lines, uses_profile_free_extraction(prompt_version)
+    )
+
+
+def pack_llm_batches(
+    jobs: list,
+    max_items: int = 6,
+    max_input_chars: int = 24000,
+    short_description_chars: int = 3000,
+    description_of=lambda item: str(item.get("description") or ""),
+) -> tuple[list[list], list]:
+    """Group short postings into batches within an input-size budget.
+
+    Returns (batches, singles): every batch has at least two items; postings with a description
+    longer than `short_description_chars`, and any that did not fit a batch, are left as singles.
+    """
+    batches: list[list] = []
+    singles: list = []
+    current: list = []
+    current_chars = 0
+    for item in jobs:
+        size = len(description_of(item))
+        if size > short_description_chars:
+            singles.append(item)
+            continue
+        if current and (len(current) >= max(2, int(max_items)) or current_chars + size > max_input_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(item)
+        current_chars += size
+    if len(current) >= 2:
+        batches.append(current)
+    else:
+        singles.extend(current)
+    return batches, singles
+
+
+def llm_parse_jobs_batch(
+    jobs: list[dict],
+    profile: dict,
+    constraints: dict,
+    model: str,
+    description_max_chars: int = 2500,
+    input_description_max_chars: int = 20000,
+    timeout_sec: int = 90,
+    prompt_version: str = "",
+) -> list[dict | None]:
+    """Evaluate several postings in one request; the profile, constraints and rules are sent once.
+
+    Returns one validated result per job, in order. An item the model left out or returned in
+    the wrong shape comes back as None so the caller can retry it on its own; a response that
+    is not a `results` list at all raises.
+    """
+    input_descriptions = [_trim_text(str(job.get("description") or ""), input_description_max_chars) for job in jobs]
+    spans = uses_description_spans(prompt_version)
+    extract = uses_profile_free_extraction(prompt_version)
+    item_lines = [description_lines(text) if spans else None for text in input_descriptions]
+    system_prompt = (
+        "You are a strict job posting evaluator. Evaluate every entry of raw_items independently. "
+        'Return ONLY valid JSON of the form {"results": [...]} with exactly one object per raw item, '
+        "each with key item_id (copied from the raw item) and keys: "
+        + _parse_output_keys(prompt_version)
+        + _PARSE_GUIDANCE
+    )
+    user_prompt = json.dumps(
+        {
+            **_parse_context(profile, constraints, prompt_version),
+            "raw_items": [
+                {"item_id": idx, **_parse_raw_item(job, input_descriptions[idx], item_lines[idx])}
+                for idx, job in enumerate(jobs)
+            ],
+            "rules": _parse_rules(description_max_chars, input_description_max_chars, spans=spans, extract=extract),
+        },
+        ensure_ascii=False,
+    )
+
+    out = call_openai_json(model=model, system_prompt=system_prompt, user_prompt=user_prompt, timeout_sec=timeout_sec)
+    results = out.get("results") if isinstance(out, dict) else None
+    if not isinstance(results, list):
+        raise ValueError("batched LLM response has no results list")
+
+    by_id: dict[int, dict] = {}
+    for item in results:
+        if not isinstance(item, dict):
+            continue
+        try:
+            item_id = int(item.get("item_id"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= item_id < len(jobs) and item_id not in by_id and ("is_job_posting" if extract else "score") in item:
+            by_id[item_id] = item
+    return [
+        _validate_parse_output(
+            job, by_id[idx], input_descriptions[idx], description_max_chars, item_lines[idx], extract
+        )
+        if idx in by_id
+        else None
+        for idx, job in enumerate(jobs)
+    ]
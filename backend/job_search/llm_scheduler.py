@@ -0,0 +1,104 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from job_search.ranking import score_job
+
+# Shared prompt parts (profile, constraints, rules, system prompt) plus the response, in tokens.
+DEFAULT_OVERHEAD_TOKENS = 900
+DEFAULT_WEIGHTS = {"rule_score": 1.0, "watchlist": 15.0, "freshness": 10.0, "source_yield": 20.0}
+
+
+def _parse_published(raw: str) -> datetime | None:
+    value = str(raw or "").strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def estimate_input_tokens(
+    job: dict,
+    input_description_chars: int = 20000,
+    overhead_tokens: int = DEFAULT_OVERHEAD_TOKENS,
+    chars_per_token: float = 4.0,
+) -> int:
+    """Rough prompt size of one `llm_parse_job` call (about 4 characters per token)."""
+    description = str(job.get("description") or "")
+    if input_description_chars > 0:
+        description = description[:input_description_chars]
+    item_chars = len(description) + sum(
+        len(str(job.get(k) or "")) for k in ("title", "company", "location", "url", "source", "published")
+    )
+    return int(overhead_tokens + item_chars / max(1.0, float(chars_per_token)))
+
+
+class LlmCandidateScheduler:
+    """Orders LLM candidates by a cheap prior and admits them within a job and token budget.
+
+    The prior combines the rule score, a company-watchlist hit, freshness of `published` and
+    the share of A/B-tier results the job's source produced in recent runs.
+    """
+
+    def __init__(
+        self,
+        profile: dict,
+        constraints: dict,
+        source_yield: dict[str, float] | None = None,
+        weights: dict | None = None,
+        fresh_days: float = 14.0,
+        now: datetime | None = None,
+    ):
+        self.profile = profile
+        self.constraints = constraints
+        self.source_yield = dict(source_yield or {})
+        self.weights = {**DEFAULT_WEIGHTS, **{k: float(v) for k, v in (weights or {}).items()}}
+        self.fresh_days = max(1.0, float(fresh_days))
+        self.now = now or datetime.now(timezone.utc)
+
+    def priority(self, job: dict) -> float:
+        score, _, reasons, _ = score_job(
+            job, self.profile, self.constraints, self.constraints.get("company_watchlist")
+        )
+        rule_score = int(job["rule_score"]) if job.get("rule_score") is not None else score
+        watchlist = 1.0 if any("company watchlist" in str(r) for r in reasons) else 0.0
+        published = _parse_published(job.get("published"))
+        freshness = 0.0
+        if published is not None:
+            age_days = max(0.0, (self.now - published).total_seconds() / 86400.0)
+            freshness = max(0.0, 1.0 - age_days / self.fresh_days)
+        # Sources without history get a neutral yield.
+        source_yield = float(self.source_yield.get(str(job.get("source") or ""), 0.5))
+        return (
+            self.weights["rule_score"] * rule_score
+            + self.weights["watchlist"] * watchlist
+            + self.weights["freshness"] * freshness
+            + self.weights["source_yield"] * source_yield
+        )
+
+    def order(self, jobs: list[dict]) -> list[dict]:
+        """Highest prior first; ties keep their original order."""
+        scored = [(self.priority(job), idx, job) for idx, job in enumerate(jobs)]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [job for _, _, job in scored]
+
+
+class TokenBudget:
+    """Running total of estimated input tokens; a zero limit means unlimited."""
+
+    def __init__(self, limit: int = 0):
+        self.limit = max(0, int(limit))
+        self.used = 0
+        self.rejected = 0
+
+    def admit(self, tokens: int) -> bool:
+        if self.limit and self.used + tokens > self.limit:
+            self.rejected += 1
+            return False
+        self.used += tokens
+        return True
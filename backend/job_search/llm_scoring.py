@@ -1,11 +1,17 @@
 import hashlib
+import http.client
+import io
 import json
 import os
+import ssl
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
 from urllib.error import HTTPError
-from urllib.request import Request, urlopen
+from urllib.parse import urlsplit
 
+from job_search.http_pool import STALE_CONNECTION_ERRORS
 from job_search.json_io import save_json
 
 
@@ -73,7 +79,359 @@ def _resolve_openai_api_key() -> str:
     return ""
 
 
-def call_openai_json(model: str, system_prompt: str, user_prompt: str, timeout_sec: int = 45, max_retries: int = 2):
+def openai_base_url() -> str:
+    """API root, overridable with OPENAI_BASE_URL (e.g. a proxy or a local stand-in server)."""
+    return (os.environ.get("OPENAI_BASE_URL", "").strip() or "https://api.openai.com/v1").rstrip("/")
+
+
+class LlmStreamAborted(RuntimeError):
+    """A streamed completion was cancelled early; `partial_text` is what arrived until then."""
+
+    def __init__(self, partial_text: str):
+        super().__init__("streamed completion aborted early")
+        self.partial_text = partial_text
+
+
+class LlmUsageMeter:
+    """Thread-safe totals of the `usage` blocks returned by chat completions during a run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._totals = {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "cached_tokens": 0,
+                "reasoning_tokens": 0,
+                "latency_ms": 0,
+                "reused_connections": 0,
+            }
+            self._by_model: dict[str, dict] = {}
+            self._stream = {
+                "calls": 0,
+                "aborted": 0,
+                "decided": 0,
+                "decision_ms": 0,
+                "full_completion_tokens": 0,
+                "aborted_streamed_tokens": 0,
+            }
+            self._started = time.monotonic()
+
+    def record(self, model: str, usage: dict | None, reused_connection: bool = False, latency_sec: float = 0.0):
+        usage = usage if isinstance(usage, dict) else {}
+        prompt_details = usage.get("prompt_tokens_details") or {}
+        completion_details = usage.get("completion_tokens_details") or {}
+        row = {
+            "calls": 1,
+            "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+            "completion_tokens": int(usage.get("completion_tokens") or 0),
+            "cached_tokens": int(prompt_details.get("cached_tokens") or 0),
+            "reasoning_tokens": int(completion_details.get("reasoning_tokens") or 0),
+            "latency_ms": int(max(0.0, float(latency_sec)) * 1000),
+        }
+        with self._lock:
+            for key, value in row.items():
+                self._totals[key] += value
+            self._totals["reused_connections"] += 1 if reused_connection else 0
+            per_model = self._by_model.setdefault(str(model or ""), dict.fromkeys(row, 0))
+            for key, value in row.items():
+                per_model[key] += value
+
+    def record_stream(self, decision_sec: float | None, aborted: bool, completion_tokens: int):
+        """One streamed call: when its decision field arrived and whether it was cut short."""
+        with self._lock:
+            self._stream["calls"] += 1
+            if decision_sec is not None:
+                self._stream["decided"] += 1
+                self._stream["decision_ms"] += int(decision_sec * 1000)
+            if aborted:
+                self._stream["aborted"] += 1
+                self._stream["aborted_streamed_tokens"] += int(completion_tokens)
+            else:
+                self._stream["full_completion_tokens"] += int(completion_tokens)
+
+    def _stream_summary(self) -> dict:
+        stream = self._stream
+        full_calls = stream["calls"] - stream["aborted"]
+        avg_full = stream["full_completion_tokens"] / full_calls if full_calls else 0.0
+        # Aborted calls would have produced about as much as a completed one.
+        saved = max(0.0, avg_full * stream["aborted"] - stream["aborted_streamed_tokens"])
+        return {
+            "calls": stream["calls"],
+            "aborted": stream["aborted"],
+            "avg_time_to_decision_ms": round(stream["decision_ms"] / stream["decided"], 1) if stream["decided"] else 0.0,
+            "est_completion_tokens_saved": int(saved),
+        }
+
+    def snapshot(self, pricing: dict | None = None) -> dict:
+        """Totals, tokens/s since the last reset and, with `pricing` (USD per 1M tokens by model), a cost estimate."""
+        with self._lock:
+            totals = dict(self._totals)
+            by_model = {model: dict(row) for model, row in self._by_model.items()}
+            streaming = self._stream_summary()
+            elapsed = max(1e-6, time.monotonic() - self._started)
+        cost = 0.0
+        for model, row in by_model.items():
+            price = (pricing or {}).get(model) or {}
+            uncached = row["prompt_tokens"] - row["cached_tokens"]
+            row["cost_usd"] = round(
+                (
+                    uncached * float(price.get("input", 0))
+                    + row["cached_tokens"] * float(price.get("cached_input", price.get("input", 0)))
+                    + row["completion_tokens"] * float(price.get("output", 0))
+                )
+                / 1_000_000,
+                6,
+            )
+            cost += row["cost_usd"]
+            row.update(_per_call_averages(row))
+        return {
+            **totals,
+            "tokens_per_sec": round((totals["prompt_tokens"] + totals["completion_tokens"]) / elapsed, 1),
+            "cost_usd": round(cost, 6),
+            **_per_call_averages(totals),
+            "by_model": by_model,
+            "streaming": streaming,
+        }
+
+
+def _per_call_averages(row: dict) -> dict:
+    calls = max(1, int(row["calls"]))
+    return {
+        "avg_completion_tokens": round(row["completion_tokens"] / calls, 1),
+        "avg_latency_ms": round(row["latency_ms"] / calls, 1),
+    }
+
+
+class OpenAiHttpClient:
+    """Keep-alive HTTPS client for the OpenAI API; each thread reuses its own connection per host.
+
+    Error statuses are raised as `urllib.error.HTTPError`, so retry handling matches `urlopen`.
+    `close()` drops every thread's connections; one still serving a request (e.g. from a worker the
+    executor gave up on) is closed when that request ends rather than under its reader.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[http.client.HTTPConnection] = []
+        self._busy: set[http.client.HTTPConnection] = set()
+        self._generation = 0
+        self._ssl_context = ssl.create_default_context()
+
+    def _connection(self, scheme: str, host: str, port: int, timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        conns = getattr(self._local, "conns", None)
+        if conns is None or getattr(self._local, "generation", None) != self._generation:
+            # Connections from before the last close() are closed and no longer tracked; start over.
+            conns = self._local.conns = {}
+            self._local.generation = self._generation
+        conn = conns.get((scheme, host, port))
+        if conn is not None:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+                return conn, True
+            return conn, False
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        conns[(scheme, host, port)] = conn
+        with self._lock:
+            self._connections.append(conn)
+        return conn, False
+
+    def _send(self, url: str, payload: dict, headers: dict, timeout_sec: float):
+        """POST `payload` and return (connection, response with unread body, whether the connection was reused)."""
+        parts = urlsplit(url)
+        scheme = (parts.scheme or "https").lower()
+        port = parts.port or (443 if scheme == "https" else 80)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        body = json.dumps(payload).encode("utf-8")
+        request_headers = {**headers, "Content-Type": "application/json", "Connection": "keep-alive"}
+        for attempt in range(2):
+            conn, reused = self._connection(scheme, parts.hostname or "", port, timeout_sec)
+            with self._lock:
+                self._busy.add(conn)
+            try:
+                conn.request("POST", path, body=body, headers=request_headers)
+                resp = conn.getresponse()
+            except STALE_CONNECTION_ERRORS:
+                conn.close()
+                self._release(conn)
+                # The server may have closed an idle keep-alive socket; retry once on a fresh one.
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                self._release(conn)
+                raise
+            if resp.status >= 400:
+                try:
+                    raw = resp.read()
+                    if resp.will_close:
+                        conn.close()
+                finally:
+                    self._release(conn)
+                raise HTTPError(url, resp.status, resp.reason, resp.msg, io.BytesIO(raw))
+            return conn, resp, reused
+        raise RuntimeError("unreachable")
+
+    def _release(self, conn: http.client.HTTPConnection):
+        """Mark `conn` idle again; close it if `close()` ran while it was serving a request."""
+        with self._lock:
+            self._busy.discard(conn)
+            retired = conn not in self._connections
+        if retired:
+            conn.close()
+
+    def post_json(self, url: str, payload: dict, headers: dict, timeout_sec: float) -> tuple[dict, bool]:
+        """POST `payload` and return (decoded JSON body, whether the connection was reused)."""
+        conn, resp, reused = self._send(url, payload, headers, timeout_sec)
+        try:
+            raw = resp.read()
+            if resp.will_close:
+                conn.close()
+        except Exception:
+            conn.close()
+            raise
+        finally:
+            self._release(conn)
+        return json.loads(raw.decode("utf-8", errors="ignore")), reused
+
+    def post_stream(self, url: str, payload: dict, headers: dict, timeout_sec: float, on_open=None):
+        """POST a `stream: true` request and yield each server-sent `data:` payload.
+
+        `on_open(reused)` is called once the response headers arrived. Closing the generator
+        before `[DONE]` closes the connection, which cancels generation on the server.
+        """
+        conn, resp, reused = self._send(url, payload, {**headers, "Accept": "text/event-stream"}, timeout_sec)
+        finished = False
+        try:
+            if on_open is not None:
+                on_open(reused)
+            for raw_line in iter(resp.readline, b""):
+                line = raw_line.decode("utf-8", errors="ignore").strip()
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    resp.read()
+                    finished = True
+                    return
+                yield data
+            finished = True
+        finally:
+            if not finished or resp.will_close:
+                conn.close()
+            self._release(conn)
+
+    def close(self):
+        with self._lock:
+            self._generation += 1
+            conns, self._connections = self._connections, []
+            idle = [conn for conn in conns if conn not in self._busy]
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+OPENAI_CLIENT = OpenAiHttpClient()
+LLM_USAGE = LlmUsageMeter()
+
+
+def _stream_chat_completion(url: str, payload: dict, headers: dict, timeout_sec: float, stream_decision, model: str):
+    """Collect a streamed completion into the non-streamed response shape; see `call_openai_json`."""
+    started = time.monotonic()
+    parts, usage, reused = [], None, [False]
+    decision_sec, aborted = None, False
+    chunks = OPENAI_CLIENT.post_stream(
+        url,
+        {**payload, "stream": True, "stream_options": {"include_usage": True}},
+        headers,
+        timeout_sec,
+        on_open=lambda was_reused: reused.__setitem__(0, was_reused),
+    )
+    try:
+        for data in chunks:
+            try:
+                chunk = json.loads(data)
+            except ValueError:
+                continue
+            if chunk.get("usage"):
+                usage = chunk["usage"]
+            for choice in chunk.get("choices") or []:
+                piece = str((choice.get("delta") or {}).get("content") or "")
+                if piece:
+                    parts.append(piece)
+            if stream_decision is None or decision_sec is not None or not parts:
+                continue
+            decision = stream_decision("".join(parts))
+            if decision is None:
+                continue
+            decision_sec = time.monotonic() - started
+            if decision is False:
+                aborted = True
+                break
+    finally:
+        chunks.close()
+    # Without a usage chunk (aborted stream), each content delta counts as roughly one token.
+    streamed_tokens = int((usage or {}).get("completion_tokens") or len(parts))
+    LLM_USAGE.record_stream(decision_sec, aborted, streamed_tokens)
+    if aborted:
+        LLM_USAGE.record(
+            model,
+            {"completion_tokens": streamed_tokens},
+            reused_connection=reused[0],
+            latency_sec=time.monotonic() - started,
+        )
+        raise LlmStreamAborted("".join(parts))
+    return {"choices": [{"message": {"content": "".join(parts)}}], "usage": usage}, reused[0]
+
+
+_RETRY_OVERRIDE = threading.local()
+
+
+@contextmanager
+def openai_call_retries(max_retries: int):
+    """Within the block, `call_openai_json` calls on this thread default to `max_retries` retries.
+
+    The AIMD executor runs its jobs with 0 so every 429 reaches its controller instead of being retried here.
+    """
+    previous = getattr(_RETRY_OVERRIDE, "value", None)
+    _RETRY_OVERRIDE.value = max(0, int(max_retries))
+    try:
+        yield
+    finally:
+        _RETRY_OVERRIDE.value = previous
+
+
+def call_openai_json(
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    timeout_sec: int = 45,
+    max_retries: int | None = None,
+    stream: bool = False,
+    stream_decision=None,
+):
+    """Chat completion in JSON mode, returning the parsed content.
+
+    With `stream=True` the response is read as server-sent chunks. `stream_decision(partial_text)`
+    is called as content arrives: None means undecided, True means decided and keep reading,
+    False cancels the request and raises `LlmStreamAborted`. `max_retries` defaults to 2, or to the
+    value set by an enclosing `openai_call_retries`.
+    """
+    if max_retries is None:
+        override = getattr(_RETRY_OVERRIDE, "value", None)
+        max_retries = 2 if override is None else override
     api_key = _resolve_openai_api_key()
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY is missing")
@@ -87,21 +445,20 @@ def call_openai_json(model: str, system_prompt: str, user_prompt: str, timeout_s
         ],
     }
 
-    req = Request(
-        "https://api.openai.com/v1/chat/completions",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        method="POST",
-    )
-    data = None
+    url = f"{openai_base_url()}/chat/completions"
+    headers = {"Authorization": f"Bearer {api_key}"}
+    data, reused, latency_sec = None, False, 0.0
     for attempt in range(max(0, int(max_retries)) + 1):
+        started = time.monotonic()
         try:
-            with urlopen(req, timeout=timeout_sec) as resp:
-                data = json.loads(resp.read().decode("utf-8", errors="ignore"))
+            if stream:
+                data, reused = _stream_chat_completion(url, payload, headers, timeout_sec, stream_decision, model)
+            else:
+                data, reused = OPENAI_CLIENT.post_json(url, payload, headers=headers, timeout_sec=timeout_sec)
+            latency_sec = time.monotonic() - started
             break
+        except LlmStreamAborted:
+            raise
         except HTTPError as e:
             retriable = int(getattr(e, "code", 0)) in {429, 500, 502, 503, 504}
             if not retriable or attempt >= int(max_retries):
@@ -119,6 +476,7 @@ def call_openai_json(model: str, system_prompt: str, user_prompt: str, timeout_s
 
     if not isinstance(data, dict):
         raise RuntimeError("invalid openai response payload")
+    LLM_USAGE.record(model, data.get("usage"), reused_connection=reused, latency_sec=latency_sec)
     content = data["choices"][0]["message"]["content"]
     return json.loads(content)
 
@@ -0,0 +1,208 @@
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass(frozen=True)
+class SimulatedLlmProfile:
+    """Latency and rate-limit behaviour of the simulated chat-completions endpoint.
+
+    Requests beyond `capacity` concurrent ones get an immediate 429. After `shrink_after_sec`
+    the capacity drops to `shrunk_capacity`, mimicking a provider tightening limits mid-run.
+    """
+
+    capacity: int = 16
+    latency_ms: float = 400.0
+    jitter: float = 0.3
+    tail_probability: float = 0.0
+    tail_latency_ms: float = 8000.0
+    retry_after_sec: float = 0.5
+    shrink_after_sec: float = 0.0
+    shrunk_capacity: int = 0
+    # Streamed responses: delay between chunks of `stream_chunk_chars` characters.
+    token_latency_ms: float = 0.0
+    stream_chunk_chars: int = 4
+
+
+SIMULATED_LLM_PROFILES = {
+    "steady": SimulatedLlmProfile(capacity=24, latency_ms=400),
+    "rate_limited": SimulatedLlmProfile(capacity=8, latency_ms=400),
+    "slow_tail": SimulatedLlmProfile(capacity=32, latency_ms=300, tail_probability=0.05, tail_latency_ms=8000),
+    "shrinking": SimulatedLlmProfile(capacity=24, latency_ms=400, shrink_after_sec=5, shrunk_capacity=6),
+}
+
+
+_DEFAULT_CONTENT = {
+    "is_job_posting": True,
+    "title": "Simulated Engineer",
+    "company": "Simulated GmbH",
+    "location": "Remote",
+    "remote_hint": True,
+    "description": "Simulated posting",
+    "published": "",
+    "score": 60,
+    "tier": "B",
+    "reasons": ["simulated"],
+    "summary": "Simulated response",
+    "quality_flags": [],
+    "confidence": 0.5,
+}
+
+
+class SimulatedLlmEndpoint:
+    """Local OpenAI-compatible `/v1/chat/completions` server for benchmarking LLM concurrency control.
+
+    Point `OPENAI_BASE_URL` at `base_url`. Every response returns `content` (a valid job-parse
+    payload by default); `"stream": true` requests get it as server-sent chunks. `time_scale`
+    shrinks all latencies (0.1 runs ten times faster than the profile says).
+    """
+
+    def __init__(
+        self, profile: SimulatedLlmProfile, time_scale: float = 1.0, seed: int = 7, content: dict | None = None
+    ):
+        self.profile = profile
+        self.content = dict(content or _DEFAULT_CONTENT)
+        self.time_scale = max(0.001, float(time_scale))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._started_at = time.monotonic()
+        self.stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "completed": 0,
+            "peak_in_flight": 0,
+            "streams_cancelled": 0,
+        }
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def capacity(self) -> int:
+        elapsed = (time.monotonic() - self._started_at) / self.time_scale
+        if self.profile.shrink_after_sec and elapsed >= self.profile.shrink_after_sec:
+            return max(1, self.profile.shrunk_capacity)
+        return max(1, self.profile.capacity)
+
+    def _latency_sec(self) -> float:
+        with self._lock:
+            if self.profile.tail_probability and self._random.random() < self.profile.tail_probability:
+                latency_ms = self.profile.tail_latency_ms
+            else:
+                latency_ms = self.profile.latency_ms * max(0.1, self._random.gauss(1.0, self.profile.jitter))
+        return latency_ms / 1000.0 * self.time_scale
+
+    def _admit(self) -> bool:
+        with self._lock:
+            self.stats["requests"] += 1
+            if self._in_flight >= self.capacity():
+                self.stats["rate_limited"] += 1
+                return False
+            self._in_flight += 1
+            self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self._in_flight)
+            return True
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+            self.stats["completed"] += 1
+
+    def _handler_class(self):
+        endpoint = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                return
+
+            def _send(self, status: int, payload: dict, headers: dict | None = None):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, content_text: str, usage: dict):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                size = max(1, endpoint.profile.stream_chunk_chars)
+                events = [
+                    {"choices": [{"delta": {"content": content_text[idx : idx + size]}}]}
+                    for idx in range(0, len(content_text), size)
+                ]
+                events.append({"choices": [], "usage": usage})
+                try:
+                    for event in events:
+                        self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                        time.sleep(endpoint.profile.token_latency_ms / 1000.0 * endpoint.time_scale)
+                    self._write_chunk(b"data: [DONE]\n\n")
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    with endpoint._lock:
+                        endpoint.stats["streams_cancelled"] += 1
+                    self.close_connection = True
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if not self.path.endswith("/chat/completions"):
+                    self._send(404, {"error": {"message": "not found"}})
+                    return
+                if not endpoint._admit():
+                    retry_after = endpoint.profile.retry_after_sec * endpoint.time_scale
+                    self._send(429, {"error": {"message": "rate limited"}}, {"Retry-After": f"{retry_after:.3f}"})
+                    return
+                try:
+                    request = json.loads(raw.decode("utf-8") or "{}")
+                except ValueError:
+                    request = {}
+                try:
+                    time.sleep(endpoint._latency_sec())
+                    content_text = json.dumps(endpoint.content)
+                    # Roughly 4 bytes per token; the shared instruction prefix counts as cached.
+                    prompt_tokens = max(1, len(raw) // 4)
+                    usage = {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": max(1, len(content_text) // 4),
+                        "prompt_tokens_details": {"cached_tokens": prompt_tokens // 2},
+                    }
+                    if request.get("stream"):
+                        self._stream(content_text, usage)
+                    else:
+                        self._send(200, {"choices": [{"message": {"content": content_text}}], "usage": usage})
+                finally:
+                    endpoint._release()
+
+        return _Handler
+
+    def start(self) -> "SimulatedLlmEndpoint":
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "SimulatedLlmEndpoint":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -21,6 +21,7 @@ class JobRecord:
     published: str
     fetched_at: str
     normalized_json: str
+    duplicate_of: str = ""
 
     @classmethod
     def from_job(cls, job: dict):
@@ -42,6 +43,7 @@ class JobRecord:
             published=str(job.get("published") or ""),
             fetched_at=str(job.get("fetched_at") or ""),
             normalized_json=json.dumps(job, ensure_ascii=False),
+            duplicate_of=str(job.get("duplicate_of") or ""),
         )
 
 
@@ -127,6 +129,11 @@ class PipelineRunRecord:
     source_errors: int
     error_message: str | None
     summary_json: str
+    llm_prompt_tokens: int = 0
+    llm_completion_tokens: int = 0
+    llm_cached_tokens: int = 0
+    llm_cost_usd: float = 0.0
+    derived_from: str | None = None
 
     @classmethod
     def from_run_record(cls, run_record: dict):
@@ -149,6 +156,11 @@ class PipelineRunRecord:
             source_errors=int(run_record.get("source_errors", 0)),
             error_message=(str(run_record.get("error_message")) if run_record.get("error_message") is not None else None),
             summary_json=json.dumps(run_record.get("summary", {}), ensure_ascii=False),
+            llm_prompt_tokens=int(run_record.get("llm_prompt_tokens", 0)),
+            llm_completion_tokens=int(run_record.get("llm_completion_tokens", 0)),
+            llm_cached_tokens=int(run_record.get("llm_cached_tokens", 0)),
+            llm_cost_usd=float(run_record.get("llm_cost_usd", 0.0)),
+            derived_from=(str(run_record.get("derived_from")) if run_record.get("derived_from") else None),
         )
 
 
@@ -164,6 +176,10 @@ class SourceFetchEventRecord:
     jobs_fetched: int
     duration_ms: int
     error_message: str | None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    cache_not_modified: int = 0
+    backend_stats_json: str = "{}"
 
     @classmethod
     def from_dict(cls, obj: dict):
@@ -178,6 +194,10 @@ class SourceFetchEventRecord:
             jobs_fetched=int(obj.get("jobs_fetched", 0)),
             duration_ms=int(obj.get("duration_ms", 0)),
             error_message=(str(obj.get("error_message")) if obj.get("error_message") is not None else None),
+            cache_hits=int(obj.get("cache_hits", 0)),
+            cache_misses=int(obj.get("cache_misses", 0)),
+            cache_not_modified=int(obj.get("cache_not_modified", 0)),
+            backend_stats_json=json.dumps(obj.get("backend_stats", {}), ensure_ascii=False, sort_keys=True),
         )
 
 
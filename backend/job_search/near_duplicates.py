@@ -0,0 +1,133 @@
+import hashlib
+import re
+
+_TOKEN_RE = re.compile(r"[a-z0-9äöüß+#]+")
+_HASH_BITS = 64
+# "(m/w/d)", "w/m/x" and similar gender markers that some boards append to titles and others drop.
+_GENDER_MARKER_RE = re.compile(r"\(?\b[mwfdx](?:\s*/\s*[mwfdx]){1,3}\b\)?", re.IGNORECASE)
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall(str(text or "").lower())
+
+
+def _title_tokens(title: str) -> list[str]:
+    return _tokens(_GENDER_MARKER_RE.sub(" ", str(title or "")))
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+# Set-bit positions of each byte value, so the per-bit counters only touch the bits that are set.
+_BYTE_BITS = tuple(tuple(j for j in range(8) if (b >> j) & 1) for b in range(256))
+
+
+def simhash(features: dict[str, int]) -> int:
+    """64-bit SimHash of weighted features; similar feature sets give hashes a few bits apart."""
+    ones = [0] * _HASH_BITS
+    total = 0
+    for feature, weight in features.items():
+        total += weight
+        for offset, byte in enumerate(_feature_hash(feature).to_bytes(8, "little")):
+            base = 8 * offset
+            for j in _BYTE_BITS[byte]:
+                ones[base + j] += weight
+    out = 0
+    for bit, count in enumerate(ones):
+        if 2 * count > total:
+            out |= 1 << bit
+    return out
+
+
+def job_fingerprint(job: dict, shingle_size: int = 2, title_weight: int = 2, max_words: int = 1500) -> int:
+    """SimHash over word shingles of the description plus (weighted) title and company tokens."""
+    features: dict[str, int] = {}
+    for token in _title_tokens(job.get("title")):
+        features[f"t:{token}"] = features.get(f"t:{token}", 0) + title_weight
+    for token in _tokens(job.get("company")):
+        features[f"c:{token}"] = features.get(f"c:{token}", 0) + title_weight
+    words = _tokens(job.get("description"))[:max_words]
+    for idx in range(max(1, len(words) - shingle_size + 1)):
+        shingle = " ".join(words[idx : idx + shingle_size])
+        if shingle:
+            features[f"d:{shingle}"] = features.get(f"d:{shingle}", 0) + 1
+    return simhash(features)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class SimHashIndex:
+    """Banded lookup of fingerprints within `max_distance` bits.
+
+    The hash is split into `max_distance + 1` bands; two hashes within the distance must agree
+    exactly on at least one band, so a query only compares against its bucket neighbours
+    instead of every indexed posting.
+    """
+
+    def __init__(self, max_distance: int = 7):
+        self.max_distance = max(0, int(max_distance))
+        bands = self.max_distance + 1
+        width = _HASH_BITS // bands
+        self._bands = [(i * width, _HASH_BITS if i == bands - 1 else (i + 1) * width) for i in range(bands)]
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in self._bands]
+        self._hashes: dict[int, int] = {}
+
+    def _band_keys(self, h: int):
+        for idx, (start, end) in enumerate(self._bands):
+            yield idx, (h >> start) & ((1 << (end - start)) - 1)
+
+    def add(self, item_id: int, h: int):
+        self._hashes[item_id] = h
+        for idx, key in self._band_keys(h):
+            self._buckets[idx].setdefault(key, []).append(item_id)
+
+    def query(self, h: int) -> list[int]:
+        found = set()
+        for idx, key in self._band_keys(h):
+            for item_id in self._buckets[idx].get(key, ()):
+                if item_id not in found and hamming(h, self._hashes[item_id]) <= self.max_distance:
+                    found.add(item_id)
+        return sorted(found)
+
+
+def _title_overlap(a: dict, b: dict) -> float:
+    ta, tb = set(_title_tokens(a.get("title"))), set(_title_tokens(b.get("title")))
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+def cluster_near_duplicates(jobs: list[dict], max_distance: int = 7, min_title_overlap: float = 0.5) -> list[list[int]]:
+    """Indices of `jobs` grouped into near-duplicate clusters (singletons omitted).
+
+    Candidates come from the SimHash index; a pair is only linked when the titles also share
+    at least `min_title_overlap` of their tokens, which keeps sibling roles at one company apart.
+    """
+    parent = list(range(len(jobs)))
+
+    def _find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index = SimHashIndex(max_distance=max_distance)
+    for idx, job in enumerate(jobs):
+        h = job_fingerprint(job)
+        for other in index.query(h):
+            if _title_overlap(job, jobs[other]) >= min_title_overlap:
+                parent[_find(idx)] = _find(other)
+        index.add(idx, h)
+
+    clusters: dict[int, list[int]] = {}
+    for idx in range(len(jobs)):
+        clusters.setdefault(_find(idx), []).append(idx)
+    return [members for members in clusters.values() if len(members) > 1]
+
+
+def canonical_member(jobs: list[dict], members: list[int]) -> int:
+    """The member with the fullest description (first seen on ties) is the one sent to the LLM."""
+    return max(members, key=lambda idx: (len(str(jobs[idx].get("description") or "")), -idx))
@@ -1,13 +1,15 @@
 import uuid
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timezone
 import signal
 import time
 from urllib.error import HTTPError, URLError
+from urllib.parse import urlparse
 
 from job_search.ingestion import (
+    configure_detail_cache,
     dedupe_jobs,
-    enrich_job_detail,
+    enrich_job_details,
     fetch_indeed_jobs,
     fetch_stepstone_jobs,
     fetch_stepstone_via_browser,
@@ -19,14 +21,43 @@ from job_search.ingestion import (
     parse_lever_jobs,
     parse_rss,
 )
+from job_search.backend_scoreboard import scoreboard_from_config
+from job_search.detail_cache import DetailCache
+from job_search.fetch_archive import ArchiveReplay, FetchArchive
+from job_search.fetch_backends import (
+    collect_fetch_stats,
+    configure_backend_scoreboard,
+    configure_fetch_archive,
+    configure_fetch_replay,
+    configure_http_cache,
+    configure_openclaw_session,
+    configure_playwright_worker,
+    reset_http_pools,
+)
 from job_search.json_io import load_json, save_json
+from job_search.llm_batch_api import BatchApiClient, LlmBatchState, poll_llm_batch, submit_llm_batch
+from job_search.llm_executor import AimdController, run_in_rounds, run_work_queue
+from job_search.llm_cache_store import LlmParseCache, maintenance_policy_from_config
+from job_search.llm_scheduler import (
+    DEFAULT_OVERHEAD_TOKENS,
+    LlmCandidateScheduler,
+    TokenBudget,
+    estimate_input_tokens,
+)
 from job_search.llm_parsing import (
+    build_llm_parse_prompts,
+    cascade_needs_escalation,
     llm_parse_cache_keys,
     llm_parse_job,
-    load_llm_parse_cache,
+    llm_parse_jobs_batch,
     normalize_llm_parse_output,
-    save_llm_parse_cache,
+    pack_llm_batches,
+    reapply_source_fields,
+    uses_description_spans,
+    uses_profile_free_extraction,
+    validate_llm_parse_output,
 )
+from job_search.llm_scoring import LLM_USAGE, OPENAI_CLIENT, openai_call_retries
 from job_search.models import (
     ApplicationRecord,
     JobRankingRecord,
@@ -34,13 +65,30 @@ from job_search.models import (
     PipelineRunRecord,
     SourceFetchEventRecord,
 )
+from job_search.near_duplicates import canonical_member, cluster_near_duplicates
 from job_search.paths import CONFIG, DATA, DB, OUTPUT
 from job_search.observability import emit_alert, emit_metric, log_event, write_runtime_metrics_snapshot
+from job_search.ranking import pre_triage_reject_reasons, score_extracted_job, tier_for_score, triage_job
+from job_search.rate_limit import HOST_LIMITER
 from job_search.reporting import markdown_report
 from job_search.run_metadata import persist_run_metadata
 from job_search.storage.repository import JobSearchRepository
 
 
+# Ranking fields a near-duplicate takes over from its cluster's canonical member.
+_DUPLICATE_PROPAGATED_FIELDS = (
+    "score",
+    "tier",
+    "reasons",
+    "rule_score",
+    "skill_hits",
+    "llm_summary",
+    "quality_flags",
+    "parse_confidence",
+    "scored_by",
+)
+
+
 def _build_repository(db_cfg: dict):
     if not db_cfg.get("enabled", False):
         return None
@@ -114,21 +162,6 @@ def _call_with_hard_timeout(timeout_sec: int, fn, *args, **kwargs):
         signal.signal(signal.SIGALRM, previous_handler)
 
 
-def _save_llm_cache_snapshot(path, entries: dict, model: str, prompt_version: str):
-    save_llm_parse_cache(
-        path,
-        {
-            "meta": {
-                "version": 1,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-                "model": model,
-                "prompt_version": prompt_version,
-            },
-            "entries": entries,
-        },
-    )
-
-
 def _fetch_source_jobs(source: dict, source_kind: str):
     if source_kind == "rss":
         xml = fetch_url(source["url"])
@@ -186,7 +219,101 @@ def _fetch_source_jobs(source: dict, source_kind: str):
     raise ValueError(f"unknown source kind: {source_kind}")
 
 
-def run_pipeline() -> dict:
+def _source_host_key(source: dict, source_kind: str) -> str:
+    url = str(source.get("url") or "").strip()
+    if not url and source_kind == "greenhouse":
+        url = "https://boards-api.greenhouse.io/"
+    if not url and source_kind == "lever":
+        url = "https://api.lever.co/"
+    host = (urlparse(url).hostname or "").strip().lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host or f"{source_kind}:{source.get('name', '')}"
+
+
+def _fetch_source_outcome(source: dict, source_kind: str, max_retries: int, backoff_seconds: float) -> dict:
+    started = time.monotonic()
+    attempts = 0
+    jobs = []
+    error_text = None
+    success = False
+    with collect_fetch_stats() as fetch_stats:
+        try:
+            jobs, attempts = _fetch_with_retry(
+                lambda: _fetch_source_jobs(source, source_kind),
+                max_retries=max_retries,
+                backoff_seconds=backoff_seconds,
+            )
+            success = True
+        except (HTTPError, URLError, TimeoutError, ValueError) as e:
+            attempts = int(getattr(e, "_attempts", attempts or 1))
+            error_text = str(e)
+        except Exception as e:
+            attempts = int(getattr(e, "_attempts", attempts or 1))
+            if source_kind == "browser":
+                error_text = f"browser source failed: {e}"
+            else:
+                error_text = f"unexpected: {e}"
+    return {
+        "jobs": jobs if success else [],
+        "attempts": attempts,
+        "success": success,
+        "error_text": error_text,
+        "duration_ms": int((time.monotonic() - started) * 1000),
+        "fetch_stats": fetch_stats.snapshot(),
+        "backend_stats": fetch_stats.backend_summary(),
+    }
+
+
+def _run_source_fetch_stage(plans: list[dict], max_workers: int, per_host_concurrency: int, backoff_seconds: float) -> dict:
+    """Fetch all planned sources on a bounded pool; returns outcomes keyed by id(plan).
+
+    Sources are dispatched in plan order, but a plan is only started while its host has
+    fewer than `per_host_concurrency` fetches in flight, so one site never sees parallel
+    crawls from several of our sources.
+    """
+    outcomes: dict[int, dict] = {}
+    if not plans:
+        return outcomes
+
+    pending = list(plans)
+    in_flight_by_host: dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as executor:
+        running = {}
+        while pending or running:
+            idx = 0
+            while idx < len(pending) and len(running) < max_workers:
+                plan = pending[idx]
+                host = plan["host"]
+                if in_flight_by_host.get(host, 0) >= per_host_concurrency:
+                    idx += 1
+                    continue
+                pending.pop(idx)
+                in_flight_by_host[host] = in_flight_by_host.get(host, 0) + 1
+                future = executor.submit(
+                    _fetch_source_outcome,
+                    plan["source"],
+                    plan["source_kind"],
+                    plan["max_retries"],
+                    backoff_seconds,
+                )
+                running[future] = plan
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                plan = running.pop(future)
+                in_flight_by_host[plan["host"]] -= 1
+                outcomes[id(plan)] = future.result()
+    return outcomes
+
+
+def run_pipeline(replay_run_id: str | None = None, collect_llm_batch: bool = False) -> dict:
+    """Run the full pipeline; with `replay_run_id`, every fetch is served from that run's fetch archive.
+
+    A replay stays offline and leaves live state alone: LLM cache misses are counted, not sent, and the
+    summary goes to `replay_report.json` instead of the board outputs, run log and database. Its only
+    network use is polling a pending LLM batch when `collect_llm_batch` is set.
+    """
     run_id = str(uuid.uuid4())
     started_at_dt = datetime.now(timezone.utc)
 
@@ -200,6 +327,7 @@ def run_pipeline() -> dict:
     llm_model = None
     llm_scored_count = 0
     llm_cache_hits = 0
+    llm_cache_key_migrations = 0
     llm_failed_count = 0
     runtime_error = None
     runtime_cfg = {}
@@ -208,6 +336,8 @@ def run_pipeline() -> dict:
     db_repo = None
     llm_filtered_invalid = 0
     llm_overflow_skipped = 0
+    llm_usage = {}
+    llm_cache = None
     alerts = []
 
     try:
@@ -224,6 +354,8 @@ def run_pipeline() -> dict:
         source_retry_cfg = runtime_cfg.get("source_fetch", {}) if isinstance(runtime_cfg, dict) else {}
         max_retries = max(0, int(source_retry_cfg.get("max_retries", 0)))
         backoff_seconds = max(0.0, float(source_retry_cfg.get("backoff_seconds", 0.0)))
+        source_fetch_workers = max(1, min(32, int(source_retry_cfg.get("max_workers", 4))))
+        source_fetch_per_host = max(1, int(source_retry_cfg.get("per_host_concurrency", 1)))
         source_health_cfg = runtime_cfg.get("source_health", {}) if isinstance(runtime_cfg, dict) else {}
         source_health_enabled = bool(source_health_cfg.get("enabled", False))
         source_health_window = max(1, int(source_health_cfg.get("window_runs", 12)))
@@ -231,8 +363,21 @@ def run_pipeline() -> dict:
         source_degraded_threshold = max(0, min(100, int(source_health_cfg.get("degraded_score_threshold", 25))))
         source_min_events_for_skip = max(1, int(source_health_cfg.get("min_events_for_skip", 4)))
 
+        archive_cfg = runtime_cfg.get("fetch_archive", {}) if isinstance(runtime_cfg, dict) else {}
+        fetch_archive = FetchArchive(DATA / str(archive_cfg.get("dir") or "fetch_archive"))
+        fetch_replay = None
+        if replay_run_id:
+            fetch_replay = ArchiveReplay(fetch_archive, replay_run_id)
+            configure_fetch_replay(fetch_replay)
+            # Replays must see exactly the recorded inputs at full speed.
+            HOST_LIMITER.enabled = False
+            backoff_seconds = 0.0
+            log_event("pipeline_replay_started", run_id=run_id, replay_of=replay_run_id)
+        elif bool(archive_cfg.get("enabled", False)):
+            configure_fetch_archive(fetch_archive, run_id)
+
         source_health_map = {}
-        if db_repo and source_health_enabled:
+        if db_repo and source_health_enabled and not replay_run_id:
             for h in db_repo.get_source_health(window_runs=source_health_window, stale_after_hours=source_stale_after_hours):
                 source_health_map[str(h.get("source_name") or "")] = h
 
@@ -248,82 +393,140 @@ def run_pipeline() -> dict:
         source_specs.extend([("greenhouse", s) for s in sources.get("greenhouse_sources", [])])
         source_specs.extend([("lever", s) for s in sources.get("lever_sources", [])])
 
+        # Plan every source up front (health skips + retry budgets) so the concurrent stage below
+        # can merge results back in spec order and keep events/errors deterministic.
+        fetch_plans = []
         for source_kind, s in source_specs:
             if s.get("enabled", True) is False:
                 continue
 
-            started = time.monotonic()
-            attempts = 0
-            jobs = []
-            error_text = None
-            success = False
             source_health = source_health_map.get(s.get("name", ""))
             local_max_retries = max_retries
+            skip_reason = None
             if source_health:
                 if (
                     int(source_health.get("total_events", 0)) >= source_min_events_for_skip
                     and int(source_health.get("health_score", 0)) <= source_degraded_threshold
                 ):
-                    error_text = "skipped by source health policy"
+                    skip_reason = "skipped by source health policy"
                     alerts.append(f"source {s.get('name')} skipped due to low health score")
-                    source_events.append(
-                        {
-                            "run_id": run_id,
-                            "source_name": s.get("name", ""),
-                            "source_kind": source_kind,
-                            "source_type": s.get("type", "unknown"),
-                            "source_url": s.get("url", ""),
-                            "attempts": 0,
-                            "success": False,
-                            "jobs_fetched": 0,
-                            "duration_ms": int((time.monotonic() - started) * 1000),
-                            "error_message": error_text,
-                        }
-                    )
-                    continue
+                else:
+                    # Tune retries down for historically flaky sources so one feed does not dominate run time.
+                    if float(source_health.get("success_rate", 1.0)) < 0.35:
+                        local_max_retries = min(local_max_retries, 1)
+                    if bool(source_health.get("stale", False)):
+                        alerts.append(f"source {s.get('name')} appears stale")
+            fetch_plans.append(
+                {
+                    "source_kind": source_kind,
+                    "source": s,
+                    "host": _source_host_key(s, source_kind),
+                    "max_retries": local_max_retries,
+                    "skip_reason": skip_reason,
+                }
+            )
 
-                # Tune retries down for historically flaky sources so one feed does not dominate run time.
-                if float(source_health.get("success_rate", 1.0)) < 0.35:
-                    local_max_retries = min(local_max_retries, 1)
-                if bool(source_health.get("stale", False)):
-                    alerts.append(f"source {s.get('name')} appears stale")
-            try:
-                jobs, attempts = _fetch_with_retry(
-                    lambda: _fetch_source_jobs(s, source_kind),
-                    max_retries=local_max_retries,
-                    backoff_seconds=backoff_seconds,
+        http_cache_cfg = runtime_cfg.get("http_cache", {}) if isinstance(runtime_cfg, dict) else {}
+        if bool(http_cache_cfg.get("enabled", False)):
+            configure_http_cache(DATA / str(http_cache_cfg.get("dir") or "http_cache"))
+        playwright_cfg = runtime_cfg.get("playwright_worker", {}) if isinstance(runtime_cfg, dict) else {}
+        playwright_worker = None
+        if bool(playwright_cfg.get("enabled", False)):
+            playwright_worker = configure_playwright_worker(max(1, int(playwright_cfg.get("max_pages", 4) or 4)))
+        openclaw_cfg = runtime_cfg.get("openclaw_session", {}) if isinstance(runtime_cfg, dict) else {}
+        openclaw_session = configure_openclaw_session(bool(openclaw_cfg.get("enabled", False)))
+        detail_cache_cfg = runtime_cfg.get("detail_cache", {}) if isinstance(runtime_cfg, dict) else {}
+        detail_cache = None
+        if bool(detail_cache_cfg.get("enabled", False)) and not replay_run_id:
+            detail_cache = configure_detail_cache(
+                DetailCache(
+                    DATA / str(detail_cache_cfg.get("path") or "detail_cache.sqlite"),
+                    ttl_hours=float(detail_cache_cfg.get("ttl_hours", 168)),
                 )
-                fetched.extend(jobs)
-                success = True
-            except (HTTPError, URLError, TimeoutError, ValueError) as e:
-                attempts = int(getattr(e, "_attempts", attempts or 1))
-                error_text = str(e)
-                errors.append({"source": s.get("name"), "url": s.get("url"), "error": error_text})
-            except Exception as e:
-                attempts = int(getattr(e, "_attempts", attempts or 1))
-                if source_kind == "browser":
-                    error_text = f"browser source failed: {e}"
+            )
+        scoreboard_cfg = runtime_cfg.get("backend_scoreboard", {}) if isinstance(runtime_cfg, dict) else {}
+        backend_scoreboard = None
+        if bool(scoreboard_cfg.get("enabled", False)) and not replay_run_id:
+            scoreboard_rows = []
+            if db_repo is not None:
+                try:
+                    scoreboard_rows = db_repo.get_backend_scoreboard()
+                except Exception as e:
+                    print(f"Metadata notice: backend scoreboard unavailable: {e}")
+            backend_scoreboard = configure_backend_scoreboard(scoreboard_from_config(scoreboard_rows, scoreboard_cfg))
+
+        fetch_stage_started = time.monotonic()
+        fetch_outcomes = _run_source_fetch_stage(
+            [p for p in fetch_plans if not p["skip_reason"]],
+            max_workers=source_fetch_workers,
+            per_host_concurrency=source_fetch_per_host,
+            backoff_seconds=backoff_seconds,
+        )
+        fetch_stage_ms = int((time.monotonic() - fetch_stage_started) * 1000)
+        openclaw_stats = dict(openclaw_session.stats) if openclaw_session is not None else {}
+        # Listing and detail fetches of browser sources all happen inside the fetch stage.
+        configure_openclaw_session(False)
+
+        for plan in fetch_plans:
+            s = plan["source"]
+            source_kind = plan["source_kind"]
+            if plan["skip_reason"]:
+                outcome = {
+                    "jobs": [],
+                    "attempts": 0,
+                    "success": False,
+                    "error_text": plan["skip_reason"],
+                    "duration_ms": 0,
+                    "fetch_stats": {},
+                    "backend_stats": {},
+                }
+            else:
+                outcome = fetch_outcomes[id(plan)]
+                if outcome["success"]:
+                    fetched.extend(outcome["jobs"])
                 else:
-                    error_text = f"unexpected: {e}"
-                errors.append({"source": s.get("name"), "url": s.get("url"), "error": error_text})
-            finally:
-                source_events.append(
-                    {
-                        "run_id": run_id,
-                        "source_name": s.get("name", ""),
-                        "source_kind": source_kind,
-                        "source_type": s.get("type", "unknown"),
-                        "source_url": s.get("url", ""),
-                        "attempts": attempts,
-                        "success": success,
-                        "jobs_fetched": len(jobs),
-                        "duration_ms": int((time.monotonic() - started) * 1000),
-                        "error_message": error_text,
-                    }
+                    errors.append({"source": s.get("name"), "url": s.get("url"), "error": outcome["error_text"]})
+            source_events.append(
+                {
+                    "run_id": run_id,
+                    "source_name": s.get("name", ""),
+                    "source_kind": source_kind,
+                    "source_type": s.get("type", "unknown"),
+                    "source_url": s.get("url", ""),
+                    "attempts": outcome["attempts"],
+                    "success": outcome["success"],
+                    "jobs_fetched": len(outcome["jobs"]),
+                    "duration_ms": outcome["duration_ms"],
+                    "error_message": outcome["error_text"],
+                    "cache_hits": int(outcome["fetch_stats"].get("cache_hits", 0)),
+                    "cache_misses": int(outcome["fetch_stats"].get("cache_misses", 0)),
+                    "cache_not_modified": int(outcome["fetch_stats"].get("cache_not_modified", 0)),
+                    "backend_stats": outcome["backend_stats"],
+                }
+            )
+            if outcome["backend_stats"]:
+                log_event(
+                    "source_fetch_benchmark",
+                    run_id=run_id,
+                    source_name=s.get("name", ""),
+                    duration_ms=outcome["duration_ms"],
+                    backends=outcome["backend_stats"],
                 )
 
         fetched = dedupe_jobs(fetched)
-        enriched = [enrich_job_detail(j) for j in fetched]
+        enrichment_cfg = runtime_cfg.get("detail_enrichment", {}) if isinstance(runtime_cfg, dict) else {}
+        enriched, enrichment_stats = enrich_job_details(
+            fetched,
+            max_workers=max(1, min(32, int(enrichment_cfg.get("max_workers", 6)))),
+            per_domain_concurrency=max(1, int(enrichment_cfg.get("per_domain_concurrency", 2))),
+            requests_per_second=max(0.0, float(enrichment_cfg.get("requests_per_second", 3.0))),
+            timeout=max(1, int(enrichment_cfg.get("timeout_sec", 20))),
+        )
+        if backend_scoreboard is not None and db_repo is not None:
+            try:
+                db_repo.upsert_backend_scoreboard(backend_scoreboard.rows(dirty_only=True))
+            except Exception as e:
+                print(f"Metadata notice: backend scoreboard persistence failed: {e}")
         llm_cfg = scoring_cfg.get("llm_pipeline")
         if not isinstance(llm_cfg, dict):
             raise RuntimeError("config/scoring.json must define llm_pipeline settings")
@@ -333,6 +536,8 @@ def run_pipeline() -> dict:
         llm_max_jobs = max(1, int(llm_cfg.get("max_jobs_per_run", 300)))
         llm_drop_invalid = bool(llm_cfg.get("drop_invalid", True))
         prompt_version = str(llm_cfg.get("prompt_version", "v2"))
+        # Extraction prompts leave the profile out; scores come from the rules over the extracted fields.
+        llm_local_scoring = uses_profile_free_extraction(prompt_version)
         llm_no_description_truncation = bool(llm_cfg.get("no_description_truncation", False))
         raw_description_limit = int(llm_cfg.get("description_max_chars", 2500))
         if llm_no_description_truncation or raw_description_limit <= 0:
@@ -361,13 +566,59 @@ def run_pipeline() -> dict:
             min(120, int(llm_cfg.get("parallel_workers_max", max(32, llm_parallel_initial)))),
         )
         llm_parallel_round_multiplier = max(1, min(6, int(llm_cfg.get("parallel_round_multiplier", 2))))
+        llm_parallel_executor = str(llm_cfg.get("parallel_executor", "rounds")).strip().lower()
+        llm_concurrency_stats = {}
+        llm_streaming_cfg = llm_cfg.get("streaming", {}) if isinstance(llm_cfg.get("streaming"), dict) else {}
+        llm_streaming = bool(llm_streaming_cfg.get("enabled", False))
+        # Plain prompt versions build the default prompt, so only options that change the call are passed on.
+        llm_parse_options = {}
+        if uses_description_spans(prompt_version) or llm_local_scoring:
+            llm_parse_options["prompt_version"] = prompt_version
+        if llm_streaming:
+            llm_parse_options["stream"] = True
+        llm_batch_cfg = llm_cfg.get("batch", {}) if isinstance(llm_cfg.get("batch"), dict) else {}
+        llm_batch_enabled = bool(llm_batch_cfg.get("enabled", False))
+        llm_batch_stats = {"enabled": llm_batch_enabled, "requests": 0, "jobs": 0, "fallback_jobs": 0, "malformed": 0}
+        batch_api_cfg = llm_cfg.get("batch_api", {}) if isinstance(llm_cfg.get("batch_api"), dict) else {}
+        batch_api_stats = {
+            "enabled": bool(batch_api_cfg.get("enabled", False)),
+            "batch_id": "",
+            "status": "",
+            "submitted_jobs": 0,
+            "collected_jobs": 0,
+            "failed_jobs": 0,
+            "deferred_jobs": 0,
+        }
+
+        scheduler_cfg = llm_cfg.get("scheduler", {}) if isinstance(llm_cfg.get("scheduler"), dict) else {}
+        scheduler_stats = {
+            "enabled": bool(scheduler_cfg.get("enabled", False)),
+            "token_budget": max(0, int(scheduler_cfg.get("token_budget", 0))),
+        }
+        cascade_cfg = llm_cfg.get("cascade", {}) if isinstance(llm_cfg.get("cascade"), dict) else {}
+        cascade_model = str(cascade_cfg.get("first_pass_model", "")).strip()
+        cascade_min_score = int(cascade_cfg.get("escalate_min_score", 50))
+        cascade_min_confidence = float(cascade_cfg.get("escalate_below_confidence", 0.6))
+        cascade_stats = {
+            "enabled": bool(cascade_cfg.get("enabled", False)) and bool(cascade_model) and cascade_model != llm_model,
+            "first_pass_model": cascade_model,
+            "first_pass_live": 0,
+            "first_pass_cache_hits": 0,
+            "settled_by_first_pass": 0,
+            "escalated": 0,
+        }
+        # Main-model cache key -> (first-pass cache key, cached first-pass parse or None).
+        cascade_first: dict[str, tuple[str, dict | None]] = {}
+        # First-pass parses made by the workers this run, by main-model cache key. The cache is written on the
+        # main thread, so they are picked up there once the job is done, whether or not escalation succeeded.
+        cascade_fresh: dict[str, dict] = {}
 
         if not llm_enabled:
             raise RuntimeError("llm_pipeline must be enabled for the current prototype pipeline")
 
-        llm_cache_path = DATA / "llm_parse_cache.json"
-        llm_cache = load_llm_parse_cache(llm_cache_path)
-        llm_cache_entries = llm_cache.get("entries", {})
+        llm_cache = LlmParseCache(DATA / "llm_parse_cache.sqlite", legacy_json_path=DATA / "llm_parse_cache.json")
+        # Token throughput is measured over the LLM stage only.
+        LLM_USAGE.reset()
 
         candidates = []
         for j in enriched:
@@ -376,9 +627,97 @@ def run_pipeline() -> dict:
                 skipped_applied += 1
                 continue
             candidates.append(j)
+
+        triage_cfg = scoring_cfg.get("pre_triage", {}) if isinstance(scoring_cfg.get("pre_triage"), dict) else {}
+        triage_stats = {
+            "enabled": bool(triage_cfg.get("enabled", False)),
+            "evaluated": 0,
+            "llm_calls_saved": 0,
+            "reasons": {},
+        }
+        if triage_stats["enabled"]:
+            hard_reject_reasons = pre_triage_reject_reasons(triage_cfg)
+            min_rule_score = max(0, int(triage_cfg.get("min_rule_score", 0)))
+            llm_candidates = []
+            for j in candidates:
+                needs_llm, rule_fields = triage_job(
+                    j,
+                    profile,
+                    constraints,
+                    hard_reject_reasons=hard_reject_reasons,
+                    min_rule_score=min_rule_score,
+                    tier_thresholds=scoring_cfg.get("tier_thresholds"),
+                )
+                triage_stats["evaluated"] += 1
+                if needs_llm:
+                    llm_candidates.append({**j, "rule_score": rule_fields["rule_score"]})
+                    continue
+                ranked.append({**j, **rule_fields})
+                triage_stats["llm_calls_saved"] += 1
+                reason = str(rule_fields["reasons"][0]) if rule_fields["reasons"] else "rules"
+                triage_stats["reasons"][reason] = int(triage_stats["reasons"].get(reason, 0)) + 1
+            candidates = llm_candidates
+            print(
+                f"Pre-triage: {triage_stats['llm_calls_saved']}/{triage_stats['evaluated']} jobs settled by rules, "
+                "skipping the LLM"
+            )
+
+        near_dup_cfg = scoring_cfg.get("near_duplicates")
+        near_dup_cfg = near_dup_cfg if isinstance(near_dup_cfg, dict) else {}
+        near_dup_stats = {
+            "enabled": bool(near_dup_cfg.get("enabled", False)),
+            "clusters": 0,
+            "duplicates": 0,
+            "propagated": 0,
+        }
+        duplicates_by_canonical: dict[str, list[dict]] = {}
+        if near_dup_stats["enabled"] and len(candidates) > 1:
+            clusters = cluster_near_duplicates(
+                candidates,
+                max_distance=max(0, int(near_dup_cfg.get("max_hamming_distance", 7))),
+                min_title_overlap=float(near_dup_cfg.get("min_title_overlap", 0.5)),
+            )
+            dropped = set()
+            for members in clusters:
+                canonical = canonical_member(candidates, members)
+                canonical_url = str(candidates[canonical].get("url") or "").strip()
+                if not canonical_url:
+                    continue
+                near_dup_stats["clusters"] += 1
+                for idx in members:
+                    if idx == canonical:
+                        continue
+                    dropped.add(idx)
+                    duplicates_by_canonical.setdefault(canonical_url, []).append(
+                        {**candidates[idx], "duplicate_of": canonical_url}
+                    )
+            near_dup_stats["duplicates"] = len(dropped)
+            candidates = [j for idx, j in enumerate(candidates) if idx not in dropped]
+            if dropped:
+                print(
+                    f"Near-duplicates: {len(dropped)} postings folded into "
+                    f"{near_dup_stats['clusters']} canonical jobs"
+                )
+        token_budget = TokenBudget(scheduler_stats["token_budget"])
+        if scheduler_stats["enabled"] and len(candidates) > 1:
+            source_yield = {}
+            if db_repo is not None:
+                try:
+                    source_yield = db_repo.get_source_yield(int(scheduler_cfg.get("source_yield_runs", 10)))
+                except Exception as e:
+                    print(f"Metadata notice: source yield lookup failed: {e}")
+            scheduler = LlmCandidateScheduler(
+                profile,
+                constraints,
+                source_yield=source_yield,
+                weights=scheduler_cfg.get("weights") if isinstance(scheduler_cfg.get("weights"), dict) else None,
+                fresh_days=float(scheduler_cfg.get("fresh_days", 14)),
+            )
+            # Highest prior first, so overflow and budget cuts drop the least promising jobs.
+            candidates = scheduler.order(candidates)
         candidate_target = min(len(candidates), llm_max_jobs)
         print(
-            f"LLM evaluation started: {candidate_target} jobs (timeout/job={llm_job_timeout_sec}s, cache={len(llm_cache_entries)})"
+            f"LLM evaluation started: {candidate_target} jobs (timeout/job={llm_job_timeout_sec}s, cache={llm_cache.count()})"
         )
 
         completed_count = 0
@@ -387,19 +726,22 @@ def run_pipeline() -> dict:
         def _emit_progress():
             if completed_count % llm_progress_every != 0 and completed_count != candidate_target:
                 return
-            _save_llm_cache_snapshot(
-                path=llm_cache_path,
-                entries=llm_cache_entries,
-                model=llm_model,
-                prompt_version=prompt_version,
-            )
             print(
                 f"LLM progress {completed_count}/{candidate_target} "
                 f"(live={llm_scored_count}, cache={llm_cache_hits}, failed={llm_failed_count}, filtered={llm_filtered_invalid})"
             )
 
+        def _with_local_score(job: dict, llm_out: dict) -> dict:
+            if not llm_local_scoring:
+                return llm_out
+            score, tier, reasons, _ = score_extracted_job(
+                job, llm_out, profile, constraints, constraints.get("company_watchlist")
+            )
+            return {**llm_out, "score": score, "tier": tier, "reasons": reasons}
+
         def _ingest_llm_out(job: dict, llm_out: dict, scored_by: str):
             nonlocal llm_filtered_invalid
+            llm_out = _with_local_score(job, llm_out)
             is_job_posting = bool(llm_out.get("is_job_posting", True))
             if not is_job_posting and llm_drop_invalid:
                 llm_filtered_invalid += 1
@@ -418,7 +760,7 @@ def run_pipeline() -> dict:
 
             row["remote_hint"] = bool(normalized.get("remote_hint", row.get("remote_hint", False)))
             row["score"] = max(0, min(100, int(normalized.get("score", 0))))
-            row["tier"] = "A" if row["score"] >= 70 else ("B" if row["score"] >= 50 else "C")
+            row["tier"] = tier_for_score(row["score"], scoring_cfg.get("tier_thresholds"))
             row["reasons"] = [str(x)[:120] for x in (normalized.get("reasons") or [])[:8]]
             row["llm_summary"] = str(normalized.get("summary") or "")[:180]
             row["quality_flags"] = [str(x)[:80] for x in (normalized.get("quality_flags") or [])[:8]]
@@ -429,6 +771,57 @@ def run_pipeline() -> dict:
             row["scored_by"] = scored_by
             ranked.append(row)
 
+        def _store_batch_results(state: dict, results: dict) -> dict[str, dict]:
+            collected = {}
+            for custom_id, entry in (state.get("jobs") or {}).items():
+                job = entry.get("job") or {}
+                out = results.get(custom_id)
+                if not isinstance(out, dict):
+                    batch_api_stats["failed_jobs"] += 1
+                    errors.append(
+                        {
+                            "source": str(job.get("source") or ""),
+                            "url": str(job.get("url") or ""),
+                            "error": f"llm_evaluation_failed: {str(out or 'missing batch result')[:220]}",
+                        }
+                    )
+                    continue
+                llm_out = validate_llm_parse_output(
+                    job,
+                    out,
+                    llm_description_max_chars,
+                    llm_input_description_chars,
+                    str(state.get("prompt_version") or prompt_version),
+                )
+                llm_cache.put(
+                    entry["cache_key"],
+                    llm_out,
+                    model=str(state.get("model") or llm_model),
+                    prompt_version=str(state.get("prompt_version") or prompt_version),
+                    job_url=str(job.get("url") or ""),
+                )
+                collected[entry["cache_key"]] = llm_out
+            batch_api_stats["collected_jobs"] += len(collected)
+            return collected
+
+        batch_client = None
+        batch_state_store = LlmBatchState(DATA / "llm_batch_state.json")
+        pending_batch = None
+        if batch_api_stats["enabled"] and (not replay_run_id or collect_llm_batch):
+            try:
+                batch_client = BatchApiClient()
+                pending_batch = batch_state_store.load()
+                if pending_batch is not None:
+                    # Results of an earlier run's batch go into the cache before the lookups below.
+                    pending_batch, batch_results = poll_llm_batch(batch_client, batch_state_store, pending_batch)
+                    batch_api_stats.update(batch_id=pending_batch["batch_id"], status=pending_batch["status"])
+                    if batch_results is not None:
+                        _store_batch_results(pending_batch, batch_results)
+                        pending_batch = None
+            except Exception as e:
+                print(f"LLM batch API unavailable, using synchronous calls: {str(e)[:220]}")
+                batch_client = None
+
         for idx, job in enumerate(candidates):
             if idx >= llm_max_jobs:
                 llm_overflow_skipped += 1
@@ -440,143 +833,364 @@ def run_pipeline() -> dict:
                 prompt_version=prompt_version,
                 description_chars=llm_input_description_chars,
             )
-            cached_key = next((k for k in ckeys if k in llm_cache_entries), None)
-            cached = llm_cache_entries.get(cached_key) if cached_key else None
-            if cached and isinstance(cached, dict):
+            cached_key, cached = llm_cache.lookup(ckeys, prompt_version=prompt_version)
+            if cached:
                 llm_cache_hits += 1
-                _ingest_llm_out(job=job, llm_out=cached, scored_by=f"llm:{llm_model}:cache")
+                if cached_key != ckeys[0]:
+                    # Hit on a pre-canonical key: copy it forward so the next run hits directly.
+                    llm_cache_key_migrations += 1
+                    llm_cache.put(
+                        ckeys[0],
+                        cached,
+                        model=llm_model,
+                        prompt_version=prompt_version,
+                        job_url=str(job.get("url") or ""),
+                    )
+                _ingest_llm_out(
+                    job=job,
+                    llm_out=reapply_source_fields(job, cached),
+                    scored_by=f"llm:{llm_model}:cache",
+                )
                 completed_count += 1
                 _emit_progress()
                 continue
 
+            if cascade_stats["enabled"]:
+                first_key = llm_parse_cache_keys(
+                    job=job,
+                    model=cascade_model,
+                    prompt_version=prompt_version,
+                    description_chars=llm_input_description_chars,
+                )[0]
+                _, first_cached = llm_cache.lookup([first_key], prompt_version=prompt_version)
+                if first_cached:
+                    cascade_stats["first_pass_cache_hits"] += 1
+                    if not cascade_needs_escalation(
+                        _with_local_score(job, first_cached), cascade_min_score, cascade_min_confidence
+                    ):
+                        llm_cache_hits += 1
+                        cascade_stats["settled_by_first_pass"] += 1
+                        _ingest_llm_out(
+                            job=job,
+                            llm_out=reapply_source_fields(job, first_cached),
+                            scored_by=f"llm:{cascade_model}:cache",
+                        )
+                        completed_count += 1
+                        _emit_progress()
+                        continue
+                cascade_first[ckeys[0]] = (first_key, first_cached or None)
+
+            if scheduler_stats["token_budget"]:
+                estimated_tokens = estimate_input_tokens(
+                    job,
+                    input_description_chars=llm_input_description_chars,
+                    overhead_tokens=int(scheduler_cfg.get("overhead_tokens", DEFAULT_OVERHEAD_TOKENS)),
+                    chars_per_token=float(scheduler_cfg.get("chars_per_token", 4)),
+                )
+                if not token_budget.admit(estimated_tokens):
+                    llm_overflow_skipped += 1
+                    continue
             live_jobs.append((job, ckeys))
 
-        def _process_live_result(job: dict, ckeys: list[str], llm_out: dict):
+        def _cache_first_pass(job: dict, ckeys: list[str], first_pass: dict):
+            # Both cascade tiers are cached under their own model's key.
+            cascade_stats["first_pass_live"] += 1
+            llm_cache.put(
+                cascade_first[ckeys[0]][0],
+                first_pass,
+                model=cascade_model,
+                prompt_version=prompt_version,
+                job_url=str(job.get("url") or ""),
+            )
+
+        def _process_live_result(
+            job: dict, ckeys: list[str], llm_out: dict, model: str = llm_model, first_pass: dict | None = None
+        ):
             nonlocal llm_scored_count
             llm_scored_count += 1
-            llm_cache_entries[ckeys[0]] = {
-                **llm_out,
-                "updated_at": datetime.now(timezone.utc).isoformat(),
-                "model": llm_model,
-                "prompt_version": prompt_version,
-            }
-            _ingest_llm_out(job=job, llm_out=llm_out, scored_by=f"llm:{llm_model}:live")
-
-        if llm_parallel_initial <= 1:
-            for job, ckeys in live_jobs:
-                try:
-                    llm_out = _call_with_hard_timeout(
-                        llm_job_timeout_sec,
-                        llm_parse_job,
-                        job=job,
-                        profile=profile,
-                        constraints=constraints,
-                        model=llm_model,
-                        description_max_chars=llm_description_max_chars,
-                        input_description_max_chars=llm_input_description_chars,
-                    )
-                    _process_live_result(job=job, ckeys=ckeys, llm_out=llm_out)
-                except Exception as e:
-                    llm_failed_count += 1
-                    errors.append(
-                        {
-                            "source": str(job.get("source") or ""),
-                            "url": str(job.get("url") or ""),
-                            "error": f"llm_evaluation_failed: {str(e)[:220]}",
-                        }
-                    )
-                finally:
-                    completed_count += 1
-                    _emit_progress()
-        else:
-            worker_count = llm_parallel_initial
-            cursor = 0
-            live_total = len(live_jobs)
-            print(
-                "LLM adaptive concurrency enabled: "
-                f"initial={llm_parallel_initial}, min={llm_parallel_min}, max={llm_parallel_max}"
+            if first_pass is not None:
+                _cache_first_pass(job, ckeys, first_pass)
+            if model != llm_model:
+                cascade_stats["settled_by_first_pass"] += 1
+            else:
+                if cascade_stats["enabled"]:
+                    cascade_stats["escalated"] += 1
+                llm_cache.put(
+                    ckeys[0],
+                    llm_out,
+                    model=llm_model,
+                    prompt_version=prompt_version,
+                    job_url=str(job.get("url") or ""),
+                )
+            _ingest_llm_out(job=job, llm_out=llm_out, scored_by=f"llm:{model}:live")
+
+        def _record_llm_failure(job: dict, error_text: str):
+            nonlocal llm_failed_count
+            llm_failed_count += 1
+            errors.append(
+                {
+                    "source": str(job.get("source") or ""),
+                    "url": str(job.get("url") or ""),
+                    "error": f"llm_evaluation_failed: {error_text}",
+                }
             )
-            while cursor < live_total:
-                batch_limit = max(worker_count, worker_count * llm_parallel_round_multiplier)
-                batch = live_jobs[cursor : cursor + batch_limit]
-                cursor += len(batch)
-                if not batch:
-                    break
-
-                round_success = 0
-                round_failures = 0
-                round_rate_limited = 0
-                with ThreadPoolExecutor(max_workers=worker_count) as executor:
-                    futures = {
-                        executor.submit(
-                            llm_parse_job,
+
+        def _evaluate_batch(batch: list[tuple[dict, list[str]]]) -> list[tuple[dict, list[str], dict | None, str]]:
+            try:
+                outs = llm_parse_jobs_batch(
+                    [job for job, _ in batch],
+                    profile=profile,
+                    constraints=constraints,
+                    model=llm_model,
+                    description_max_chars=llm_description_max_chars,
+                    input_description_max_chars=llm_input_description_chars,
+                    prompt_version=prompt_version,
+                    timeout_sec=max(45, llm_job_timeout_sec),
+                )
+            except Exception:
+                llm_batch_stats["malformed"] += 1
+                outs = [None] * len(batch)
+            results = []
+            for (job, ckeys), llm_out in zip(batch, outs):
+                if llm_out is None:
+                    # Missing or malformed item: evaluate it on its own.
+                    llm_batch_stats["fallback_jobs"] += 1
+                    try:
+                        llm_out = llm_parse_job(
                             job=job,
                             profile=profile,
                             constraints=constraints,
                             model=llm_model,
                             description_max_chars=llm_description_max_chars,
                             input_description_max_chars=llm_input_description_chars,
-                        ): (job, ckeys)
-                        for job, ckeys in batch
-                    }
-
-                    for future in as_completed(futures):
-                        job, ckeys = futures[future]
-                        try:
-                            llm_out = future.result()
-                            _process_live_result(job=job, ckeys=ckeys, llm_out=llm_out)
-                            round_success += 1
-                        except Exception as e:
-                            round_failures += 1
-                            error_text = str(e)[:220]
-                            if "429" in error_text or "rate" in error_text.lower():
-                                round_rate_limited += 1
-                            llm_failed_count += 1
-                            errors.append(
-                                {
-                                    "source": str(job.get("source") or ""),
-                                    "url": str(job.get("url") or ""),
-                                    "error": f"llm_evaluation_failed: {error_text}",
-                                }
-                            )
-                        finally:
-                            completed_count += 1
-                            _emit_progress()
-
-                if round_rate_limited > 0:
-                    new_worker_count = max(llm_parallel_min, worker_count // 2)
-                    if new_worker_count != worker_count:
-                        print(
-                            "LLM concurrency backoff: "
-                            f"{worker_count} -> {new_worker_count} (rate_limited={round_rate_limited})"
+                            **llm_parse_options,
                         )
-                        worker_count = new_worker_count
-                    continue
+                    except Exception as e:
+                        results.append((job, ckeys, None, str(e)[:220]))
+                        continue
+                results.append((job, ckeys, llm_out, ""))
+            return results
 
-                if round_failures == 0 and round_success > 0 and worker_count < llm_parallel_max:
-                    grow_by = max(1, worker_count // 3)
-                    new_worker_count = min(llm_parallel_max, worker_count + grow_by)
-                    if new_worker_count != worker_count:
-                        print(
-                            "LLM concurrency scale-up: "
-                            f"{worker_count} -> {new_worker_count} (round_success={round_success})"
+        if batch_client is not None and live_jobs and pending_batch is None and not replay_run_id:
+            try:
+                pending_batch = submit_llm_batch(
+                    batch_client,
+                    batch_state_store,
+                    run_id=run_id,
+                    items=[
+                        (
+                            job,
+                            ckeys[0],
+                            *build_llm_parse_prompts(
+                                job,
+                                profile,
+                                constraints,
+                                llm_description_max_chars,
+                                llm_input_description_chars,
+                                prompt_version,
+                            ),
                         )
-                        worker_count = new_worker_count
+                        for job, ckeys in live_jobs
+                    ],
+                    model=llm_model,
+                    prompt_version=prompt_version,
+                )
+                batch_api_stats["submitted_jobs"] = len(live_jobs)
+                print(f"LLM batch submitted: {pending_batch['batch_id']} ({len(live_jobs)} jobs)")
+                pending_batch, batch_results = poll_llm_batch(
+                    batch_client,
+                    batch_state_store,
+                    pending_batch,
+                    wait_sec=float(batch_api_cfg.get("wait_sec", 0)),
+                    poll_interval_sec=max(1.0, float(batch_api_cfg.get("poll_interval_sec", 30))),
+                )
+                batch_api_stats.update(batch_id=pending_batch["batch_id"], status=pending_batch["status"])
+                if batch_results is not None:
+                    collected = _store_batch_results(pending_batch, batch_results)
+                    pending_batch = None
+                    for job, ckeys in live_jobs:
+                        if ckeys[0] in collected:
+                            llm_scored_count += 1
+                            _ingest_llm_out(job=job, llm_out=collected[ckeys[0]], scored_by=f"llm:{llm_model}:batch")
+                        else:
+                            llm_failed_count += 1
+                        completed_count += 1
+                        _emit_progress()
+                    live_jobs = []
+            except Exception as e:
+                print(f"LLM batch submission failed, using synchronous calls: {str(e)[:220]}")
+        if batch_client is not None and pending_batch is not None and live_jobs:
+            # Jobs in the pending batch are collected by the next run once it finishes (or only cached by
+            # `run_pipeline.py --collect-llm-batch-into-cache`); anything newer is evaluated synchronously below.
+            pending_keys = {str(entry.get("cache_key") or "") for entry in (pending_batch.get("jobs") or {}).values()}
+            deferred = [item for item in live_jobs if item[1][0] in pending_keys]
+            live_jobs = [item for item in live_jobs if item[1][0] not in pending_keys]
+            batch_api_stats["deferred_jobs"] = len(deferred)
+            print(
+                f"LLM batch {pending_batch['batch_id']} still {pending_batch['status']}; "
+                f"deferring {len(deferred)} jobs, evaluating {len(live_jobs)} new jobs synchronously"
+            )
+        replay_llm_skipped = 0
+        if replay_run_id and live_jobs:
+            # Replays are cache-only; a job the cache cannot answer is reported instead of sent to the API.
+            replay_llm_skipped = len(live_jobs)
+            print(f"Replay: {replay_llm_skipped} jobs not in the LLM cache are skipped")
+            live_jobs = []
+
+        if llm_batch_enabled and live_jobs:
+            batches, live_jobs = pack_llm_batches(
+                live_jobs,
+                max_items=max(2, int(llm_batch_cfg.get("max_items", 6))),
+                max_input_chars=max(1000, int(llm_batch_cfg.get("max_input_chars", 24000))),
+                short_description_chars=max(200, int(llm_batch_cfg.get("short_description_chars", 3000))),
+                description_of=lambda item: str(item[0].get("description") or ""),
+            )
+            if batches:
+                print(f"LLM batching: {sum(len(b) for b in batches)} jobs in {len(batches)} requests")
+            with ThreadPoolExecutor(max_workers=max(1, min(llm_parallel_initial, len(batches) or 1))) as executor:
+                for future in as_completed([executor.submit(_evaluate_batch, batch) for batch in batches]):
+                    llm_batch_stats["requests"] += 1
+                    for job, ckeys, llm_out, error_text in future.result():
+                        llm_batch_stats["jobs"] += 1
+                        if llm_out is not None:
+                            _process_live_result(job=job, ckeys=ckeys, llm_out=llm_out)
+                        else:
+                            _record_llm_failure(job, error_text)
+                        completed_count += 1
+                        _emit_progress()
+
+        def _evaluate_live(item: tuple[dict, list[str]]) -> tuple[dict, str]:
+            """(final parse, model that produced it); a fresh first-pass parse is left in `cascade_fresh`."""
+            job, ckeys = item
+            parse_kwargs = {
+                "job": job,
+                "profile": profile,
+                "constraints": constraints,
+                "description_max_chars": llm_description_max_chars,
+                "input_description_max_chars": llm_input_description_chars,
+                **llm_parse_options,
+            }
+            if not cascade_stats["enabled"]:
+                return llm_parse_job(model=llm_model, **parse_kwargs), llm_model
+            # A job requeued after a 429 on escalation reuses the first pass it already paid for.
+            first_pass = cascade_first[ckeys[0]][1] or cascade_fresh.get(ckeys[0])
+            if first_pass is None:
+                first_pass = cascade_fresh[ckeys[0]] = llm_parse_job(model=cascade_model, **parse_kwargs)
+            escalate = cascade_needs_escalation(
+                _with_local_score(job, first_pass), cascade_min_score, cascade_min_confidence
+            )
+            if not escalate:
+                return first_pass, cascade_model
+            return llm_parse_job(model=llm_model, **parse_kwargs), llm_model
+
+        def _evaluate_live_without_retries(item: tuple[dict, list[str]]) -> tuple[dict, str]:
+            # The work queue requeues 429s itself; retrying inside the call would hide them from the controller.
+            with openai_call_retries(0):
+                return _evaluate_live(item)
+
+        def _on_live_done(item: tuple[dict, list[str]], result: tuple | None, error: Exception | None):
+            nonlocal completed_count
+            job, ckeys = item
+            first_pass = cascade_fresh.pop(ckeys[0], None)
+            if error is None:
+                llm_out, model = result
+                _process_live_result(job=job, ckeys=ckeys, llm_out=llm_out, model=model, first_pass=first_pass)
+            else:
+                if first_pass is not None:
+                    _cache_first_pass(job, ckeys, first_pass)
+                _record_llm_failure(job, str(error)[:220])
+            completed_count += 1
+            _emit_progress()
 
-        _save_llm_cache_snapshot(
-            path=llm_cache_path,
-            entries=llm_cache_entries,
-            model=llm_model,
-            prompt_version=prompt_version,
-        )
+        if llm_parallel_initial <= 1:
+            for item in live_jobs:
+                try:
+                    result, error = _call_with_hard_timeout(llm_job_timeout_sec, _evaluate_live, item), None
+                except Exception as e:
+                    result, error = None, e
+                _on_live_done(item, result, error)
+        elif live_jobs:
+            print(
+                f"LLM adaptive concurrency enabled ({llm_parallel_executor}): "
+                f"initial={llm_parallel_initial}, min={llm_parallel_min}, max={llm_parallel_max}"
+            )
+            if llm_parallel_executor == "rounds":
+                llm_concurrency_stats = run_in_rounds(
+                    live_jobs,
+                    _evaluate_live,
+                    _on_live_done,
+                    initial=llm_parallel_initial,
+                    minimum=llm_parallel_min,
+                    maximum=llm_parallel_max,
+                    round_multiplier=llm_parallel_round_multiplier,
+                )
+            else:
+                llm_concurrency_stats = run_work_queue(
+                    live_jobs,
+                    _evaluate_live_without_retries,
+                    AimdController(
+                        llm_parallel_initial,
+                        minimum=llm_parallel_min,
+                        maximum=llm_parallel_max,
+                        decrease_factor=float(llm_cfg.get("parallel_decrease_factor", 0.5)),
+                        latency_target_sec=float(llm_cfg.get("parallel_latency_target_sec", 0)),
+                    ),
+                    _on_live_done,
+                    timeout_sec=llm_job_timeout_sec,
+                    rate_limit_retries=max(0, int(llm_cfg.get("parallel_rate_limit_retries", 2))),
+                )
+            llm_concurrency_stats = {"executor": llm_parallel_executor, **llm_concurrency_stats}
+
+        llm_cache_cfg = runtime_cfg.get("llm_cache", {}) if isinstance(runtime_cfg, dict) else {}
+        llm_cache_eviction = {}
+        if bool(llm_cache_cfg.get("maintenance_enabled", False)) and not replay_run_id:
+            cache_policy = maintenance_policy_from_config(llm_cache_cfg)
+            recent_urls, recent_since = None, None
+            if cache_policy.reclaim_unseen_runs > 0 and db_repo is not None:
+                try:
+                    recent_urls, recent_since = db_repo.get_recent_run_job_urls(cache_policy.reclaim_unseen_runs)
+                    recent_urls |= {str(j.get("url") or "").strip() for j in candidates}
+                except Exception as e:
+                    print(f"Metadata notice: recent run URLs unavailable for LLM cache reclaim: {e}")
+            try:
+                llm_cache_eviction = llm_cache.evict(cache_policy, recent_urls=recent_urls, recent_since=recent_since)
+            except Exception as e:
+                print(f"Metadata notice: LLM cache maintenance failed: {e}")
+        llm_cache_summary = {**llm_cache.summary(), "evicted": llm_cache_eviction}
+        llm_usage = {
+            "prompt_version": prompt_version,
+            **LLM_USAGE.snapshot(pricing=llm_cfg.get("pricing") if isinstance(llm_cfg.get("pricing"), dict) else None),
+        }
+        llm_usage["streaming"] = {"enabled": llm_streaming, **llm_usage["streaming"]}
+        if cascade_stats["enabled"]:
+            cascade_stats["tiers"] = {
+                tier: {
+                    "model": model,
+                    **{
+                        k: (llm_usage["by_model"].get(model) or {}).get(k, 0)
+                        for k in ("calls", "latency_ms", "avg_latency_ms", "cost_usd")
+                    },
+                }
+                for tier, model in (("first_pass", cascade_model), ("escalation", llm_model))
+            }
+
+        if duplicates_by_canonical:
+            # Duplicates keep their own listing fields and share the canonical member's evaluation.
+            for row in list(ranked):
+                for duplicate in duplicates_by_canonical.get(str(row.get("url") or "").strip(), []):
+                    ranked.append(
+                        {**duplicate, **{k: row[k] for k in _DUPLICATE_PROPAGATED_FIELDS if k in row}}
+                    )
+                    near_dup_stats["propagated"] += 1
 
         ranked.sort(key=lambda x: x["score"], reverse=True)
 
-        save_json(DATA / "jobs_normalized.json", ranked)
-        save_json(DATA / "last_errors.json", errors)
+        if not replay_run_id:
+            save_json(DATA / "jobs_normalized.json", ranked)
+            save_json(DATA / "last_errors.json", errors)
 
-        report_md = markdown_report(ranked, skipped_applied, errors)
-        (OUTPUT / "latest_report.md").write_text(report_md)
+            report_md = markdown_report(ranked, skipped_applied, errors)
+            (OUTPUT / "latest_report.md").write_text(report_md)
 
         summary = {
             "generated_at": datetime.now(timezone.utc).isoformat(),
@@ -587,11 +1201,44 @@ def run_pipeline() -> dict:
                 "C": len([x for x in ranked if x["tier"] == "C"]),
             },
             "skipped_applied": skipped_applied,
+            "fetch_stage": {
+                "duration_ms": fetch_stage_ms,
+                "max_workers": source_fetch_workers,
+                "per_host_concurrency": source_fetch_per_host,
+                "playwright_worker_restarts": playwright_worker.restarts if playwright_worker is not None else 0,
+                "openclaw_session": openclaw_stats,
+                "rate_limit_wait_ms": dict(HOST_LIMITER.waited_ms),
+            },
+            "enrichment": enrichment_stats,
+            "replay": (
+                {"run_id": replay_run_id, **fetch_replay.stats, "llm_skipped": replay_llm_skipped}
+                if fetch_replay is not None
+                else {}
+            ),
+            "detail_cache": dict(detail_cache.stats) if detail_cache is not None else {},
+            "pre_triage": triage_stats,
+            "near_duplicates": near_dup_stats,
+            "llm_cache": llm_cache_summary,
             "llm": {
                 "enabled": llm_enabled,
                 "model": llm_model,
+                "scoring": "rules_over_extraction" if llm_local_scoring else "llm",
                 "scored_live": llm_scored_count,
                 "cache_hits": llm_cache_hits,
+                "cache_hit_rate": round(llm_cache_hits / (llm_cache_hits + llm_scored_count + llm_failed_count), 4)
+                if (llm_cache_hits + llm_scored_count + llm_failed_count)
+                else 0.0,
+                "cache_key_migrations": llm_cache_key_migrations,
+                "batch": llm_batch_stats,
+                "batch_api": batch_api_stats,
+                "concurrency": llm_concurrency_stats,
+                "usage": llm_usage,
+                "scheduler": {
+                    **scheduler_stats,
+                    "estimated_tokens_used": token_budget.used,
+                    "budget_skipped": token_budget.rejected,
+                },
+                "cascade": cascade_stats,
                 "failed": llm_failed_count,
                 "filtered_invalid": llm_filtered_invalid,
                 "overflow_skipped": llm_overflow_skipped,
@@ -601,28 +1248,45 @@ def run_pipeline() -> dict:
         }
         if alerts:
             summary["alerts"] = alerts
-        save_json(OUTPUT / "latest_report.json", summary)
-        write_runtime_metrics_snapshot(
-            {
-                "generated_at": datetime.now(timezone.utc).isoformat(),
-                "run_id": run_id,
-                "jobs_total": summary["total"],
-                "tiers": summary["tiers"],
-                "source_errors": len(errors),
-                "llm_filtered_invalid": llm_filtered_invalid,
-                "llm_overflow_skipped": llm_overflow_skipped,
-                "alerts": alerts,
-            }
-        )
-        if db_repo and source_health_enabled:
-            current_health = db_repo.get_source_health(
-                window_runs=source_health_window,
-                stale_after_hours=source_stale_after_hours,
+        if replay_run_id:
+            # The board, run history, metrics snapshot and source health only reflect live runs.
+            save_json(OUTPUT / "replay_report.json", summary)
+        else:
+            save_json(OUTPUT / "latest_report.json", summary)
+            write_runtime_metrics_snapshot(
+                {
+                    "generated_at": datetime.now(timezone.utc).isoformat(),
+                    "run_id": run_id,
+                    "jobs_total": summary["total"],
+                    "tiers": summary["tiers"],
+                    "source_errors": len(errors),
+                    "llm_filtered_invalid": llm_filtered_invalid,
+                    "llm_overflow_skipped": llm_overflow_skipped,
+                    "alerts": alerts,
+                }
             )
-            save_json(DATA / "source_health.json", {"generated_at": datetime.now(timezone.utc).isoformat(), "sources": current_health})
+            if db_repo and source_health_enabled:
+                current_health = db_repo.get_source_health(
+                    window_runs=source_health_window,
+                    stale_after_hours=source_stale_after_hours,
+                )
+                save_json(
+                    DATA / "source_health.json",
+                    {"generated_at": datetime.now(timezone.utc).isoformat(), "sources": current_health},
+                )
 
         emit_metric("pipeline_run_success", tags={"run_id": run_id})
         emit_metric("pipeline_source_errors", value=len(errors), tags={"run_id": run_id})
+        emit_metric(
+            "pipeline_llm_cache_hit_rate",
+            value=summary["llm"]["cache_hit_rate"],
+            tags={"run_id": run_id, "prompt_version": prompt_version},
+        )
+        emit_metric(
+            "pipeline_llm_tokens",
+            value=llm_usage["prompt_tokens"] + llm_usage["completion_tokens"],
+            tags={"run_id": run_id, "model": llm_model},
+        )
         log_event("pipeline_run_completed", run_id=run_id, status="success", total_jobs=summary["total"], source_errors=len(errors))
 
         print(
@@ -630,7 +1294,9 @@ def run_pipeline() -> dict:
             f"B: {summary['tiers']['B']} | skipped_applied: {skipped_applied} | "
             f"llm_live: {llm_scored_count} | llm_cache: {llm_cache_hits} | "
             f"llm_failed: {llm_failed_count} | llm_filtered_invalid: {llm_filtered_invalid} | "
-            f"llm_overflow_skipped: {llm_overflow_skipped} | errors: {len(errors)}"
+            f"llm_overflow_skipped: {llm_overflow_skipped} | errors: {len(errors)} | "
+            f"llm_tokens: {llm_usage['prompt_tokens']}+{llm_usage['completion_tokens']} "
+            f"(${llm_usage['cost_usd']:.4f})"
         )
 
         return summary
@@ -642,6 +1308,18 @@ def run_pipeline() -> dict:
         raise
 
     finally:
+        configure_http_cache(None)
+        configure_playwright_worker(None)
+        configure_openclaw_session(False)
+        configure_backend_scoreboard(None)
+        configure_detail_cache(None)
+        configure_fetch_archive(None)
+        configure_fetch_replay(None)
+        if llm_cache is not None:
+            llm_cache.close()
+        HOST_LIMITER.reset()
+        reset_http_pools()
+        OPENAI_CLIENT.close()
         ended_at_dt = datetime.now(timezone.utc)
         duration_ms = int((ended_at_dt - started_at_dt).total_seconds() * 1000)
 
@@ -661,21 +1339,29 @@ def run_pipeline() -> dict:
             "llm_scored_live": llm_scored_count,
             "llm_cache_hits": llm_cache_hits,
             "llm_failed": llm_failed_count,
+            "llm_prompt_tokens": int(llm_usage.get("prompt_tokens", 0)),
+            "llm_completion_tokens": int(llm_usage.get("completion_tokens", 0)),
+            "llm_cached_tokens": int(llm_usage.get("cached_tokens", 0)),
+            "llm_cost_usd": float(llm_usage.get("cost_usd", 0.0)),
             "source_errors": len(errors),
             "error_message": str(runtime_error)[:400] if runtime_error else None,
             "summary": summary or {},
         }
 
-        notices = persist_run_metadata(
-            run_record=run_record,
-            run_log_path=DATA / "pipeline_runs.jsonl",
-            db_config=db_cfg,
-            migrations_dir=DB / "migrations",
-        )
+        # Replay runs are kept out of the run log and database, so health, yield and latest-run queries
+        # (and backfills from the log) only ever see live runs.
+        notices = []
+        if not replay_run_id:
+            notices = persist_run_metadata(
+                run_record=run_record,
+                run_log_path=DATA / "pipeline_runs.jsonl",
+                db_config=db_cfg,
+                migrations_dir=DB / "migrations",
+            )
         for n in notices:
             print(f"Metadata notice: {n}")
 
-        if runtime_error is not None:
+        if runtime_error is not None and not replay_run_id:
             alerts_cfg = operations_cfg.get("alerts", {}) if isinstance(operations_cfg, dict) else {}
             alert_enabled = bool(alerts_cfg.get("enabled", True))
             if alert_enabled:
@@ -687,7 +1373,7 @@ def run_pipeline() -> dict:
                     webhook_url=str(alerts_cfg.get("failure_webhook_url") or "").strip(),
                 )
 
-        if db_repo:
+        if db_repo and not replay_run_id:
             run_model = PipelineRunRecord.from_run_record(run_record)
 
             def _job_identity(job: dict) -> tuple[str, str]:
@@ -0,0 +1,152 @@
+import itertools
+import json
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from job_search.paths import BASE
+
+
+class PlaywrightWorkerError(RuntimeError):
+    pass
+
+
+def default_worker_command(max_pages: int) -> list[str]:
+    return ["node", str(BASE / "scripts" / "playwright_worker.mjs"), "--max-pages", str(max(1, int(max_pages)))]
+
+
+class PlaywrightWorker:
+    """Long-lived `scripts/playwright_worker.mjs` process driven over line-delimited JSON.
+
+    The process is started lazily on the first fetch and restarted if it dies; requests are
+    matched to responses by id so callers on several threads can share one browser.
+    """
+
+    def __init__(self, command: list[str], startup_timeout_sec: float = 60.0, max_restarts: int = 3):
+        self.command = list(command)
+        self.startup_timeout_sec = float(startup_timeout_sec)
+        self.max_restarts = max(0, int(max_restarts))
+        self.restarts = 0
+        self._started = False
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._proc: subprocess.Popen | None = None
+        self._pending: dict[int, tuple[subprocess.Popen, Future]] = {}
+        self._ids = itertools.count(1)
+
+    def _spawn(self):
+        proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        ready: Future = Future()
+        threading.Thread(target=self._read_loop, args=(proc, ready), daemon=True).start()
+        try:
+            hello = ready.result(timeout=self.startup_timeout_sec)
+        except FutureTimeoutError as e:
+            proc.kill()
+            raise PlaywrightWorkerError("playwright worker did not become ready") from e
+        if not bool(hello.get("ready")):
+            proc.kill()
+            raise PlaywrightWorkerError(str(hello.get("error") or "playwright worker failed to start"))
+        self._proc = proc
+
+    def _read_loop(self, proc: subprocess.Popen, ready: Future):
+        for line in proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                payload = json.loads(line)
+            except Exception:
+                continue
+            if not isinstance(payload, dict):
+                continue
+            if "ready" in payload and not ready.done():
+                ready.set_result(payload)
+                continue
+            with self._lock:
+                entry = self._pending.pop(payload.get("id"), None)
+            if entry is not None and not entry[1].done():
+                entry[1].set_result(payload)
+        # stdout closed: the process exited, fail whatever was still waiting on it.
+        if not ready.done():
+            ready.set_result({"ready": False, "error": f"playwright worker exited with code {proc.wait()}"})
+        with self._lock:
+            if self._proc is proc:
+                self._proc = None
+            orphaned = [rid for rid, (owner, _) in self._pending.items() if owner is proc]
+            pending = [self._pending.pop(rid)[1] for rid in orphaned]
+        for future in pending:
+            if not future.done():
+                future.set_exception(PlaywrightWorkerError("playwright worker exited"))
+
+    def _ensure_running(self):
+        with self._write_lock:
+            with self._lock:
+                proc = self._proc
+            if proc is not None and proc.poll() is None:
+                return
+            if self._started:
+                if self.restarts >= self.max_restarts:
+                    raise PlaywrightWorkerError("playwright worker crashed too often")
+                self.restarts += 1
+            self._started = True
+            self._spawn()
+
+    def fetch(self, url: str, timeout_sec: int, user_agent: str = "", wait_until: str = "domcontentloaded") -> dict:
+        self._ensure_running()
+        request_id = next(self._ids)
+        future: Future = Future()
+        with self._lock:
+            proc = self._proc
+            if proc is not None:
+                self._pending[request_id] = (proc, future)
+        if proc is None:
+            raise PlaywrightWorkerError("playwright worker is not running")
+        message = {
+            "id": request_id,
+            "url": str(url),
+            "timeoutMs": max(1000, int(timeout_sec) * 1000),
+            "waitUntil": wait_until,
+            "userAgent": user_agent,
+        }
+        started = time.monotonic()
+        try:
+            with self._write_lock:
+                proc.stdin.write(json.dumps(message) + "\n")
+                proc.stdin.flush()
+        except (BrokenPipeError, OSError, ValueError) as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise PlaywrightWorkerError(f"playwright worker write failed: {e}") from e
+        try:
+            # The worker enforces the navigation timeout; the slack covers queueing behind busy pages.
+            payload = future.result(timeout=max(5, int(timeout_sec) * 2 + 10))
+        except FutureTimeoutError as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise PlaywrightWorkerError(f"playwright worker timed out for {url}") from e
+        timings = dict(payload.get("timings") or {})
+        timings["roundtrip_ms"] = int((time.monotonic() - started) * 1000)
+        payload["timings"] = timings
+        return payload
+
+    def close(self):
+        with self._write_lock:
+            with self._lock:
+                proc, self._proc = self._proc, None
+            if proc is None:
+                return
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=10)
+            except Exception:
+                proc.kill()
@@ -154,3 +154,79 @@ def score_job(job, profile, constraints, watchlist_cfg: dict | None = None):
     score = max(0, min(100, score))
     tier = "A" if score >= 70 else ("B" if score >= 50 else "C")
     return score, tier, reasons, skill_hits[:8]
+
+
+def score_extracted_job(job: dict, extracted: dict, profile, constraints, watchlist_cfg: dict | None = None):
+    """`score_job` over profile-independent LLM extraction fields instead of the raw listing.
+
+    The extracted title, location and cleaned description replace the listing's; the `skills` tags are
+    matched as part of the text and a known `seniority` counts as part of the title.
+    """
+    if not bool(extracted.get("is_job_posting", True)):
+        return 0, "C", ["not a job posting"], []
+    row = dict(job)
+    for field in ("title", "company", "location", "description"):
+        value = str(extracted.get(field) or "").strip()
+        if value:
+            row[field] = value
+    row["remote_hint"] = bool(extracted.get("remote_hint", row.get("remote_hint", False)))
+    skills = [str(x) for x in extracted.get("skills") or []]
+    if skills:
+        row["description"] = f"{row.get('description') or ''}\nskills: {', '.join(skills)}"
+    seniority = str(extracted.get("seniority") or "").strip().lower()
+    if seniority and seniority != "unknown" and seniority not in str(row.get("title") or "").lower():
+        row["title"] = f"{seniority} {row.get('title') or ''}"
+    return score_job(row, profile, constraints, watchlist_cfg)
+
+
+DEFAULT_TIER_THRESHOLDS = {"A": 70, "B": 50}
+
+
+def tier_for_score(score: int, thresholds: dict | None = None) -> str:
+    """A/B/C tier of a final score; `thresholds` is `scoring.json` `tier_thresholds` (minimum score per tier)."""
+    limits = {**DEFAULT_TIER_THRESHOLDS, **(thresholds if isinstance(thresholds, dict) else {})}
+    if score >= int(limits["A"]):
+        return "A"
+    return "B" if score >= int(limits["B"]) else "C"
+
+
+# Geo/exclusion verdicts of `is_geo_compatible` that rule a posting out regardless of its content.
+HARD_REJECT_REASONS = ("geo restricted remote", "explicit exclusion marker")
+
+
+def pre_triage_reject_reasons(triage_cfg: dict | None) -> tuple[str, ...]:
+    """Rule verdicts that settle a job without the LLM under `scoring.json` `pre_triage`; empty when it is off."""
+    triage_cfg = triage_cfg if isinstance(triage_cfg, dict) else {}
+    if not bool(triage_cfg.get("enabled", False)):
+        return ()
+    reasons = tuple(triage_cfg.get("hard_reject_reasons") or HARD_REJECT_REASONS)
+    if bool(triage_cfg.get("reject_outside_target_location", False)):
+        reasons += ("not remote and outside target location",)
+    return reasons
+
+
+def triage_job(
+    job: dict,
+    profile: dict,
+    constraints: dict,
+    hard_reject_reasons=HARD_REJECT_REASONS,
+    min_rule_score: int = 0,
+    tier_thresholds: dict | None = None,
+) -> tuple[bool, dict]:
+    """Rule-score `job` ahead of the LLM; returns (needs_llm, rule fields for the ranked row).
+
+    A job is settled by the rules when the geo check fails for one of `hard_reject_reasons`
+    or, if `min_rule_score` is set, when its rule score falls below it. Settled rows are tiered
+    with `tier_thresholds` like every other ranked row.
+    """
+    score, _, reasons, skill_hits = score_job(job, profile, constraints, constraints.get("company_watchlist"))
+    fields = {"rule_score": score, "skill_hits": skill_hits}
+    rejected = bool(reasons) and reasons[0] in tuple(hard_reject_reasons)
+    if not rejected and min_rule_score > 0 and score < min_rule_score:
+        rejected = True
+        reasons = [*reasons, f"rule score below {int(min_rule_score)}"]
+    if rejected:
+        fields.update(
+            {"score": score, "tier": tier_for_score(score, tier_thresholds), "reasons": reasons[:8], "scored_by": "rules"}
+        )
+    return not rejected, fields
@@ -0,0 +1,133 @@
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+def rate_limit_host(url: str) -> str:
+    host = (urlparse(str(url or "")).hostname or "").strip().lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class _HostBucket:
+    def __init__(self, interval_sec: float, jitter_sec: float, burst: int, max_in_flight: int):
+        self.interval_sec = max(0.0, float(interval_sec))
+        self.jitter_sec = max(0.0, float(jitter_sec))
+        self.burst = max(1, int(burst))
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.slots = threading.BoundedSemaphore(self.max_in_flight)
+        # Theoretical arrival time of the next request (GCRA form of a token bucket).
+        self.tat = 0.0
+
+
+class HostRateLimiter:
+    """Per-host token bucket shared by every fetch in a run.
+
+    Each host refills one token per `interval_sec` (plus up to `jitter_sec` of random extra
+    spacing) and may burst `burst` requests; `max_in_flight` caps concurrent requests. Callers
+    only wait for their own host, so fetches to different hosts overlap freely.
+    """
+
+    def __init__(self, default_interval_sec: float = 0.0, default_jitter_sec: float = 0.0, default_max_in_flight: int = 4):
+        self.default_interval_sec = float(default_interval_sec)
+        self.default_jitter_sec = float(default_jitter_sec)
+        self.default_max_in_flight = max(1, int(default_max_in_flight))
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _HostBucket] = {}
+        self.waited_ms: dict[str, int] = {}
+        self.enabled = True
+
+    def configure_host(
+        self,
+        host: str,
+        interval_sec: float,
+        jitter_sec: float = 0.0,
+        burst: int = 1,
+        max_in_flight: int | None = None,
+    ):
+        """Set the pace for `host`; the slowest setting wins when several sources share a host."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                self._buckets[host] = _HostBucket(
+                    interval_sec, jitter_sec, burst, max_in_flight or self.default_max_in_flight
+                )
+                return
+            bucket.interval_sec = max(bucket.interval_sec, float(interval_sec))
+            bucket.jitter_sec = max(bucket.jitter_sec, float(jitter_sec))
+            bucket.burst = min(bucket.burst, max(1, int(burst)))
+            if max_in_flight and int(max_in_flight) < bucket.max_in_flight:
+                # Fetches already holding a slot release it on the semaphore they acquired.
+                bucket.max_in_flight = max(1, int(max_in_flight))
+                bucket.slots = threading.BoundedSemaphore(bucket.max_in_flight)
+
+    def _bucket(self, host: str) -> _HostBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = _HostBucket(self.default_interval_sec, self.default_jitter_sec, 1, self.default_max_in_flight)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _reserve(self, host: str, bucket: _HostBucket) -> float:
+        with self._lock:
+            now = time.monotonic()
+            spacing = bucket.interval_sec + (random.uniform(0.0, bucket.jitter_sec) if bucket.jitter_sec > 0 else 0.0)
+            allowed_at = bucket.tat - (bucket.burst - 1) * bucket.interval_sec
+            start_at = max(now, allowed_at)
+            bucket.tat = max(bucket.tat, start_at) + spacing
+            delay = start_at - now
+            self.waited_ms[host] = int(self.waited_ms.get(host, 0)) + int(delay * 1000)
+            return delay
+
+    @contextmanager
+    def acquire(self, url_or_host: str):
+        if not self.enabled:
+            yield
+            return
+        host = rate_limit_host(url_or_host) if "://" in str(url_or_host) else str(url_or_host or "").lower()
+        bucket = self._bucket(host)
+        slots = bucket.slots
+        with slots:
+            delay = self._reserve(host, bucket)
+            if delay > 0:
+                time.sleep(delay)
+            yield
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+            self.waited_ms.clear()
+            self.enabled = True
+
+
+HOST_LIMITER = HostRateLimiter()
+
+
+def delay_range_to_pace(delay_min_ms: int, delay_max_ms: int) -> tuple[float, float]:
+    """Map the legacy `detail_delay_{min,max}_ms` sleep range onto (interval_sec, jitter_sec).
+
+    The old loop slept uniform(min, max) between requests; a bucket refilling every `min`
+    with up to `max - min` of jitter gives each host the same average spacing.
+    """
+    low = max(0, int(delay_min_ms))
+    high = max(low, int(delay_max_ms))
+    return low / 1000.0, (high - low) / 1000.0
+
+
+def map_in_context(fn, items: list, max_workers: int) -> list:
+    """ThreadPoolExecutor.map that runs each call in a copy of the caller's contextvars.
+
+    Fetch stats are collected through a ContextVar; plain executor threads would drop it.
+    """
+    items = list(items)
+    if not items:
+        return []
+    if max_workers <= 1 or len(items) == 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [f.result() for f in futures]
@@ -0,0 +1,170 @@
+import heapq
+import uuid
+from datetime import datetime, timezone
+
+from job_search.adaptive_scoring import adaptive_bonus_for_job, build_adaptive_profile
+from job_search.json_io import load_json
+from job_search.llm_cache_store import LlmParseCache
+from job_search.models import JobRankingRecord, PipelineRunRecord
+from job_search.paths import CONFIG, DATA
+from job_search.ranking import pre_triage_reject_reasons, score_extracted_job, score_job, tier_for_score
+
+_SUMMARY_TOP = 25
+
+
+def _scored_by_model(scored_by: str) -> str:
+    """Model name of an "llm:<model>:<how>" ranking label, else ""."""
+    parts = str(scored_by or "").split(":")
+    return parts[1] if len(parts) >= 3 and parts[0] == "llm" else ""
+
+
+def rerank_job(
+    job: dict,
+    stored: dict,
+    cached: dict | None,
+    profile: dict,
+    constraints: dict,
+    tier_thresholds: dict | None = None,
+    adaptive_profile: dict | None = None,
+    hard_reject_reasons: tuple[str, ...] = (),
+) -> dict:
+    """Ranked row for a stored `job` under the current profile, constraints and tier thresholds.
+
+    Rule verdicts in `hard_reject_reasons` (the pipeline's pre-triage rejects) are settled by the rules.
+    Otherwise the cached LLM output wins: an extraction (no `score`) is rule-scored against the current
+    profile, a scored parse keeps its score.
+    Without a cache entry an LLM-scored row keeps its `stored` ranking and anything else is rule-scored.
+    """
+    watchlist = constraints.get("company_watchlist")
+    rule_score, _, rule_reasons, skill_hits = score_job(job, profile, constraints, watchlist)
+    stored_by = str(stored.get("scored_by") or "rules")
+    if rule_reasons and rule_reasons[0] in hard_reject_reasons:
+        score, reasons, scored_by = rule_score, rule_reasons, "rules"
+    elif cached is not None:
+        if "score" in cached:
+            score, reasons = int(cached.get("score") or 0), [str(x) for x in cached.get("reasons") or []]
+        else:
+            score, _, reasons, _ = score_extracted_job(job, cached, profile, constraints, watchlist)
+        scored_by = f"llm:{cached.get('model') or _scored_by_model(stored_by)}:cache"
+    elif stored_by.startswith("llm:"):
+        score, reasons, scored_by = int(stored.get("score") or 0), list(stored.get("reasons") or []), stored_by
+    else:
+        score, reasons, scored_by = rule_score, rule_reasons, "rules"
+
+    bonus, adaptive_reasons = adaptive_bonus_for_job(job, adaptive_profile) if adaptive_profile else (0, [])
+    score = max(0, min(100, score + bonus))
+    return {
+        **job,
+        "id": str(stored.get("job_id") or job.get("id") or job.get("url") or ""),
+        "score": score,
+        "tier": tier_for_score(score, tier_thresholds),
+        "rule_score": rule_score,
+        "skill_hits": skill_hits,
+        "reasons": [*reasons, *adaptive_reasons][:8],
+        "llm_summary": str(stored.get("llm_summary") or ""),
+        "llm_pros": list(stored.get("llm_pros") or []),
+        "llm_risks": list(stored.get("llm_risks") or []),
+        "scored_by": scored_by,
+    }
+
+
+def rerank_run(
+    repo,
+    source_run_id: str,
+    adaptive: bool = False,
+    user_id: str = "default",
+    page_size: int = 500,
+    run_id: str | None = None,
+) -> dict:
+    """Re-score the jobs of a stored run into a new derived run, offline.
+
+    Reads the run's rankings page by page, re-applies `rerank_job` with the current config and cached
+    LLM outputs, and writes fresh `job_rankings` rows under a new run id. Makes no fetches and no LLM
+    calls. Raises LookupError for an unknown run; returns the derived run's summary.
+    """
+    source = repo.get_run(source_run_id)
+    if not source:
+        raise LookupError(f"run not found: {source_run_id}")
+    profile = load_json(CONFIG / "profile.json")
+    constraints = load_json(CONFIG / "constraints.json", default={})
+    scoring_cfg = load_json(CONFIG / "scoring.json", default={})
+    tier_thresholds = scoring_cfg.get("tier_thresholds")
+    hard_reject_reasons = pre_triage_reject_reasons(scoring_cfg.get("pre_triage"))
+    source_llm = (source.get("summary") or {}).get("llm") or {}
+    prompt_version = str((source_llm.get("usage") or {}).get("prompt_version") or "")
+    adaptive_profile = build_adaptive_profile(repo.get_feedback_signal_data(user_id=user_id)) if adaptive else None
+
+    run_id = run_id or str(uuid.uuid4())
+    started_at = datetime.now(timezone.utc)
+    run_record = {
+        "run_id": run_id,
+        "started_at": started_at.isoformat(),
+        "status": "running",
+        "llm_enabled": bool(source.get("llm_enabled")),
+        "llm_model": source.get("llm_model"),
+        "derived_from": source_run_id,
+        "summary": {"rerank_of": source_run_id},
+    }
+    # The run row goes in first so the ranking pages below always belong to a known run.
+    repo.upsert_pipeline_run(PipelineRunRecord.from_run_record(run_record))
+
+    tiers = {"A": 0, "B": 0, "C": 0}
+    stats = {"jobs": 0, "llm_cache_hits": 0, "tier_changes": 0, "scored_by": {}}
+    top: list[tuple[int, int, dict]] = []
+    error = None
+    llm_cache = LlmParseCache(DATA / "llm_parse_cache.sqlite")
+    try:
+        for page in repo.iter_run_rankings(source_run_id, page_size=page_size):
+            rankings = []
+            for stored in page:
+                job = stored["job"] or {"id": stored["job_id"], "url": stored["job_id"]}
+                cached = llm_cache.latest_for_url(
+                    str(job.get("duplicate_of") or job.get("url") or ""),
+                    model=_scored_by_model(stored.get("scored_by")),
+                    prompt_version=prompt_version,
+                )
+                row = rerank_job(
+                    job, stored, cached, profile, constraints, tier_thresholds, adaptive_profile, hard_reject_reasons
+                )
+                rankings.append(JobRankingRecord.from_ranked_job(run_id, row))
+                stats["jobs"] += 1
+                stats["llm_cache_hits"] += 1 if cached is not None else 0
+                stats["tier_changes"] += 1 if row["tier"] != stored.get("tier") else 0
+                stats["scored_by"][row["scored_by"]] = stats["scored_by"].get(row["scored_by"], 0) + 1
+                tiers[row["tier"]] += 1
+                entry = (row["score"], -stats["jobs"], row)
+                if len(top) < _SUMMARY_TOP:
+                    heapq.heappush(top, entry)
+                else:
+                    heapq.heappushpop(top, entry)
+            repo.append_run_rankings(rankings)
+    except Exception as e:
+        error = e
+    finally:
+        llm_cache.close()
+
+    ended_at = datetime.now(timezone.utc)
+    summary = {
+        "generated_at": ended_at.isoformat(),
+        "rerank_of": source_run_id,
+        "total": stats["jobs"],
+        "tiers": tiers,
+        "rerank": {**stats, "prompt_version": prompt_version, "adaptive": bool(adaptive_profile)},
+        "top": [row for _, _, row in sorted(top, reverse=True)],
+    }
+    run_record.update(
+        ended_at=ended_at.isoformat(),
+        duration_ms=int((ended_at - started_at).total_seconds() * 1000),
+        status="failed" if error else "success",
+        total_jobs=stats["jobs"],
+        a_tier=tiers["A"],
+        b_tier=tiers["B"],
+        c_tier=tiers["C"],
+        llm_cache_hits=stats["llm_cache_hits"],
+        error_message=str(error)[:400] if error else None,
+        summary=summary,
+    )
+    repo.upsert_pipeline_run(PipelineRunRecord.from_run_record(run_record))
+    if error is not None:
+        raise error
+    return {"run_id": run_id, **summary}
@@ -55,9 +55,10 @@ def insert_pipeline_run(db_url: str, run_record: dict):
                 run_id, started_at, ended_at, status, duration_ms,
                 total_jobs, a_tier, b_tier, c_tier, skipped_applied,
                 llm_enabled, llm_model, llm_scored_live, llm_cache_hits, llm_failed,
-                source_errors, error_message, summary_json
+                source_errors, error_message, summary_json,
+                llm_prompt_tokens, llm_completion_tokens, llm_cached_tokens, llm_cost_usd
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             (
                 run_record.get("run_id"),
@@ -78,6 +79,10 @@ def insert_pipeline_run(db_url: str, run_record: dict):
                 int(run_record.get("source_errors", 0)),
                 run_record.get("error_message"),
                 json.dumps(run_record.get("summary", {}), ensure_ascii=False),
+                int(run_record.get("llm_prompt_tokens", 0)),
+                int(run_record.get("llm_completion_tokens", 0)),
+                int(run_record.get("llm_cached_tokens", 0)),
+                float(run_record.get("llm_cost_usd", 0.0)),
             ),
         )
         conn.commit()
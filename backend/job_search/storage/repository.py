@@ -2,6 +2,7 @@ import json
 import sqlite3
 import re
 from datetime import datetime, timedelta, timezone
+from collections.abc import Iterator
 from email.utils import parsedate_to_datetime
 from pathlib import Path
 
@@ -51,7 +52,8 @@ class JobSearchRepository:
                 SELECT run_id, started_at, ended_at, status, duration_ms,
                        total_jobs, a_tier, b_tier, c_tier, skipped_applied,
                        llm_enabled, llm_model, llm_scored_live, llm_cache_hits, llm_failed,
-                       source_errors
+                       source_errors, llm_prompt_tokens, llm_completion_tokens, llm_cached_tokens, llm_cost_usd,
+                       derived_from
                 FROM pipeline_runs
                 ORDER BY started_at DESC
                 LIMIT ?
@@ -73,7 +75,8 @@ class JobSearchRepository:
                 SELECT run_id, started_at, ended_at, status, duration_ms,
                        total_jobs, a_tier, b_tier, c_tier, skipped_applied,
                        llm_enabled, llm_model, llm_scored_live, llm_cache_hits, llm_failed,
-                       source_errors, error_message, summary_json
+                       source_errors, error_message, summary_json,
+                       llm_prompt_tokens, llm_completion_tokens, llm_cached_tokens, llm_cost_usd, derived_from
                 FROM pipeline_runs
                 WHERE run_id = ?
                 LIMIT 1
@@ -115,14 +118,20 @@ class JobSearchRepository:
             rows = conn.execute(
                 """
                 SELECT source_name, source_kind, source_type, source_url,
-                       attempts, success, jobs_fetched, duration_ms, error_message, created_at
+                       attempts, success, jobs_fetched, duration_ms, error_message,
+                       cache_hits, cache_misses, cache_not_modified, backend_stats_json, created_at
                 FROM source_fetch_events
                 WHERE run_id = ?
                 ORDER BY source_name ASC
                 """,
                 (run_id,),
             ).fetchall()
-            return [dict(row) for row in rows]
+            out = []
+            for row in rows:
+                item = dict(row)
+                item["backend_stats"] = self._parse_json_object(item.pop("backend_stats_json", None))
+                out.append(item)
+            return out
         finally:
             conn.close()
 
@@ -260,6 +269,7 @@ class JobSearchRepository:
             "llm_risks": llm_risks,
             "salary": (normalized.get("salary") if isinstance(normalized.get("salary"), dict) else {}),
             "cv_variant": str(normalized.get("cv_variant") or "").strip(),
+            "duplicate_of": str(normalized.get("duplicate_of") or "").strip(),
             "cv_recommendation_reasons": (
                 normalized.get("cv_recommendation_reasons")
                 if isinstance(normalized.get("cv_recommendation_reasons"), list)
@@ -942,6 +952,7 @@ class JobSearchRepository:
                 WITH recent_runs AS (
                     SELECT run_id
                     FROM pipeline_runs
+                    WHERE derived_from IS NULL
                     ORDER BY started_at DESC
                     LIMIT ?
                 )
@@ -999,6 +1010,168 @@ class JobSearchRepository:
         finally:
             conn.close()
 
+    def get_recent_run_job_urls(self, window_runs: int = 10) -> tuple[set[str], str | None]:
+        """URLs ranked in the last `window_runs` pipeline runs (reranks excluded) and the oldest one's start time."""
+        run_limit = max(1, int(window_runs))
+        conn = connect_sqlite(self.db_url)
+        try:
+            runs = conn.execute(
+                """
+                SELECT run_id, started_at
+                FROM pipeline_runs
+                WHERE derived_from IS NULL
+                ORDER BY started_at DESC
+                LIMIT ?
+                """,
+                (run_limit,),
+            ).fetchall()
+            if not runs:
+                return set(), None
+            rows = conn.execute(
+                f"""
+                SELECT DISTINCT j.url
+                FROM job_rankings r
+                JOIN jobs j
+                  ON j.id = r.job_id
+                WHERE r.run_id IN ({",".join("?" for _ in runs)})
+                """,
+                [row["run_id"] for row in runs],
+            ).fetchall()
+            return {str(row["url"]).strip() for row in rows if row["url"]}, min(row["started_at"] for row in runs)
+        finally:
+            conn.close()
+
+    def get_source_yield(self, window_runs: int = 10) -> dict[str, float]:
+        """Share of A/B-tier rankings per source over the last `window_runs` pipeline runs (reranks excluded)."""
+        run_limit = max(1, int(window_runs))
+        conn = connect_sqlite(self.db_url)
+        try:
+            rows = conn.execute(
+                """
+                SELECT j.source AS source,
+                       COUNT(*) AS ranked,
+                       SUM(CASE WHEN r.tier IN ('A', 'B') THEN 1 ELSE 0 END) AS hits
+                FROM job_rankings r
+                JOIN jobs j
+                  ON j.id = r.job_id
+                WHERE r.run_id IN (
+                  SELECT run_id FROM pipeline_runs
+                  WHERE derived_from IS NULL
+                  ORDER BY started_at DESC LIMIT ?
+                )
+                GROUP BY j.source
+                """,
+                (run_limit,),
+            ).fetchall()
+            return {
+                str(row["source"] or ""): float(row["hits"] or 0) / int(row["ranked"])
+                for row in rows
+                if int(row["ranked"] or 0) > 0
+            }
+        finally:
+            conn.close()
+
+    def iter_run_rankings(self, run_id: str, page_size: int = 500) -> Iterator[list[dict]]:
+        """Rankings of `run_id` in pages of `page_size`, each row with its stored job under `job`.
+
+        Pages are read with keyset pagination on the ranking id, so memory stays bounded by one page.
+        """
+        last_id = 0
+        while True:
+            conn = connect_sqlite(self.db_url)
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT jr.id, jr.job_id, jr.score, jr.tier, jr.rule_score, jr.reasons_json,
+                           jr.skill_hits_json, jr.llm_summary, jr.llm_pros_json, jr.llm_risks_json, jr.scored_by,
+                           j.normalized_json
+                    FROM job_rankings jr
+                    LEFT JOIN jobs j
+                      ON j.id = jr.job_id
+                    WHERE jr.run_id = ? AND jr.id > ?
+                    ORDER BY jr.id ASC
+                    LIMIT ?
+                    """,
+                    (run_id, last_id, max(1, int(page_size))),
+                ).fetchall()
+            finally:
+                conn.close()
+            if not rows:
+                return
+            last_id = int(rows[-1]["id"])
+            page = []
+            for row in rows:
+                item = dict(row)
+                item["job"] = self._parse_json_object(item.pop("normalized_json", None))
+                item["reasons"] = self._parse_json_array(item.pop("reasons_json", None))
+                item["skill_hits"] = self._parse_json_array(item.pop("skill_hits_json", None))
+                item["llm_pros"] = self._parse_json_array(item.pop("llm_pros_json", None))
+                item["llm_risks"] = self._parse_json_array(item.pop("llm_risks_json", None))
+                page.append(item)
+            yield page
+
+    def append_run_rankings(self, rankings: list[JobRankingRecord]):
+        conn = connect_sqlite(self.db_url)
+        try:
+            self._insert_rankings_conn(conn, rankings)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_backend_scoreboard(self) -> list[dict]:
+        conn = connect_sqlite(self.db_url)
+        try:
+            rows = conn.execute(
+                """
+                SELECT host, backend, attempts, successes, success_ewma, latency_ewma_ms,
+                       last_success_at, last_failure_at, updated_at
+                FROM backend_scoreboard
+                ORDER BY host ASC, backend ASC
+                """
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    def upsert_backend_scoreboard(self, rows: list[dict]):
+        if not rows:
+            return
+        conn = connect_sqlite(self.db_url)
+        try:
+            conn.executemany(
+                """
+                INSERT INTO backend_scoreboard (
+                    host, backend, attempts, successes, success_ewma, latency_ewma_ms,
+                    last_success_at, last_failure_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(host, backend) DO UPDATE SET
+                    attempts = excluded.attempts,
+                    successes = excluded.successes,
+                    success_ewma = excluded.success_ewma,
+                    latency_ewma_ms = excluded.latency_ewma_ms,
+                    last_success_at = excluded.last_success_at,
+                    last_failure_at = excluded.last_failure_at,
+                    updated_at = excluded.updated_at
+                """,
+                [
+                    (
+                        r["host"],
+                        r["backend"],
+                        int(r["attempts"]),
+                        int(r["successes"]),
+                        float(r["success_ewma"]),
+                        float(r["latency_ewma_ms"]),
+                        r.get("last_success_at"),
+                        r.get("last_failure_at"),
+                        r.get("updated_at") or datetime.now(timezone.utc).isoformat(),
+                    )
+                    for r in rows
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
     def add_feedback_events(self, events: list[FeedbackEventRecord]):
         if not events:
             return
@@ -1062,9 +1235,10 @@ class JobSearchRepository:
                 run_id, started_at, ended_at, status, duration_ms,
                 total_jobs, a_tier, b_tier, c_tier, skipped_applied,
                 llm_enabled, llm_model, llm_scored_live, llm_cache_hits, llm_failed,
-                source_errors, error_message, summary_json
+                source_errors, error_message, summary_json,
+                llm_prompt_tokens, llm_completion_tokens, llm_cached_tokens, llm_cost_usd, derived_from
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(run_id) DO UPDATE SET
                 started_at = excluded.started_at,
                 ended_at = excluded.ended_at,
@@ -1082,7 +1256,12 @@ class JobSearchRepository:
                 llm_failed = excluded.llm_failed,
                 source_errors = excluded.source_errors,
                 error_message = excluded.error_message,
-                summary_json = excluded.summary_json
+                summary_json = excluded.summary_json,
+                llm_prompt_tokens = excluded.llm_prompt_tokens,
+                llm_completion_tokens = excluded.llm_completion_tokens,
+                llm_cached_tokens = excluded.llm_cached_tokens,
+                llm_cost_usd = excluded.llm_cost_usd,
+                derived_from = excluded.derived_from
             """,
             (
                 run.run_id,
@@ -1103,6 +1282,11 @@ class JobSearchRepository:
                 run.source_errors,
                 run.error_message,
                 run.summary_json,
+                run.llm_prompt_tokens,
+                run.llm_completion_tokens,
+                run.llm_cached_tokens,
+                run.llm_cost_usd,
+                run.derived_from,
             ),
         )
 
@@ -1113,9 +1297,9 @@ class JobSearchRepository:
             """
             INSERT INTO jobs (
                 id, source, source_type, title, company, location, remote_hint,
-                url, description, published, fetched_at, normalized_json
+                url, description, published, fetched_at, normalized_json, duplicate_of
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(id) DO UPDATE SET
                 source = excluded.source,
                 source_type = excluded.source_type,
@@ -1127,7 +1311,8 @@ class JobSearchRepository:
                 description = excluded.description,
                 published = excluded.published,
                 fetched_at = excluded.fetched_at,
-                normalized_json = excluded.normalized_json
+                normalized_json = excluded.normalized_json,
+                duplicate_of = excluded.duplicate_of
             """,
             [
                 (
@@ -1143,6 +1328,7 @@ class JobSearchRepository:
                     j.published,
                     j.fetched_at,
                     j.normalized_json,
+                    j.duplicate_of,
                 )
                 for j in jobs
             ],
@@ -1155,6 +1341,9 @@ class JobSearchRepository:
         rankings: list[JobRankingRecord],
     ):
         conn.execute("DELETE FROM job_rankings WHERE run_id = ?", (run_id,))
+        self._insert_rankings_conn(conn, rankings)
+
+    def _insert_rankings_conn(self, conn: sqlite3.Connection, rankings: list[JobRankingRecord]):
         if not rankings:
             return
         conn.executemany(
@@ -1207,9 +1396,10 @@ class JobSearchRepository:
             """
             INSERT INTO source_fetch_events (
                 run_id, source_name, source_kind, source_type, source_url,
-                attempts, success, jobs_fetched, duration_ms, error_message
+                attempts, success, jobs_fetched, duration_ms, error_message,
+                cache_hits, cache_misses, cache_not_modified, backend_stats_json
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
             [
                 (
@@ -1223,6 +1413,10 @@ class JobSearchRepository:
                     e.jobs_fetched,
                     e.duration_ms,
                     e.error_message,
+                    e.cache_hits,
+                    e.cache_misses,
+                    e.cache_not_modified,
+                    e.backend_stats_json,
                 )
                 for e in source_events
             ],
@@ -26,6 +26,7 @@ def _build_run_record_from_report(report: dict, total_jobs: int) -> dict:
     run_id = f"backfill-{_slugify(generated_at)}"
     tiers = report.get("tiers", {}) if isinstance(report, dict) else {}
     llm = report.get("llm", {}) if isinstance(report, dict) else {}
+    usage = llm.get("usage", {}) if isinstance(llm, dict) and isinstance(llm.get("usage"), dict) else {}
 
     return {
         "run_id": run_id,
@@ -43,6 +44,10 @@ def _build_run_record_from_report(report: dict, total_jobs: int) -> dict:
         "llm_scored_live": int(llm.get("scored_live", 0)) if isinstance(llm, dict) else 0,
         "llm_cache_hits": int(llm.get("cache_hits", 0)) if isinstance(llm, dict) else 0,
         "llm_failed": int(llm.get("failed", 0)) if isinstance(llm, dict) else 0,
+        "llm_prompt_tokens": int(usage.get("prompt_tokens", 0)),
+        "llm_completion_tokens": int(usage.get("completion_tokens", 0)),
+        "llm_cached_tokens": int(usage.get("cached_tokens", 0)),
+        "llm_cost_usd": float(usage.get("cost_usd", 0.0)),
         "source_errors": len(report.get("errors", [])) if isinstance(report, dict) else 0,
         "error_message": None,
         "summary": report if isinstance(report, dict) else {},
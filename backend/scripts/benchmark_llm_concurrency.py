@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from job_search.llm_executor import AimdController, run_in_rounds, run_work_queue
+from job_search.llm_scoring import call_openai_json
+from job_search.llm_simulator import SIMULATED_LLM_PROFILES, SimulatedLlmEndpoint
+
+
+def _benchmark(executor: str, args) -> dict:
+    latencies = []
+    lock = threading.Lock()
+
+    def _call(idx: int) -> dict:
+        # Like the pipeline, the work queue requeues 429s itself so the controller sees every one.
+        return call_openai_json(
+            model="simulated",
+            system_prompt="Return JSON.",
+            user_prompt=json.dumps({"job": idx}),
+            timeout_sec=max(1, int(args.timeout)),
+            max_retries=args.max_retries if executor == "rounds" else 0,
+        )
+
+    def _timed(idx: int) -> dict:
+        started = time.monotonic()
+        try:
+            return _call(idx)
+        finally:
+            with lock:
+                latencies.append(time.monotonic() - started)
+
+    def _on_done(item, result, error):
+        return None
+
+    with SimulatedLlmEndpoint(SIMULATED_LLM_PROFILES[args.profile], time_scale=args.time_scale) as endpoint:
+        os.environ["OPENAI_BASE_URL"] = endpoint.base_url
+        started = time.monotonic()
+        if executor == "rounds":
+            stats = run_in_rounds(
+                list(range(args.jobs)),
+                _timed,
+                _on_done,
+                initial=args.initial,
+                minimum=args.min,
+                maximum=args.max,
+                round_multiplier=args.round_multiplier,
+            )
+        else:
+            stats = run_work_queue(
+                list(range(args.jobs)),
+                _timed,
+                AimdController(args.initial, minimum=args.min, maximum=args.max),
+                _on_done,
+                timeout_sec=args.timeout,
+                rate_limit_retries=args.max_retries,
+            )
+        elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        "executor": executor,
+        "wall_sec": round(elapsed, 2),
+        "jobs_per_sec": round(args.jobs / elapsed, 2) if elapsed else 0.0,
+        "completed": stats["completed"],
+        "failed": stats["failed"],
+        "p95_job_sec": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else 0.0,
+        "server_429": endpoint.stats["rate_limited"],
+        "peak_in_flight": endpoint.stats["peak_in_flight"],
+        "final_limit": stats.get("final_limit"),
+        "requeued": stats.get("requeued"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the AIMD work-queue and round-based LLM executors against a simulated endpoint"
+    )
+    parser.add_argument("--profile", choices=sorted(SIMULATED_LLM_PROFILES), default="rate_limited")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--time-scale", type=float, default=0.1, help="Multiply all simulated latencies by this")
+    parser.add_argument("--initial", type=int, default=12)
+    parser.add_argument("--min", type=int, default=2)
+    parser.add_argument("--max", type=int, default=64)
+    parser.add_argument("--round-multiplier", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=30, help="Per-job deadline of the work-queue executor")
+    parser.add_argument("--max-retries", type=int, default=2, help="429/5xx retries per job (requeued by the work queue)")
+    parser.add_argument("--executor", choices=["both", "aimd", "rounds"], default="both")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "simulated")
+    executors = ["rounds", "aimd"] if args.executor == "both" else [args.executor]
+    for executor in executors:
+        print(json.dumps(_benchmark(executor, args), sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
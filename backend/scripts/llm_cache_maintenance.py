@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import argparse
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from job_search.json_io import load_json
+from job_search.llm_cache_store import LlmParseCache, maintenance_policy_from_config
+from job_search.paths import CONFIG, DATA, DB
+from job_search.storage.repository import JobSearchRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show stats for and evict entries from the LLM caches")
+    parser.add_argument("--stats", action="store_true", help="Only print cache statistics")
+    parser.add_argument("--ttl-days", type=float, default=None, help="Drop entries not written or hit for this many days")
+    parser.add_argument("--max-entries", type=int, default=None, help="Keep at most this many most recently used entries")
+    parser.add_argument("--max-mb", type=float, default=None, help="Keep at most this many MB of payload")
+    parser.add_argument("--purge-model", action="append", default=[], help="Drop entries produced by this model")
+    parser.add_argument(
+        "--purge-prompt-version", action="append", default=[], help="Drop entries for this prompt_version"
+    )
+    parser.add_argument(
+        "--reclaim-unseen-runs",
+        type=int,
+        default=None,
+        help="Drop entries whose job URL was not ranked in this many recent runs (needs the database)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be removed without deleting")
+    parser.add_argument("--vacuum", action="store_true", help="Reclaim disk space after evicting")
+    args = parser.parse_args()
+
+    runtime_cfg = load_json(CONFIG / "runtime.json", default={})
+    cache_cfg = dict(runtime_cfg.get("llm_cache", {}) if isinstance(runtime_cfg, dict) else {})
+    overrides = {
+        "ttl_days": args.ttl_days,
+        "max_entries": args.max_entries,
+        "max_mb": args.max_mb,
+        "reclaim_unseen_runs": args.reclaim_unseen_runs,
+    }
+    cache_cfg.update({k: v for k, v in overrides.items() if v is not None})
+    policy = maintenance_policy_from_config(cache_cfg)
+    policy = dataclasses.replace(
+        policy,
+        purge_models=policy.purge_models + tuple(args.purge_model),
+        purge_prompt_versions=policy.purge_prompt_versions + tuple(args.purge_prompt_version),
+    )
+
+    cache = LlmParseCache(DATA / "llm_parse_cache.sqlite", legacy_json_path=DATA / "llm_parse_cache.json")
+    try:
+        if not args.stats:
+            recent_urls, recent_since = None, None
+            db_cfg = load_json(CONFIG / "database.json", default={})
+            db_url = str(db_cfg.get("url") or "").strip()
+            if policy.reclaim_unseen_runs > 0 and bool(db_cfg.get("enabled", False)) and db_url:
+                repo = JobSearchRepository(
+                    db_url=db_url,
+                    migrations_dir=DB / "migrations",
+                    auto_migrate=bool(db_cfg.get("auto_migrate", False)),
+                )
+                repo.initialize()
+                recent_urls, recent_since = repo.get_recent_run_job_urls(policy.reclaim_unseen_runs)
+            removed = {
+                "llm_parse_cache": cache.evict(
+                    policy, recent_urls=recent_urls, recent_since=recent_since, dry_run=args.dry_run
+                ),
+            }
+            print(("Would remove: " if args.dry_run else "Removed: ") + json.dumps(removed, sort_keys=True))
+            if args.vacuum and not args.dry_run:
+                cache.vacuum()
+        summary = cache.summary()
+        print(f"LLM parse cache: entries={summary['entries']} bytes={summary['bytes']}")
+        for version, row in summary["by_prompt_version"].items():
+            print(f"- prompt_version={version or '-'} entries={row['entries']} bytes={row['bytes']}")
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env node
+
+// Long-lived Playwright worker: one browser, up to --max-pages concurrent pages.
+// Protocol: one JSON request per stdin line ({id, url, timeoutMs, waitUntil, userAgent}),
+// one JSON response per stdout line ({id, ok, url, status, title, html, timings} or {id, ok:false, error}).
+// The first stdout line is {"ready": true} once the browser is up.
+
+import process from "node:process";
+import readline from "node:readline";
+
+function parseArgs(argv) {
+  const out = { maxPages: 4, headless: true, settleMs: 1200 };
+  for (let i = 0; i < argv.length; i += 1) {
+    const token = String(argv[i] || "");
+    if (token === "--max-pages") out.maxPages = Math.max(1, Number(argv[++i] || "4") || 4);
+    else if (token === "--headless") out.headless = String(argv[++i] || "true") !== "false";
+    else if (token === "--settle-ms") out.settleMs = Math.max(0, Number(argv[++i] || "1200") || 0);
+  }
+  return out;
+}
+
+function emit(payload) {
+  process.stdout.write(`${JSON.stringify(payload)}\n`);
+}
+
+async function main() {
+  const args = parseArgs(process.argv.slice(2));
+
+  let playwright;
+  try {
+    playwright = await import("playwright");
+  } catch (error) {
+    emit({
+      ready: false,
+      error: "Playwright dependency missing. Run `cd backend && npm install` to enable playwright_cli backend.",
+    });
+    process.exit(1);
+  }
+
+  const { chromium } = playwright;
+  let browser;
+  try {
+    browser = await chromium.launch({ headless: args.headless, channel: "chrome" });
+  } catch {
+    browser = await chromium.launch({ headless: args.headless });
+  }
+
+  // One context per user agent so cookies/consent state is shared across fetches of the same run.
+  const contexts = new Map();
+  async function contextFor(userAgent) {
+    const key = userAgent || "";
+    if (!contexts.has(key)) {
+      contexts.set(key, browser.newContext(key ? { userAgent: key } : {}));
+    }
+    return contexts.get(key);
+  }
+
+  let active = 0;
+  const queue = [];
+
+  async function handle(request) {
+    const started = Date.now();
+    const id = request.id;
+    let page;
+    try {
+      if (!request.url) throw new Error("missing url");
+      const context = await contextFor(String(request.userAgent || ""));
+      page = await context.newPage();
+      const gotoStarted = Date.now();
+      const response = await page.goto(String(request.url), {
+        waitUntil: String(request.waitUntil || "domcontentloaded"),
+        timeout: Math.max(1000, Number(request.timeoutMs) || 30000),
+      });
+      const gotoMs = Date.now() - gotoStarted;
+      if (args.settleMs > 0) await page.waitForTimeout(args.settleMs);
+      const html = await page.content();
+      const title = await page.title();
+      emit({
+        id,
+        ok: true,
+        url: page.url(),
+        status: response ? response.status() : 200,
+        title,
+        html,
+        timings: { goto_ms: gotoMs, total_ms: Date.now() - started },
+      });
+    } catch (error) {
+      emit({ id, ok: false, error: String(error && error.message ? error.message : error || "unknown error") });
+    } finally {
+      if (page) await page.close().catch(() => undefined);
+    }
+  }
+
+  function pump() {
+    while (active < args.maxPages && queue.length) {
+      const request = queue.shift();
+      active += 1;
+      handle(request).finally(() => {
+        active -= 1;
+        pump();
+      });
+    }
+  }
+
+  const rl = readline.createInterface({ input: process.stdin });
+  rl.on("line", (line) => {
+    const text = String(line || "").trim();
+    if (!text) return;
+    let request;
+    try {
+      request = JSON.parse(text);
+    } catch (error) {
+      emit({ id: null, ok: false, error: `invalid request json: ${error.message}` });
+      return;
+    }
+    queue.push(request);
+    pump();
+  });
+  rl.on("close", async () => {
+    await browser.close().catch(() => undefined);
+    process.exit(0);
+  });
+
+  emit({ ready: true, maxPages: args.maxPages });
+}
+
+main().catch((error) => {
+  emit({ ready: false, error: String(error && error.message ? error.message : error || "unknown error") });
+  process.exit(1);
+});
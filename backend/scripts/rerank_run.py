@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from job_search.json_io import load_json
+from job_search.paths import CONFIG, DB
+from job_search.rerank import rerank_run
+from job_search.storage.repository import JobSearchRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Re-rank the jobs of a stored run with the current config into a new run (no network access)"
+    )
+    parser.add_argument("run_id", nargs="?", default="", help="Run to re-rank (default: latest run)")
+    parser.add_argument("--adaptive", action="store_true", help="Add the feedback-based adaptive bonus")
+    parser.add_argument("--user-id", default="default", help="User whose feedback drives --adaptive")
+    parser.add_argument("--page-size", type=int, default=500, help="Rankings read and written per batch")
+    parser.add_argument("--db-url", default="", help="Override DB URL")
+    args = parser.parse_args()
+
+    db_cfg = load_json(CONFIG / "database.json", default={})
+    db_url = args.db_url.strip() or str(db_cfg.get("url") or "").strip()
+    if not db_url:
+        raise SystemExit("Database URL is missing. Configure config/database.json or pass --db-url.")
+    repo = JobSearchRepository(db_url=db_url, migrations_dir=DB / "migrations", auto_migrate=False)
+    run_id = args.run_id.strip() or repo.get_latest_run_id()
+    if not run_id:
+        raise SystemExit("No pipeline runs found.")
+
+    try:
+        summary = rerank_run(
+            repo, run_id, adaptive=args.adaptive, user_id=args.user_id, page_size=max(1, args.page_size)
+        )
+    except LookupError as e:
+        raise SystemExit(str(e))
+    print(
+        f"run={summary['run_id']} rerank_of={run_id} jobs={summary['total']} "
+        f"A={summary['tiers']['A']} B={summary['tiers']['B']} C={summary['tiers']['C']} "
+        f"tier_changes={summary['rerank']['tier_changes']} llm_cache_hits={summary['rerank']['llm_cache_hits']}"
+    )
+    print(json.dumps(summary["rerank"]["scored_by"], sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import sys
 from pathlib import Path
 
@@ -6,11 +7,56 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from job_search.fetch_archive import FetchArchive
+from job_search.json_io import load_json
+from job_search.llm_batch_api import LlmBatchState
+from job_search.paths import CONFIG, DATA
 from job_search.pipeline import run_pipeline
 
 
+def _collect_replay_run_id() -> str | None:
+    """Run id to replay so a pending LLM batch is collected for the same jobs it was submitted for."""
+    state = LlmBatchState(DATA / "llm_batch_state.json").load()
+    if state is None:
+        print("No pending LLM batch; running normally.")
+        return None
+    archive_cfg = load_json(CONFIG / "runtime.json", default={}).get("fetch_archive", {})
+    archive = FetchArchive(DATA / str(archive_cfg.get("dir") or "fetch_archive"))
+    run_id = str(state.get("run_id") or "")
+    if run_id and archive.has_run(run_id):
+        return run_id
+    print(f"No fetch archive for run {run_id}; collecting batch {state['batch_id']} during a live run.")
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the job search pipeline")
+    parser.add_argument(
+        "--replay",
+        metavar="RUN_ID",
+        default="",
+        help=(
+            "Re-run against the fetch archive of RUN_ID instead of the live sites: no network fetches, LLM cache only, "
+            "summary in output/replay_report.json"
+        ),
+    )
+    parser.add_argument(
+        "--collect-llm-batch-into-cache",
+        action="store_true",
+        help=(
+            "Download a finished pending LLM batch into the parse cache by replaying the run that submitted it; "
+            "nothing is ranked, the next normal run picks the results up from the cache"
+        ),
+    )
+    args = parser.parse_args()
+    replay_run_id = args.replay.strip() or None
+    if args.collect_llm_batch_into_cache and not replay_run_id:
+        replay_run_id = _collect_replay_run_id()
+    run_pipeline(replay_run_id=replay_run_id, collect_llm_batch=args.collect_llm_batch_into_cache)
+
+
 if __name__ == "__main__":
     try:
-        run_pipeline()
+        main()
     except KeyboardInterrupt:
         sys.exit(130)
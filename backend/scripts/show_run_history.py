@@ -27,7 +27,8 @@ def main():
     try:
         runs = conn.execute(
             """
-            SELECT run_id, started_at, status, total_jobs, a_tier, b_tier, c_tier, source_errors
+            SELECT run_id, started_at, status, total_jobs, a_tier, b_tier, c_tier, source_errors,
+                   llm_prompt_tokens, llm_completion_tokens, llm_cached_tokens, llm_cost_usd
             FROM pipeline_runs
             ORDER BY started_at DESC
             LIMIT ?
@@ -43,7 +44,9 @@ def main():
             run_id = row["run_id"]
             print(
                 f"run={run_id} started_at={row['started_at']} status={row['status']} "
-                f"jobs={row['total_jobs']} A={row['a_tier']} B={row['b_tier']} C={row['c_tier']} errors={row['source_errors']}"
+                f"jobs={row['total_jobs']} A={row['a_tier']} B={row['b_tier']} C={row['c_tier']} errors={row['source_errors']} "
+                f"llm_tokens={row['llm_prompt_tokens']}+{row['llm_completion_tokens']} "
+                f"(cached={row['llm_cached_tokens']}) cost=${float(row['llm_cost_usd'] or 0):.4f}"
             )
             events = conn.execute(
                 """
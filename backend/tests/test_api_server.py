@@ -134,6 +134,12 @@ class ApiServerTests(unittest.TestCase):
             )
             repo.initialize()
             _seed_repo(repo)
+            repo.upsert_backend_scoreboard(
+                [
+                    {"host": "stepstone.at", "backend": "http", "attempts": 5, "successes": 0, "success_ewma": 0.05, "latency_ewma_ms": 9000.0},
+                    {"host": "stepstone.at", "backend": "curl_cffi", "attempts": 5, "successes": 5, "success_ewma": 1.0, "latency_ewma_ms": 800.0},
+                ]
+            )
 
             with patch(
                 "job_search.cover_letter.call_openai_json",
@@ -258,6 +264,8 @@ class ApiServerTests(unittest.TestCase):
                         cover_list = json.loads(resp.read().decode("utf-8"))
                     with urlopen(base + "/sources/health?window_runs=10&stale_after_hours=100000", timeout=3) as resp:
                         source_health = json.loads(resp.read().decode("utf-8"))
+                    with urlopen(base + "/api/sources/backends", timeout=3) as resp:
+                        source_backends = json.loads(resp.read().decode("utf-8"))
                 finally:
                     server.shutdown()
                     thread.join(timeout=3)
@@ -297,6 +305,9 @@ class ApiServerTests(unittest.TestCase):
             self.assertFalse(cover_letter["cached"])
             self.assertEqual(len(cover_list["cover_letters"]), 1)
             self.assertEqual(source_health["sources"][0]["source_name"], "Fixture RSS")
+            stepstone_backends = source_backends["hosts"][0]["backends"]
+            self.assertEqual([b["backend"] for b in stepstone_backends], ["curl_cffi", "http"])
+            self.assertEqual([b["status"] for b in stepstone_backends], ["preferred", "dead"])
 
     def test_api_auth_enforcement(self):
         with tempfile.TemporaryDirectory() as td:
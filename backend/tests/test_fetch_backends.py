@@ -0,0 +1,310 @@
+import gzip
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from job_search.backend_scoreboard import BackendScoreboard
+from job_search.fetch_archive import ArchiveReplay, FetchArchive
+from job_search.fetch_backends import (
+    FetchBackendError,
+    FetchResult,
+    collect_fetch_stats,
+    configure_backend_scoreboard,
+    configure_fetch_archive,
+    configure_fetch_replay,
+    configure_http_cache,
+    configure_openclaw_session,
+    configure_playwright_worker,
+    fetch_with_backends,
+    reset_http_pools,
+)
+from job_search.rate_limit import map_in_context
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    body = b"<rss><channel><item><title>Cached</title></item></channel></rss>"
+    requests_seen: list[dict] = []
+
+    def do_GET(self):
+        type(self).requests_seen.append(
+            {
+                "path": self.path,
+                "if_none_match": self.headers.get("If-None-Match"),
+                "if_modified_since": self.headers.get("If-Modified-Since"),
+            }
+        )
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Last-Modified", "Mon, 05 Jan 2026 10:00:00 GMT")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        return
+
+
+# Stand-in for scripts/playwright_worker.mjs speaking the same line protocol; exits on URLs containing "crash".
+_FAKE_PLAYWRIGHT_WORKER = """
+import json, os, sys
+print(json.dumps({"ready": True, "pid": os.getpid()}), flush=True)
+for line in sys.stdin:
+    req = json.loads(line)
+    if "crash" in req["url"]:
+        sys.exit(3)
+    html = "<html>%s pid=%s</html>" % (req["url"], os.getpid())
+    print(json.dumps({"id": req["id"], "ok": True, "url": req["url"], "status": 200, "html": html,
+                      "timings": {"goto_ms": 5, "total_ms": 7}}), flush=True)
+"""
+
+# Stand-in for the `openclaw` CLI that records each invocation to the log file given as argv[1].
+_FAKE_OPENCLAW = """
+import json, sys
+log_path, args = sys.argv[1], sys.argv[2:]
+with open(log_path, "a", encoding="utf-8") as fh:
+    fh.write(" ".join(args[:2]) + "\\n")
+if args[1] == "open":
+    with open(log_path + ".url", "w", encoding="utf-8") as fh:
+        fh.write(args[2])
+if args[1] == "snapshot":
+    url = open(log_path + ".url", encoding="utf-8").read()
+    print(json.dumps({"url": url, "snapshot": "- heading " + url}))
+else:
+    print("{}")
+"""
+
+
+class _KeepAliveGzipHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = ("<html><body>" + "Senior Platform Engineer " * 200 + "</body></html>").encode("utf-8")
+    client_ports: list[int] = []
+    accept_encodings: list[str] = []
+
+    def do_GET(self):
+        type(self).client_ports.append(self.client_address[1])
+        type(self).accept_encodings.append(self.headers.get("Accept-Encoding", ""))
+        payload = gzip.compress(self.body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        return
+
+
+class FetchBackendsTests(unittest.TestCase):
+    def setUp(self):
+        _FeedHandler.requests_seen = []
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/feed.rss"
+
+    def tearDown(self):
+        configure_http_cache(None)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_http_backend_revalidates_and_serves_stored_body_on_304(self):
+        with tempfile.TemporaryDirectory() as td:
+            configure_http_cache(Path(td))
+            with collect_fetch_stats() as stats:
+                first = fetch_with_backends(self.url, backends=["http"], timeout_sec=5)
+                second = fetch_with_backends(self.url, backends=["http"], timeout_sec=5)
+
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.cache_status, "not_modified")
+        self.assertIsNone(_FeedHandler.requests_seen[0]["if_none_match"])
+        self.assertEqual(_FeedHandler.requests_seen[1]["if_none_match"], '"v1"')
+        self.assertEqual(_FeedHandler.requests_seen[1]["if_modified_since"], "Mon, 05 Jan 2026 10:00:00 GMT")
+        self.assertEqual(stats.get("cache_misses"), 1)
+        self.assertEqual(stats.get("cache_hits"), 1)
+        self.assertEqual(stats.get("cache_not_modified"), 1)
+
+    def test_http_backend_skips_validators_when_cache_disabled(self):
+        configure_http_cache(None)
+        fetch_with_backends(self.url, backends=["http"], timeout_sec=5)
+        fetch_with_backends(self.url, backends=["http"], timeout_sec=5)
+        self.assertTrue(all(r["if_none_match"] is None for r in _FeedHandler.requests_seen))
+
+    def test_http_pooled_reuses_connections_and_decodes_gzip(self):
+        _KeepAliveGzipHandler.client_ports = []
+        _KeepAliveGzipHandler.accept_encodings = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveGzipHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/job/1"
+        try:
+            with collect_fetch_stats() as stats:
+                results = [fetch_with_backends(url, backends=["http_pooled"], timeout_sec=5) for _ in range(3)]
+        finally:
+            reset_http_pools()
+            server.shutdown()
+            server.server_close()
+
+        expected = _KeepAliveGzipHandler.body.decode("utf-8")
+        self.assertTrue(all(r.text == expected for r in results))
+        self.assertTrue(all(r.backend == "http_pooled" for r in results))
+        self.assertEqual(len(set(_KeepAliveGzipHandler.client_ports)), 1)
+        self.assertIn("gzip", _KeepAliveGzipHandler.accept_encodings[0])
+        self.assertEqual(results[0].timings["reused"], 0)
+        self.assertEqual(results[2].timings["reused"], 1)
+        backend_stats = stats.backend_summary()["http_pooled"]
+        self.assertEqual(backend_stats["requests"], 3)
+        self.assertEqual(backend_stats["failures"], 0)
+        self.assertIn("avg_ttfb_ms", backend_stats)
+        self.assertEqual(backend_stats["reused"], 2)
+
+    def test_playwright_worker_is_reused_and_restarted_after_crash(self):
+        with tempfile.TemporaryDirectory() as td:
+            script = Path(td) / "fake_worker.py"
+            script.write_text(_FAKE_PLAYWRIGHT_WORKER, encoding="utf-8")
+            worker = configure_playwright_worker(2, command=[sys.executable, str(script)])
+            try:
+                with collect_fetch_stats() as stats:
+                    first = fetch_with_backends("https://example.test/a", backends=["playwright_cli"], timeout_sec=5)
+                    second = fetch_with_backends("https://example.test/b", backends=["playwright_cli"], timeout_sec=5)
+                    with self.assertRaises(Exception):
+                        fetch_with_backends("https://example.test/crash", backends=["playwright_cli"], timeout_sec=5)
+                    third = fetch_with_backends("https://example.test/c", backends=["playwright_cli"], timeout_sec=5)
+            finally:
+                configure_playwright_worker(None)
+
+        first_pid = first.text.split("pid=")[1]
+        self.assertEqual(second.text.split("pid=")[1], first_pid)
+        self.assertNotEqual(third.text.split("pid=")[1], first_pid)
+        self.assertEqual(worker.restarts, 1)
+        self.assertEqual(first.timings["goto_ms"], 5)
+        self.assertIn("roundtrip_ms", first.timings)
+        backend_stats = stats.backend_summary()["playwright_cli"]
+        self.assertEqual(backend_stats["requests"], 4)
+        self.assertEqual(backend_stats["failures"], 1)
+
+    def test_openclaw_session_starts_browser_once_per_run(self):
+        with tempfile.TemporaryDirectory() as td:
+            script = Path(td) / "fake_openclaw.py"
+            script.write_text(_FAKE_OPENCLAW, encoding="utf-8")
+            log_path = Path(td) / "calls.log"
+            session = configure_openclaw_session(True, binary=[sys.executable, str(script), str(log_path)])
+            try:
+                with collect_fetch_stats() as stats:
+                    first = fetch_with_backends("https://example.test/list", backends=["openclaw_snapshot"], timeout_sec=5)
+                    second = fetch_with_backends("https://example.test/job/1", backends=["openclaw_snapshot"], timeout_sec=5)
+            finally:
+                configure_openclaw_session(False)
+            calls = log_path.read_text(encoding="utf-8").split("\n")
+
+        self.assertEqual(first.text, "- heading https://example.test/list")
+        self.assertEqual(second.url, "https://example.test/job/1")
+        self.assertEqual(
+            [c for c in calls if c],
+            ["browser start", "browser open", "browser snapshot", "browser open", "browser snapshot", "browser stop"],
+        )
+        self.assertEqual(session.stats["starts"], 1)
+        self.assertEqual(session.stats["fetches"], 2)
+        self.assertIn("avg_snapshot_ms", stats.backend_summary()["openclaw_snapshot"])
+
+    def test_openclaw_without_session_does_not_interleave_open_and_snapshot(self):
+        tab = {"url": ""}
+
+        def fake_run(binary, args, timeout_sec, what):
+            if what == "open":
+                tab["url"] = args[1]
+            time.sleep(0.01)
+            return subprocess.CompletedProcess(args, 0, stdout=json.dumps({"url": tab["url"], "snapshot": "- heading"}))
+
+        urls = [f"https://example.test/job/{i}" for i in range(4)]
+        with patch("job_search.fetch_backends._run_openclaw", side_effect=fake_run):
+            results = map_in_context(
+                lambda url: fetch_with_backends(url, backends=["openclaw_snapshot"], timeout_sec=5), urls, max_workers=4
+            )
+
+        self.assertEqual([r.url for r in results], urls)
+
+    def test_scoreboard_moves_winning_backend_first_and_only_probes_dead_ones(self):
+        calls = []
+
+        def blocked(url, timeout_sec, headers):
+            calls.append("http")
+            raise FetchBackendError("403 blocked")
+
+        def impersonating(url, timeout_sec, headers):
+            calls.append("curl_cffi")
+            return FetchResult(text="<html>ok</html>", backend="curl_cffi", url=url, status_code=200)
+
+        history = [{"host": "at.indeed.com", "backend": "http", "attempts": 4, "successes": 0, "success_ewma": 0.0}]
+        scoreboard = configure_backend_scoreboard(BackendScoreboard(history, min_attempts=3, probe_every=5))
+        try:
+            with patch.dict("job_search.fetch_backends._BACKEND_IMPL", {"http": blocked, "curl_cffi": impersonating}):
+                fetch_with_backends("https://www.stepstone.at/job/0", backends=["http", "curl_cffi"], timeout_sec=5)
+                fetch_with_backends("https://www.stepstone.at/job/1", backends=["http", "curl_cffi"], timeout_sec=5)
+                for idx in range(10):
+                    fetch_with_backends(f"https://at.indeed.com/job/{idx}", backends=["http", "curl_cffi"], timeout_sec=5)
+        finally:
+            configure_backend_scoreboard(None)
+
+        # StepStone has no history: http is tried once, then curl_cffi leads.
+        self.assertEqual(calls[:3], ["http", "curl_cffi", "curl_cffi"])
+        # Indeed's http is dead from earlier runs, so it is only probed on every 5th fetch.
+        self.assertEqual(calls[3:].count("http"), 2)
+        rows = {(r["host"], r["backend"]): r for r in scoreboard.rows()}
+        self.assertEqual(rows[("at.indeed.com", "curl_cffi")]["successes"], 10)
+        self.assertEqual(rows[("stepstone.at", "http")]["attempts"], 1)
+
+    def test_scoreboard_tries_whole_chain_when_every_backend_is_dead(self):
+        history = [
+            {"host": "at.indeed.com", "backend": backend, "attempts": 4, "successes": 0, "success_ewma": 0.0}
+            for backend in ("http", "curl_cffi", "playwright_cli")
+        ]
+        scoreboard = BackendScoreboard(history, min_attempts=3, probe_every=5)
+        order = scoreboard.order("at.indeed.com", ["http", "curl_cffi", "playwright_cli"])
+        self.assertEqual(order, ["http", "curl_cffi", "playwright_cli"])
+
+    def test_archived_run_replays_without_network(self):
+        with tempfile.TemporaryDirectory() as td:
+            archive = FetchArchive(Path(td))
+            configure_fetch_archive(archive, "run-1")
+            try:
+                live = fetch_with_backends(self.url, backends=["http"], timeout_sec=5)
+                fetch_with_backends(self.url, backends=["http"], timeout_sec=5)
+            finally:
+                configure_fetch_archive(None)
+            self.server.shutdown()
+
+            replay = ArchiveReplay(archive, "run-1")
+            configure_fetch_replay(replay)
+            try:
+                replayed = fetch_with_backends(self.url, backends=["http"], timeout_sec=5)
+                with self.assertRaises(FetchBackendError):
+                    fetch_with_backends(self.url + "?page=2", backends=["http"], timeout_sec=5)
+            finally:
+                configure_fetch_replay(None)
+            objects = list((Path(td) / "objects").rglob("*.gz"))
+
+        self.assertEqual(replayed.text, live.text)
+        self.assertEqual(replayed.backend, "http")
+        self.assertEqual(replayed.cache_status, "replay")
+        self.assertEqual(len(_FeedHandler.requests_seen), 2)
+        # Identical bodies are stored once.
+        self.assertEqual(len(objects), 1)
+        self.assertEqual(replay.stats, {"served": 1, "missing": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from urllib.error import HTTPError
+
+from job_search.llm_executor import AimdController, is_rate_limited_error, run_work_queue
+from job_search.llm_scoring import call_openai_json
+from job_search.llm_simulator import SimulatedLlmEndpoint, SimulatedLlmProfile
+
+
+class LlmExecutorTests(unittest.TestCase):
+    def test_aimd_cuts_once_per_generation_and_grows_additively(self):
+        now = [0.0]
+        controller = AimdController(8, minimum=2, maximum=16, clock=lambda: now[0])
+
+        # Three 429s from requests that were all in flight before the first cut count once.
+        now[0] = 10.0
+        for _ in range(3):
+            controller.on_rate_limited(started_at=5.0)
+        self.assertEqual(controller.limit, 4)
+        controller.on_rate_limited(started_at=11.0)
+        self.assertEqual(controller.limit, 2)
+
+        # +1/window per success: about one window of completions per step.
+        for _ in range(6):
+            controller.on_success(started_at=12.0, latency_sec=0.1)
+        self.assertEqual(controller.limit, 4)
+        self.assertEqual(controller.stats["rate_limited"], 4)
+        self.assertEqual(controller.stats["decreases"], 2)
+
+    def test_work_queue_deadline_frees_slot_for_remaining_jobs(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        outcomes = {}
+
+        def fn(item):
+            if item == "stuck":
+                release.wait(5)
+            return item.upper()
+
+        def on_done(item, result, error):
+            outcomes[item] = error if error is not None else result
+
+        started = time.monotonic()
+        stats = run_work_queue(
+            ["stuck", "a", "b", "c"],
+            fn,
+            AimdController(1, minimum=1, maximum=2),
+            on_done,
+            timeout_sec=0.3,
+        )
+
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertIsInstance(outcomes["stuck"], TimeoutError)
+        self.assertEqual({k: outcomes[k] for k in "abc"}, {"a": "A", "b": "B", "c": "C"})
+        self.assertEqual((stats["completed"], stats["failed"], stats["timeouts"]), (3, 1, 1))
+
+    def test_work_queue_requeues_rate_limited_jobs_and_cuts_the_limit(self):
+        calls = {"a": 0, "b": 0}
+        outcomes = {}
+
+        def fn(item):
+            calls[item] += 1
+            if calls[item] == 1 or item == "b":
+                raise RuntimeError("HTTP Error 429: Too Many Requests")
+            return item.upper()
+
+        def on_done(item, result, error):
+            outcomes[item] = error if error is not None else result
+
+        stats = run_work_queue(
+            ["a", "b"], fn, AimdController(4, minimum=1, maximum=4), on_done, rate_limit_retries=2
+        )
+
+        self.assertEqual(outcomes["a"], "A")
+        self.assertIn("429", str(outcomes["b"]))
+        self.assertEqual(calls, {"a": 2, "b": 3})
+        self.assertEqual((stats["completed"], stats["failed"], stats["requeued"]), (1, 1, 3))
+        self.assertEqual(stats["rate_limited"], 4)
+        self.assertLess(stats["final_limit"], 4)
+
+    def test_only_real_rate_limits_are_requeued(self):
+        calls = []
+
+        def fn(item):
+            calls.append(item)
+            raise RuntimeError("failed to generate JSON")
+
+        outcomes = {}
+        def on_done(item, result, error):
+            outcomes[item] = error
+
+        stats = run_work_queue(["a"], fn, AimdController(4, minimum=1, maximum=4), on_done, rate_limit_retries=2)
+
+        self.assertEqual(calls, ["a"])
+        self.assertIn("generate", str(outcomes["a"]))
+        self.assertEqual((stats["failed"], stats["requeued"], stats["rate_limited"]), (1, 0, 0))
+        self.assertEqual(stats["final_limit"], 4)
+        self.assertFalse(is_rate_limited_error(RuntimeError("moderate separate accurate iterate")))
+        self.assertFalse(is_rate_limited_error(RuntimeError("HTTP Error 4290")))
+        self.assertTrue(is_rate_limited_error(RuntimeError("HTTP Error 429: Too Many Requests")))
+        self.assertTrue(is_rate_limited_error(HTTPError("https://api", 429, "Too Many Requests", {}, None)))
+        self.assertFalse(is_rate_limited_error(HTTPError("https://api", 500, "rate exceeded", {}, None)))
+
+    def test_simulated_endpoint_rate_limits_above_capacity(self):
+        profile = SimulatedLlmProfile(capacity=2, latency_ms=200, jitter=0)
+        with SimulatedLlmEndpoint(profile, time_scale=1.0) as endpoint:
+            env = {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": endpoint.base_url}
+            errors = []
+
+            def call(idx):
+                try:
+                    call_openai_json("simulated", "Return JSON.", str(idx), timeout_sec=5, max_retries=0)
+                except Exception as e:
+                    errors.append(str(e))
+
+            with patch.dict(os.environ, env):
+                threads = [threading.Thread(target=call, args=(idx,)) for idx in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+        self.assertEqual(endpoint.stats["peak_in_flight"], 2)
+        self.assertEqual(endpoint.stats["rate_limited"], 2)
+        self.assertTrue(all("429" in error for error in errors))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,11 +4,16 @@ from pathlib import Path
 from tempfile import TemporaryDirectory
 from unittest.mock import patch
 
+from job_search.llm_cache_store import CacheMaintenancePolicy, LlmParseCache
 from job_search.llm_parsing import (
     llm_parse_cache_key,
+    llm_parse_cache_keys,
     llm_parse_job,
+    llm_parse_jobs_batch,
     load_llm_parse_cache,
     normalize_llm_parse_output,
+    pack_llm_batches,
+    reapply_source_fields,
     save_llm_parse_cache,
 )
 
@@ -22,6 +27,63 @@ class LlmParsingTests(unittest.TestCase):
             loaded = load_llm_parse_cache(path)
             self.assertEqual(loaded["entries"]["a"]["score"], 50)
 
+    def test_sqlite_cache_migrates_legacy_json_and_honours_key_order(self):
+        with TemporaryDirectory() as td:
+            legacy = Path(td) / "llm_parse_cache.json"
+            save_llm_parse_cache(
+                legacy,
+                {"meta": {"version": 1}, "entries": {"legacy-key": {"score": 41}, "primary-key": {"score": 77}}},
+            )
+            cache = LlmParseCache(Path(td) / "llm_parse_cache.sqlite", legacy_json_path=legacy)
+            self.assertTrue(legacy.exists())  # nothing is read until the first lookup
+
+            self.assertEqual(cache.lookup(["primary-key", "legacy-key"]), ("primary-key", {"score": 77}))
+            self.assertFalse(legacy.exists())
+            self.assertTrue((Path(td) / "llm_parse_cache.json.migrated").exists())
+            self.assertEqual(cache.migrated_entries, 2)
+
+            cache.put("new-key", {"score": 90}, model="gpt-5-mini", prompt_version="v2")
+            cache.close()
+
+            reopened = LlmParseCache(Path(td) / "llm_parse_cache.sqlite", legacy_json_path=legacy)
+            key, value = reopened.lookup(["missing", "new-key"])
+            self.assertEqual(key, "new-key")
+            self.assertEqual(value["score"], 90)
+            self.assertEqual(value["prompt_version"], "v2")
+            self.assertEqual(reopened.count(), 3)
+            reopened.close()
+
+    def test_cache_eviction_by_prompt_version_ttl_unseen_url_and_size(self):
+        with TemporaryDirectory() as td:
+            cache = LlmParseCache(Path(td) / "llm_parse_cache.sqlite")
+            cache.put("old-prompt", {"score": 1}, model="gpt-5-mini", prompt_version="v1", job_url="https://a/1")
+            cache.put("stale", {"score": 2}, model="gpt-5-mini", prompt_version="v2", job_url="https://a/2")
+            cache.put("unseen", {"score": 3}, model="gpt-5-mini", prompt_version="v2", job_url="https://a/3")
+            for key in ("seen-1", "seen-2", "seen-3"):
+                cache.put(key, {"score": 4}, model="gpt-5-mini", prompt_version="v2", job_url=f"https://b/{key}")
+            conn = cache._connect()
+            conn.execute("UPDATE llm_parse_cache SET updated_at = '2020-01-01T00:00:00+00:00' WHERE cache_key = 'stale'")
+            conn.execute("UPDATE llm_parse_cache SET updated_at = '2026-01-01T00:00:00+00:00' WHERE cache_key = 'unseen'")
+            conn.execute("UPDATE llm_parse_cache SET updated_at = '2026-01-02T00:00:00+00:00' WHERE cache_key = 'seen-1'")
+            conn.commit()
+            self.assertEqual(cache.lookup(["seen-1"], prompt_version="v2")[0], "seen-1")
+            self.assertEqual(cache.lookup(["nope"], prompt_version="v2"), (None, None))
+
+            policy = CacheMaintenancePolicy(ttl_days=365, max_entries=2, purge_prompt_versions=("v1",))
+            recent = {"https://b/seen-1", "https://b/seen-2", "https://b/seen-3"}
+            preview = cache.evict(policy, recent_urls=recent, recent_since="2026-02-01T00:00:00+00:00", dry_run=True)
+            self.assertEqual(cache.count(), 6)
+            removed = cache.evict(policy, recent_urls=recent, recent_since="2026-02-01T00:00:00+00:00")
+
+            self.assertEqual(preview, removed)
+            self.assertEqual(removed, {"purged": 1, "expired": 1, "unseen": 1, "over_size": 1})
+            # The hit on seen-1 counts as recent use even though it was written first.
+            self.assertIsNotNone(cache.get("seen-1"))
+            summary = cache.summary()
+            self.assertEqual(summary["entries"], 2)
+            self.assertEqual(summary["by_prompt_version"]["v2"]["hit_rate"], 0.5)
+            cache.close()
+
     def test_cache_key_changes_with_description(self):
         job_a = {"url": "https://jobs.example.com/1", "title": "Engineer", "description": "A"}
         job_b = {"url": "https://jobs.example.com/1", "title": "Engineer", "description": "B"}
@@ -29,6 +91,101 @@ class LlmParsingTests(unittest.TestCase):
         key_b = llm_parse_cache_key(job_b, model="gpt-5-mini", prompt_version="v2")
         self.assertNotEqual(key_a, key_b)
 
+    def test_canonical_cache_key_ignores_volatile_source_fields(self):
+        seen_monday = {
+            "source": "StepStone",
+            "source_type": "browser",
+            "url": "https://www.stepstone.at/stellenangebote--Platform-Engineer--123.html?utm_source=rss#top",
+            "title": "Platform  Engineer",
+            "company": "ACME",
+            "description": "Build the platform.",
+            "published": "2026-03-02",
+        }
+        seen_tuesday = {
+            **seen_monday,
+            "source": "StepStone Tirol",
+            "source_type": "html",
+            "url": "https://stepstone.at/stellenangebote--Platform-Engineer--123.html",
+            "title": "platform engineer",
+            "published": "2026-03-03",
+        }
+        key_monday = llm_parse_cache_key(seen_monday, model="gpt-5-mini", prompt_version="v2")
+        self.assertEqual(key_monday, llm_parse_cache_key(seen_tuesday, model="gpt-5-mini", prompt_version="v2"))
+        self.assertNotEqual(
+            key_monday,
+            llm_parse_cache_key({**seen_monday, "company": "Other"}, model="gpt-5-mini", prompt_version="v2"),
+        )
+
+        # Entries written under the previous source-specific key are still found.
+        keys = llm_parse_cache_keys(seen_monday, model="gpt-5-mini", prompt_version="v2")
+        self.assertEqual(keys[0], key_monday)
+        self.assertEqual(len(keys), 3)
+
+        cached = {"score": 70, "published": "2026-03-02"}
+        self.assertEqual(reapply_source_fields(seen_tuesday, cached)["published"], "2026-03-03")
+        self.assertEqual(reapply_source_fields({"published": ""}, cached)["published"], "2026-03-02")
+
+    def test_batched_parse_packs_short_jobs_and_flags_bad_items(self):
+        jobs = [
+            {"url": "https://jobs.example.com/1", "title": "Engineer 1", "description": "a" * 100},
+            {"url": "https://jobs.example.com/2", "title": "Engineer 2", "description": "b" * 100},
+            {"url": "https://jobs.example.com/3", "title": "Engineer 3", "description": "c" * 5000},
+            {"url": "https://jobs.example.com/4", "title": "Engineer 4", "description": "d" * 100},
+        ]
+        batches, singles = pack_llm_batches(jobs, max_items=2, max_input_chars=1000, short_description_chars=3000)
+        self.assertEqual([[j["title"] for j in b] for b in batches], [["Engineer 1", "Engineer 2"]])
+        self.assertEqual([j["title"] for j in singles], ["Engineer 3", "Engineer 4"])
+
+        response = {"results": [{"item_id": 1, "score": 75, "title": "Engineer 2"}, {"item_id": 0, "title": "no score"}]}
+        with patch("job_search.llm_parsing.call_openai_json", return_value=response) as mocked:
+            out = llm_parse_jobs_batch(batches[0], profile={}, constraints={}, model="gpt-5-mini")
+        self.assertIsNone(out[0])
+        self.assertEqual(out[1]["score"], 75)
+        self.assertEqual(out[1]["tier"], "A")
+        prompt = json.loads(mocked.call_args.kwargs["user_prompt"])
+        self.assertEqual([item["item_id"] for item in prompt["raw_items"]], [0, 1])
+
+        with patch("job_search.llm_parsing.call_openai_json", return_value={"score": 10}):
+            with self.assertRaises(ValueError):
+                llm_parse_jobs_batch(batches[0], profile={}, constraints={}, model="gpt-5-mini")
+
+    def test_span_prompt_version_rebuilds_description_from_line_ranges(self):
+        job = {
+            "url": "https://jobs.example.com/spans",
+            "title": "Platform Engineer",
+            "company": "ACME",
+            "description": (
+                "Skip to main content\nAccept cookies\nWe build the ACME cloud platform.\n"
+                "You run Kubernetes and Terraform.\nSimilar jobs: Data Engineer, QA Lead"
+            ),
+        }
+        response = {"title": "Platform Engineer", "company": "ACME", "score": 72, "description_spans": [[3, 4]]}
+        with patch("job_search.llm_parsing.call_openai_json", return_value=response) as mocked:
+            out = llm_parse_job(job, profile={}, constraints={}, model="gpt-5-mini", prompt_version="v6-spans")
+
+        prompt = json.loads(mocked.call_args.kwargs["user_prompt"])
+        self.assertNotIn("description", prompt["raw_item"])
+        self.assertEqual(prompt["raw_item"]["description_lines"][2], "3| We build the ACME cloud platform.")
+        expected = "We build the ACME cloud platform.\nYou run Kubernetes and Terraform."
+        self.assertEqual(out["description"], expected)
+        self.assertEqual(out["description_source"], "spans")
+        # The shorter span text survives normalization instead of being replaced by the raw text.
+        self.assertEqual(normalize_llm_parse_output(job, out, description_max_chars=2500)["description"], expected)
+
+    def test_extract_prompt_version_leaves_profile_out_of_prompt_and_output(self):
+        job = {"url": "https://jobs.example.com/extract", "title": "Platform Engineer", "description": "Python role"}
+        response = {"title": "Platform Engineer", "skills": ["Python", " "], "seniority": "Principal", "score": 90}
+        with patch("job_search.llm_parsing.call_openai_json", return_value=response) as mocked:
+            out = llm_parse_job(
+                job, profile={"skills": ["python"]}, constraints={"x": 1}, model="gpt-5-mini", prompt_version="v6-extract"
+            )
+
+        prompt = json.loads(mocked.call_args.kwargs["user_prompt"])
+        self.assertEqual(set(prompt), {"raw_item", "rules"})
+        self.assertNotIn("score", mocked.call_args.kwargs["system_prompt"])
+        self.assertEqual((out["skills"], out["seniority"]), (["Python"], "unknown"))
+        self.assertNotIn("score", out)
+
     def test_llm_parse_job_normalizes_output(self):
         with patch(
             "job_search.llm_parsing.call_openai_json",
@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from urllib.error import HTTPError
+
+from job_search.llm_parsing import llm_parse_job
+from job_search.llm_scoring import LLM_USAGE, OPENAI_CLIENT, OpenAiHttpClient, call_openai_json, openai_call_retries
+from job_search.llm_simulator import SimulatedLlmEndpoint, SimulatedLlmProfile
+
+
+class OpenAiClientTests(unittest.TestCase):
+    def test_calls_reuse_connection_and_aggregate_usage(self):
+        self.addCleanup(LLM_USAGE.reset)
+        self.addCleanup(OPENAI_CLIENT.close)
+        LLM_USAGE.reset()
+        with SimulatedLlmEndpoint(SimulatedLlmProfile(capacity=4, latency_ms=1, jitter=0)) as endpoint:
+            env = {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": endpoint.base_url}
+            with patch.dict(os.environ, env):
+                for idx in range(3):
+                    out = call_openai_json("gpt-5-mini", "Return JSON.", f"job {idx}", max_retries=0)
+                    self.assertEqual(out["tier"], "B")
+
+        usage = LLM_USAGE.snapshot(pricing={"gpt-5-mini": {"input": 0.25, "cached_input": 0.025, "output": 2.0}})
+        self.assertEqual(usage["calls"], 3)
+        self.assertEqual(usage["reused_connections"], 2)
+        self.assertGreater(usage["prompt_tokens"], usage["cached_tokens"])
+        self.assertGreater(usage["cached_tokens"], 0)
+        row = usage["by_model"]["gpt-5-mini"]
+        expected = (
+            (row["prompt_tokens"] - row["cached_tokens"]) * 0.25
+            + row["cached_tokens"] * 0.025
+            + row["completion_tokens"] * 2.0
+        ) / 1_000_000
+        self.assertAlmostEqual(usage["cost_usd"], expected, places=6)
+
+    def test_retry_override_applies_only_inside_the_block_and_thread(self):
+        def unavailable(*args, **kwargs):
+            raise HTTPError("https://api.openai.com", 503, "Service Unavailable", {}, None)
+
+        def attempts() -> int:
+            with self.assertRaises(HTTPError):
+                call_openai_json("gpt-5-mini", "Return JSON.", "job")
+            count = mocked.call_count
+            mocked.reset_mock()
+            return count
+
+        with (
+            patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}),
+            patch("job_search.llm_scoring.OPENAI_CLIENT.post_json", side_effect=unavailable) as mocked,
+            patch("job_search.llm_scoring.time.sleep"),
+        ):
+            with openai_call_retries(0):
+                inside = attempts()
+                other_thread = []
+                worker = threading.Thread(target=lambda: other_thread.append(attempts()))
+                worker.start()
+                worker.join()
+            after = attempts()
+
+        self.assertEqual((inside, other_thread, after), (1, [3], 3))
+
+    def test_close_leaves_in_flight_requests_alone_and_tracks_reopened_connections(self):
+        client = OpenAiHttpClient()
+        self.addCleanup(client.close)
+        payload = {"model": "gpt-5-mini", "messages": []}
+        results = []
+        with SimulatedLlmEndpoint(SimulatedLlmProfile(capacity=4, latency_ms=300, jitter=0)) as endpoint:
+            url = f"{endpoint.base_url}/chat/completions"
+            worker = threading.Thread(target=lambda: results.append(client.post_json(url, payload, {}, 5)))
+            worker.start()
+            deadline = time.monotonic() + 3
+            while not client._busy and time.monotonic() < deadline:
+                time.sleep(0.01)
+            (in_flight,) = client._busy
+            client.close()
+            worker.join(5)
+            # The request that was running during close() still gets its response; its socket is closed afterwards.
+            self.assertEqual(json.loads(results[0][0]["choices"][0]["message"]["content"])["tier"], "B")
+            self.assertIsNone(in_flight.sock)
+
+            _, reused = client.post_json(url, payload, {}, 5)
+            _, reused_again = client.post_json(url, payload, {}, 5)
+            (reopened,) = client._connections
+            self.assertFalse(reused)
+            self.assertTrue(reused_again)
+            self.assertIsNot(reopened, in_flight)
+            client.close()
+            self.assertIsNone(reopened.sock)
+
+    def test_streamed_non_posting_is_cancelled_after_the_decision_field(self):
+        self.addCleanup(LLM_USAGE.reset)
+        self.addCleanup(OPENAI_CLIENT.close)
+        LLM_USAGE.reset()
+        profile = SimulatedLlmProfile(capacity=4, latency_ms=1, jitter=0, token_latency_ms=5)
+        posting = {"is_job_posting": True, "score": 71, "tier": "A", "title": "Platform Engineer"}
+        navigation = {"is_job_posting": False, "score": 0, "description": "Similar jobs near you " * 100}
+        job = {"url": "https://jobs.example.com/stream", "title": "Platform Engineer", "description": "Remote role"}
+        with SimulatedLlmEndpoint(profile, content=navigation) as endpoint:
+            env = {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": endpoint.base_url}
+            with patch.dict(os.environ, env):
+                started = time.monotonic()
+                dropped = llm_parse_job(job, profile={}, constraints={}, model="gpt-5-mini", stream=True)
+                aborted_after = time.monotonic() - started
+                endpoint.content = posting
+                kept = llm_parse_job(job, profile={}, constraints={}, model="gpt-5-mini", stream=True)
+            deadline = time.monotonic() + 3
+            while endpoint.stats["streams_cancelled"] < 1 and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+        # The full navigation payload takes ~3s to stream at 5ms per 4-character chunk.
+        self.assertLess(aborted_after, 1.0)
+        self.assertFalse(dropped["is_job_posting"])
+        self.assertTrue(kept["is_job_posting"])
+        self.assertEqual(kept["score"], 71)
+        self.assertEqual(endpoint.stats["streams_cancelled"], 1)
+        streaming = LLM_USAGE.snapshot()["streaming"]
+        self.assertEqual((streaming["calls"], streaming["aborted"]), (2, 1))
+        self.assertGreater(streaming["avg_time_to_decision_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from job_search.near_duplicates import (
+    SimHashIndex,
+    canonical_member,
+    cluster_near_duplicates,
+    hamming,
+    job_fingerprint,
+)
+
+_DESCRIPTION = (
+    "We are looking for a Senior Platform Engineer to join our infrastructure team in Innsbruck. "
+    "You will design and operate our Kubernetes clusters, build Terraform modules for AWS, improve CI/CD "
+    "pipelines and mentor other engineers. You have several years of Python or Go experience, know how to "
+    "run distributed systems in production and enjoy on-call work that is well organised. We offer a hybrid "
+    "setup, flexible hours, a yearly training budget and a salary from EUR 65,000 gross per year depending "
+    "on experience. "
+)
+
+
+class NearDuplicateTests(unittest.TestCase):
+    def test_cross_posted_role_clusters_but_sibling_role_does_not(self):
+        karriere = {"title": "Senior Platform Engineer (m/w/d)", "company": "ACME GmbH", "description": _DESCRIPTION}
+        stepstone = {
+            "title": "Senior Platform Engineer",
+            "company": "ACME GmbH",
+            "description": "Jetzt bewerben auf StepStone. " + _DESCRIPTION + " Share this job.",
+        }
+        sibling = {"title": "Junior Frontend Developer", "company": "ACME GmbH", "description": _DESCRIPTION}
+        other = {
+            "title": "Data Analyst",
+            "company": "Other AG",
+            "description": "SQL, dashboards and stakeholder reporting for our retail business in Vienna. " * 3,
+        }
+        jobs = [karriere, other, stepstone, sibling]
+
+        self.assertLessEqual(hamming(job_fingerprint(karriere), job_fingerprint(stepstone)), 7)
+        clusters = cluster_near_duplicates(jobs)
+        self.assertEqual(clusters, [[0, 2]])
+        self.assertEqual(canonical_member(jobs, clusters[0]), 2)
+
+    def test_index_finds_hashes_within_distance_only(self):
+        index = SimHashIndex(max_distance=3)
+        base = 0x0F0F_F0F0_1234_5678
+        index.add(1, base)
+        index.add(2, base ^ 0b111)  # 3 bits away
+        index.add(3, base ^ 0xFF)  # 8 bits away
+        self.assertEqual(index.query(base), [1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,21 @@
+import tempfile
 import unittest
 from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from job_search.detail_cache import DetailCache
+from job_search.fetch_backends import FetchResult
 
 from job_search.ingestion import (
     _extract_karriere_jobposting_from_html,
     _extract_indeed_jobposting_from_html,
     _extract_stepstone_detail_from_snapshot,
     _extract_stepstone_jobposting_from_html,
+    _enrich_stepstone_with_detail_pages,
+    configure_detail_cache,
+    enrich_job_detail,
+    enrich_job_details,
     parse_greenhouse_jobs,
     parse_indeed_listing_html,
     parse_karriere_html,
@@ -292,6 +302,75 @@ class ParsingTests(unittest.TestCase):
         published_dt = datetime.fromisoformat(parsed["published"])
         self.assertEqual(published_dt.tzinfo, timezone.utc)
 
+    def test_enrich_job_details_matches_per_job_merge_and_reports_failures(self):
+        html = (
+            '<html><head><title>Backend Engineer - Alpine GmbH - karriere.at</title>'
+            '<script type="application/ld+json">{"@type": "JobPosting", "title": "Backend Engineer", '
+            '"hiringOrganization": {"name": "Alpine GmbH"}, "description": "<p>Python in Innsbruck</p>", '
+            '"jobLocation": {"address": {"addressLocality": "Innsbruck"}}}</script></head></html>'
+        )
+        jobs = [
+            {"id": "k:1", "url": "https://www.karriere.at/jobs/1111111", "title": "Karriere.at listing 1111111"},
+            {"id": "rss:1", "url": "https://example.com/jobs/1", "title": "Remote Engineer"},
+            {"id": "k:2", "url": "https://www.karriere.at/jobs/2222222", "title": "Karriere.at listing 2222222"},
+        ]
+
+        def fake_fetch_url(url: str, timeout: int = 20) -> str:
+            if url.endswith("2222222"):
+                raise RuntimeError("detail page timeout")
+            return html
+
+        with patch("job_search.ingestion.fetch_url", side_effect=fake_fetch_url):
+            expected = [enrich_job_detail(j) for j in jobs]
+            out, stats = enrich_job_details(jobs, max_workers=3, per_domain_concurrency=2, requests_per_second=0)
+
+        self.assertEqual(out, expected)
+        self.assertEqual(out[0]["company"], "Alpine GmbH")
+        self.assertEqual(stats["candidates"], 2)
+        self.assertEqual(stats["enriched"], 1)
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual([x["url"] for x in stats["errors"]], [jobs[2]["url"]])
+        self.assertIn("timeout", stats["errors"][0]["error"])
+
+    def test_stepstone_detail_cache_hits_do_not_consume_detail_budget(self):
+        def detail_html(url: str) -> str:
+            return (
+                '<script type="application/ld+json">{"@type": "JobPosting", "title": "Platform Engineer", '
+                '"hiringOrganization": {"name": "Acme GmbH"}, "description": "<p>' + ("Kubernetes and Python. " * 20) + url + '</p>"}</script>'
+            )
+
+        fetched_urls = []
+
+        def fake_fetch(url, backends, timeout_sec):
+            fetched_urls.append(url)
+            return FetchResult(text=detail_html(url), backend="curl_cffi", url=url, status_code=200)
+
+        def listing(n: int) -> dict:
+            return {"url": f"https://www.stepstone.at/stellenangebote--job-{n}.html", "title": f"Job {n}", "company": "Acme GmbH", "description": "short"}
+
+        strategy = {"detail_max_jobs": 1, "detail_delay_min_ms": 0, "detail_delay_max_ms": 0, "detail_backends": ["curl_cffi"]}
+        with tempfile.TemporaryDirectory() as td:
+            cache = configure_detail_cache(DetailCache(Path(td) / "detail_cache.sqlite", ttl_hours=24))
+            # Job 3 was enriched by an earlier run under another listing title, so its entry is stale.
+            cache.put({**listing(3), "title": "Job 3 (old)"}, {"description": "Stale description " * 20}, kind="stepstone")
+            try:
+                with patch("job_search.ingestion.fetch_with_backends", side_effect=fake_fetch):
+                    _enrich_stepstone_with_detail_pages([listing(1)], strategy=strategy)
+                    second_run = _enrich_stepstone_with_detail_pages(
+                        [listing(1), listing(3), listing(2)],
+                        strategy=strategy,
+                    )
+            finally:
+                configure_detail_cache(None)
+
+        # Job 1 comes from the cache, so the single fetch goes to job 3; job 2 stays unenriched.
+        self.assertEqual(fetched_urls, [listing(1)["url"], listing(3)["url"]])
+        self.assertIn(listing(1)["url"], second_run[0]["description"])
+        self.assertIn(listing(3)["url"], second_run[1]["description"])
+        self.assertEqual(second_run[2]["description"], "short")
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["stale"], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
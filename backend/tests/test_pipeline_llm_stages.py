@@ -0,0 +1,469 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from job_search.fetch_archive import FetchArchive
+from job_search.ingestion import fetch_url as archived_fetch_url
+from job_search.json_io import save_json
+from job_search.pipeline import run_pipeline
+
+
+class FixedDateTime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        base = datetime(2026, 1, 7, 9, 0, 0)
+        if tz is not None:
+            return base.replace(tzinfo=tz)
+        return base
+
+
+RSS_FIXTURE_SINGLE = """
+<rss>
+  <channel>
+    <item>
+      <title>Platform Engineer</title>
+      <link>https://jobs.example.com/new-platform</link>
+      <description><![CDATA[Remote in Europe platform role]]></description>
+      <pubDate>Mon, 01 Jan 2026 10:00:00 +0000</pubDate>
+      <guid>new-platform</guid>
+    </item>
+  </channel>
+</rss>
+""".strip()
+
+
+_EU_PLATFORM_ITEM = """
+    <item>
+      <title>Platform Engineer</title>
+      <link>https://jobs.example.com/eu-platform</link>
+      <description><![CDATA[Remote in Europe platform role]]></description>
+      <guid>eu-platform</guid>
+    </item>
+"""
+
+RSS_FIXTURE_TRIAGE = """
+<rss>
+  <channel>
+    <item>
+      <title>Platform Engineer</title>
+      <link>https://jobs.example.com/eu-platform</link>
+      <description><![CDATA[Remote in Europe platform role]]></description>
+      <guid>eu-platform</guid>
+    </item>
+    <item>
+      <title>Platform Engineer</title>
+      <link>https://jobs.example.com/us-platform</link>
+      <description><![CDATA[Remote, US only, platform role]]></description>
+      <guid>us-platform</guid>
+    </item>
+  </channel>
+</rss>
+""".strip()
+
+
+_LONG_ROLE_TEXT = (
+    "Remote in Europe platform role. You will design and operate our Kubernetes clusters, build Terraform "
+    "modules, improve CI/CD pipelines and mentor other engineers across the distributed systems group."
+)
+
+RSS_FIXTURE_CROSS_POSTED = f"""
+<rss>
+  <channel>
+    <item>
+      <title>Platform Engineer (m/w/d)</title>
+      <link>https://jobs.example.com/platform-a</link>
+      <description><![CDATA[{_LONG_ROLE_TEXT}]]></description>
+      <guid>platform-a</guid>
+    </item>
+    <item>
+      <title>Platform Engineer</title>
+      <link>https://mirror.example.org/platform-b</link>
+      <description><![CDATA[{_LONG_ROLE_TEXT} Apply today.]]></description>
+      <guid>platform-b</guid>
+    </item>
+  </channel>
+</rss>
+""".strip()
+
+
+RSS_FIXTURE_PRIORITY = """
+<rss>
+  <channel>
+    <item>
+      <title>Support Agent</title>
+      <link>https://jobs.example.com/support</link>
+      <description><![CDATA[Office role answering customer tickets]]></description>
+      <guid>support</guid>
+    </item>
+    <item>
+      <title>Senior Platform Engineer</title>
+      <link>https://jobs.example.com/senior-platform</link>
+      <description><![CDATA[Remote in Europe. Python, Kubernetes, Terraform, distributed systems platform.]]></description>
+      <guid>senior-platform</guid>
+    </item>
+  </channel>
+</rss>
+""".strip()
+
+
+def _fake_llm_eval(job, profile, constraints, model, description_max_chars=2500, input_description_max_chars=20000):
+    return {
+        "is_job_posting": True,
+        "title": str(job.get("title") or ""),
+        "company": str(job.get("company") or "Unknown"),
+        "location": str(job.get("location") or "Europe"),
+        "remote_hint": bool(job.get("remote_hint", True)),
+        "description": str(job.get("description") or ""),
+        "published": str(job.get("published") or ""),
+        "score": 79,
+        "tier": "A",
+        "reasons": ["llm prototype scoring"],
+        "summary": "Prototype parse+score output",
+        "quality_flags": [],
+        "confidence": 0.9,
+    }
+
+
+@contextmanager
+def _pipeline_env(root: Path, rss: str, scoring_cfg: dict, llm_eval=_fake_llm_eval, runtime_cfg: dict | None = None):
+    """Fixture config tree under `root`, with the feed, LLM calls, clock and output patched for `run_pipeline`."""
+    config_dir, data_dir, output_dir = root / "config", root / "data", root / "output"
+    for path in (config_dir, data_dir, output_dir):
+        path.mkdir(parents=True, exist_ok=True)
+    save_json(
+        config_dir / "profile.json",
+        {
+            "location": "Innsbruck, Austria",
+            "target_titles": ["Senior Software Engineer", "Platform Engineer"],
+            "must_have_any": ["senior", "lead", "staff", "architect"],
+            "skills": ["python", "kubernetes", "terraform"],
+            "preferred_keywords": ["distributed systems", "platform", "cloud"],
+            "exclude_keywords": ["intern", "junior"],
+            "local_first": True,
+        },
+    )
+    save_json(
+        config_dir / "constraints.json",
+        {
+            "require_remote_or_target_location": True,
+            "prefer_local_strong": True,
+            "target_location_keywords": ["innsbruck", "austria"],
+            "preferred_remote_regions": ["europe", "eu", "cet"],
+            "disallowed_remote_markers": ["us only"],
+            "exclude_if_contains": ["security clearance"],
+        },
+    )
+    save_json(
+        config_dir / "sources.json",
+        {"rss_sources": [{"name": "Fixture RSS", "url": "fixture://rss", "type": "remote"}]},
+    )
+    save_json(config_dir / "scoring.json", {"llm_pipeline": {"enabled": True, "model": "gpt-5-mini"}, **scoring_cfg})
+    save_json(
+        config_dir / "runtime.json",
+        {"source_fetch": {"max_retries": 0, "backoff_seconds": 0}, **(runtime_cfg or {})},
+    )
+    save_json(config_dir / "database.json", {"enabled": False})
+    save_json(data_dir / "applied_jobs.json", {"applied": []})
+    with (
+        patch("job_search.pipeline.CONFIG", config_dir),
+        patch("job_search.pipeline.DATA", data_dir),
+        patch("job_search.pipeline.OUTPUT", output_dir),
+        patch("job_search.pipeline.fetch_url", return_value=rss) as mocked_fetch,
+        patch("job_search.pipeline.llm_parse_job", side_effect=llm_eval) as mocked_eval,
+        patch("job_search.pipeline.datetime", FixedDateTime),
+        patch("job_search.ingestion.datetime", FixedDateTime),
+        patch("job_search.reporting.datetime", FixedDateTime),
+        patch("builtins.print"),
+    ):
+        yield SimpleNamespace(
+            config_dir=config_dir, data_dir=data_dir, output_dir=output_dir, fetch=mocked_fetch, llm=mocked_eval
+        )
+
+
+def _ranked_by_url(data_dir: Path) -> dict[str, dict]:
+    return {row["url"]: row for row in json.loads((data_dir / "jobs_normalized.json").read_text())}
+
+
+class _StandInBatchApi(BaseHTTPRequestHandler):
+    """Local emulation of the Files/Batches endpoints; batches finish when `complete` is set."""
+
+    files: dict[str, str] = {}
+    batches: dict[str, dict] = {}
+    complete = False
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, payload, content_type="application/json"):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/v1/files":
+            start = body.index(b"\r\n\r\n", body.index(b'name="file"')) + 4
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = body[start : body.rindex(b"\r\n--")].decode("utf-8")
+            return self._send({"id": file_id, "purpose": "batch"})
+        if self.path == "/v1/batches":
+            batch_id = f"batch-{len(self.batches) + 1}"
+            self.batches[batch_id] = {"id": batch_id, "input_file_id": json.loads(body)["input_file_id"]}
+            return self._send({**self.batches[batch_id], "status": "validating"})
+        self.send_error(404)
+
+    def do_GET(self):
+        if self.path.startswith("/v1/batches/"):
+            batch = self.batches[self.path.rsplit("/", 1)[1]]
+            if not self.complete:
+                return self._send({**batch, "status": "in_progress"})
+            lines = []
+            for line in self.files[batch["input_file_id"]].splitlines():
+                request = json.loads(line)
+                raw_item = json.loads(request["body"]["messages"][1]["content"])["raw_item"]
+                content = _fake_llm_eval(raw_item, {}, {}, request["body"]["model"])
+                lines.append(
+                    json.dumps(
+                        {
+                            "custom_id": request["custom_id"],
+                            "response": {
+                                "status_code": 200,
+                                "body": {"choices": [{"message": {"content": json.dumps(content)}}]},
+                            },
+                        }
+                    )
+                )
+            self.files["file-out"] = "\n".join(lines)
+            return self._send({**batch, "status": "completed", "output_file_id": "file-out"})
+        if self.path.startswith("/v1/files/") and self.path.endswith("/content"):
+            return self._send(self.files[self.path.split("/")[3]].encode("utf-8"), "application/jsonl")
+        self.send_error(404)
+
+
+class PipelineLlmStageTests(unittest.TestCase):
+    def test_pre_triage_settles_hard_constraint_failures_without_llm(self):
+        with tempfile.TemporaryDirectory() as td:
+            with _pipeline_env(Path(td), RSS_FIXTURE_TRIAGE, {"pre_triage": {"enabled": True}}) as env:
+                summary = run_pipeline()
+
+            self.assertEqual(env.llm.call_count, 1)
+            self.assertEqual(summary["pre_triage"]["llm_calls_saved"], 1)
+            self.assertEqual(summary["pre_triage"]["reasons"], {"geo restricted remote": 1})
+            self.assertEqual(summary["total"], 2)
+            ranked = _ranked_by_url(env.data_dir)
+            self.assertEqual(ranked["https://jobs.example.com/us-platform"]["scored_by"], "rules")
+            self.assertEqual(ranked["https://jobs.example.com/us-platform"]["tier"], "C")
+            self.assertTrue(ranked["https://jobs.example.com/eu-platform"]["scored_by"].startswith("llm:"))
+
+    def test_batched_llm_mode_falls_back_per_job_for_missing_items(self):
+        def fake_batch(jobs, profile, constraints, model, **kwargs):
+            # The model dropped the second item.
+            return [_fake_llm_eval(jobs[0], profile, constraints, model), None]
+
+        scoring = {"llm_pipeline": {"enabled": True, "model": "gpt-5-mini", "batch": {"enabled": True, "max_items": 4}}}
+        with tempfile.TemporaryDirectory() as td:
+            with (
+                _pipeline_env(Path(td), RSS_FIXTURE_TRIAGE, scoring) as env,
+                patch("job_search.pipeline.llm_parse_jobs_batch", side_effect=fake_batch) as mocked_batch,
+            ):
+                first = run_pipeline()
+                second = run_pipeline()
+
+        self.assertEqual(mocked_batch.call_count, 1)
+        self.assertEqual(env.llm.call_count, 1)
+        self.assertEqual(first["llm"]["batch"]["requests"], 1)
+        self.assertEqual(first["llm"]["batch"]["fallback_jobs"], 1)
+        self.assertEqual(first["llm"]["scored_live"], 2)
+        # Both results were cached individually.
+        self.assertEqual(second["llm"]["cache_hits"], 2)
+
+    def test_batch_api_mode_defers_jobs_and_collects_results_on_resume(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInBatchApi)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(setattr, _StandInBatchApi, "complete", False)
+        scoring = {"llm_pipeline": {"enabled": True, "model": "gpt-5-mini", "batch_api": {"enabled": True, "wait_sec": 0}}}
+        env_vars = {"OPENAI_API_KEY": "test-key", "OPENAI_BASE_URL": f"http://127.0.0.1:{server.server_port}/v1"}
+        with tempfile.TemporaryDirectory() as td:
+            with patch.dict(os.environ, env_vars), _pipeline_env(Path(td), RSS_FIXTURE_SINGLE, scoring) as env:
+                submitted = run_pipeline()
+                self.assertTrue((env.data_dir / "llm_batch_state.json").exists())
+                # A posting that shows up while the batch is still running is not held back.
+                env.fetch.return_value = RSS_FIXTURE_SINGLE.replace("</channel>", _EU_PLATFORM_ITEM + "</channel>")
+                pending = run_pipeline()
+                env.fetch.return_value = RSS_FIXTURE_SINGLE
+                _StandInBatchApi.complete = True
+                resumed = run_pipeline()
+            self.assertFalse((env.data_dir / "llm_batch_state.json").exists())
+
+        self.assertEqual(submitted["llm"]["batch_api"]["submitted_jobs"], 1)
+        self.assertEqual(submitted["llm"]["batch_api"]["deferred_jobs"], 1)
+        self.assertEqual(submitted["total"], 0)
+        self.assertEqual(env.llm.call_count, 1)
+        self.assertEqual(env.llm.call_args.kwargs["job"]["url"], "https://jobs.example.com/eu-platform")
+        self.assertEqual(pending["llm"]["batch_api"]["deferred_jobs"], 1)
+        self.assertEqual(pending["total"], 1)
+        self.assertEqual(resumed["llm"]["batch_api"]["collected_jobs"], 1)
+        self.assertEqual(resumed["llm"]["batch_api"]["status"], "completed")
+        self.assertEqual(resumed["llm"]["cache_hits"], 1)
+        self.assertEqual(resumed["total"], 1)
+
+    def test_near_duplicates_are_scored_once_and_linked(self):
+        with tempfile.TemporaryDirectory() as td:
+            with _pipeline_env(Path(td), RSS_FIXTURE_CROSS_POSTED, {"near_duplicates": {"enabled": True}}) as env:
+                summary = run_pipeline()
+            ranked = _ranked_by_url(env.data_dir)
+
+        self.assertEqual(env.llm.call_count, 1)
+        self.assertEqual(summary["near_duplicates"]["duplicates"], 1)
+        self.assertEqual(summary["total"], 2)
+        canonical = ranked["https://mirror.example.org/platform-b"]
+        duplicate = ranked["https://jobs.example.com/platform-a"]
+        self.assertNotIn("duplicate_of", canonical)
+        self.assertEqual(duplicate["duplicate_of"], "https://mirror.example.org/platform-b")
+        self.assertEqual(duplicate["score"], canonical["score"])
+        self.assertEqual(duplicate["title"], "Platform Engineer (m/w/d)")
+
+    def test_scheduler_spends_token_budget_on_highest_prior_first(self):
+        scheduler = {"enabled": True, "token_budget": 1000, "overhead_tokens": 900}
+        scoring = {"llm_pipeline": {"enabled": True, "model": "gpt-5-mini", "scheduler": scheduler}}
+        with tempfile.TemporaryDirectory() as td:
+            with _pipeline_env(Path(td), RSS_FIXTURE_PRIORITY, scoring) as env:
+                summary = run_pipeline()
+
+        # The listed-first support role no longer wins just by position.
+        self.assertEqual(env.llm.call_count, 1)
+        self.assertEqual(env.llm.call_args.kwargs["job"]["url"], "https://jobs.example.com/senior-platform")
+        self.assertEqual(summary["llm"]["scheduler"]["budget_skipped"], 1)
+        self.assertEqual(summary["llm"]["overflow_skipped"], 1)
+        self.assertLessEqual(summary["llm"]["scheduler"]["estimated_tokens_used"], 1000)
+
+    def test_replay_is_cache_only_and_leaves_live_outputs_alone(self):
+        with tempfile.TemporaryDirectory() as td:
+            with _pipeline_env(Path(td), RSS_FIXTURE_SINGLE, {}) as env:
+                run_pipeline()
+                board = (env.data_dir / "jobs_normalized.json").read_text()
+                report = (env.output_dir / "latest_report.json").read_text()
+                # The recorded feed has one posting the cache has not seen; replayed fetches go through the archive.
+                feed = RSS_FIXTURE_SINGLE.replace("</channel>", _EU_PLATFORM_ITEM + "</channel>")
+                FetchArchive(env.data_dir / "fetch_archive").record(
+                    "recorded-run",
+                    "fixture://rss",
+                    SimpleNamespace(url="", backend="http", status_code=200, content_type="text/xml", text=feed),
+                )
+                env.fetch.side_effect = archived_fetch_url
+                replayed = run_pipeline(replay_run_id="recorded-run")
+
+                self.assertEqual(env.llm.call_count, 1)
+                self.assertEqual(replayed["replay"]["served"], 1)
+                self.assertEqual(replayed["replay"]["llm_skipped"], 1)
+                self.assertEqual((replayed["total"], replayed["llm"]["cache_hits"]), (1, 1))
+                self.assertEqual((env.data_dir / "jobs_normalized.json").read_text(), board)
+                self.assertEqual((env.output_dir / "latest_report.json").read_text(), report)
+                self.assertEqual(json.loads((env.output_dir / "replay_report.json").read_text())["total"], 1)
+                self.assertEqual(len((env.data_dir / "pipeline_runs.jsonl").read_text().splitlines()), 1)
+
+    def test_cascade_escalates_only_promising_first_pass_results(self):
+        def fake_eval(**kwargs):
+            out = _fake_llm_eval(**kwargs)
+            if kwargs["model"] == "gpt-5-nano" and "support" in kwargs["job"]["url"]:
+                out["score"] = 20
+            return out
+
+        cascade = {"enabled": True, "first_pass_model": "gpt-5-nano", "escalate_min_score": 50}
+        scoring = {"llm_pipeline": {"enabled": True, "model": "gpt-5-mini", "cascade": cascade}}
+        with tempfile.TemporaryDirectory() as td:
+            with _pipeline_env(Path(td), RSS_FIXTURE_PRIORITY, scoring, llm_eval=fake_eval) as env:
+                run1 = run_pipeline()
+                calls = sorted(
+                    (c.kwargs["model"], c.kwargs["job"]["url"].rsplit("/", 1)[-1]) for c in env.llm.call_args_list
+                )
+                run2 = run_pipeline()
+            ranked = _ranked_by_url(env.data_dir)
+
+        self.assertEqual(
+            calls,
+            [("gpt-5-mini", "senior-platform"), ("gpt-5-nano", "senior-platform"), ("gpt-5-nano", "support")],
+        )
+        self.assertEqual(run1["llm"]["cascade"]["escalated"], 1)
+        self.assertEqual(run1["llm"]["cascade"]["settled_by_first_pass"], 1)
+        self.assertEqual(set(run1["llm"]["cascade"]["tiers"]), {"first_pass", "escalation"})
+        self.assertEqual(ranked["https://jobs.example.com/support"]["scored_by"], "llm:gpt-5-nano:cache")
+        self.assertEqual(ranked["https://jobs.example.com/senior-platform"]["scored_by"], "llm:gpt-5-mini:cache")
+        # Both tiers were cached: the second run makes no calls.
+        self.assertEqual(env.llm.call_count, 3)
+        self.assertEqual(run2["llm"]["cache_hits"], 2)
+
+    def test_cascade_keeps_the_first_pass_when_escalation_fails(self):
+        escalation_down = [True]
+
+        def fake_eval(**kwargs):
+            if kwargs["model"] == "gpt-5-mini" and escalation_down[0]:
+                raise RuntimeError("HTTP Error 503: Service Unavailable")
+            return _fake_llm_eval(**kwargs)
+
+        cascade = {"enabled": True, "first_pass_model": "gpt-5-nano", "escalate_min_score": 50}
+        scoring = {"llm_pipeline": {"enabled": True, "model": "gpt-5-mini", "cascade": cascade}}
+        with tempfile.TemporaryDirectory() as td:
+            with _pipeline_env(Path(td), RSS_FIXTURE_SINGLE, scoring, llm_eval=fake_eval) as env:
+                run1 = run_pipeline()
+                escalation_down[0] = False
+                run2 = run_pipeline()
+            models = [c.kwargs["model"] for c in env.llm.call_args_list]
+
+        self.assertEqual(run1["llm"]["failed"], 1)
+        self.assertEqual(run1["llm"]["cascade"]["first_pass_live"], 1)
+        # The second run escalates from the cached first pass instead of paying for it again.
+        self.assertEqual(models, ["gpt-5-nano", "gpt-5-mini", "gpt-5-mini"])
+        self.assertEqual(run2["llm"]["cascade"]["escalated"], 1)
+
+    def test_profile_edit_rescores_cached_extraction_without_llm_calls(self):
+        def fake_extract(**kwargs):
+            job = kwargs["job"]
+            return {
+                "is_job_posting": True,
+                "title": str(job.get("title") or ""),
+                "company": "Example GmbH",
+                "location": "Remote, Europe",
+                "remote_hint": True,
+                "description": str(job.get("description") or ""),
+                "published": "",
+                "skills": ["Python", "Kubernetes"],
+                "seniority": "senior",
+                "summary": "Platform role",
+                "quality_flags": [],
+                "confidence": 0.9,
+            }
+
+        scoring = {"llm_pipeline": {"enabled": True, "model": "gpt-5-mini", "prompt_version": "v6-extract"}}
+        with tempfile.TemporaryDirectory() as td:
+            with _pipeline_env(Path(td), RSS_FIXTURE_SINGLE, scoring, llm_eval=fake_extract) as env:
+                run1 = run_pipeline()
+                profile = json.loads((env.config_dir / "profile.json").read_text())
+                profile["skills"] = []
+                save_json(env.config_dir / "profile.json", profile)
+                run2 = run_pipeline()
+
+        self.assertEqual(env.llm.call_count, 1)
+        self.assertEqual(run1["llm"]["scoring"], "rules_over_extraction")
+        self.assertEqual(run2["llm"]["cache_hits"], 1)
+        self.assertIn("skills (2)", run1["top"][0]["reasons"])
+        self.assertIn("seniority match", run1["top"][0]["reasons"])
+        self.assertNotIn("skills (2)", run2["top"][0]["reasons"])
+        self.assertEqual(run2["top"][0]["score"], run1["top"][0]["score"] - 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import sqlite3
 import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime
 from pathlib import Path
@@ -7,7 +9,7 @@ from unittest.mock import patch
 from uuid import UUID
 
 from job_search.json_io import save_json
-from job_search.pipeline import run_pipeline
+from job_search.pipeline import _run_source_fetch_stage, _source_host_key, run_pipeline
 
 
 class FixedDateTime(datetime):
@@ -168,6 +170,43 @@ class PipelineRetriesTests(unittest.TestCase):
             self.assertEqual(row[2], 1)
             self.assertIsNone(row[3])
 
+    def test_fetch_stage_caps_per_host_concurrency_and_keeps_plan_order(self):
+        lock = threading.Lock()
+        in_flight = {}
+        peak = {}
+
+        def fake_fetch_source_jobs(source, source_kind):
+            host = _source_host_key(source, source_kind)
+            with lock:
+                in_flight[host] = in_flight.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), in_flight[host])
+            time.sleep(0.05)
+            with lock:
+                in_flight[host] -= 1
+            if source["name"] == "broken":
+                raise ValueError("boom")
+            return [{"id": source["name"], "url": source["url"]}]
+
+        sources = [
+            ("html", {"name": "karriere-a", "url": "https://www.karriere.at/jobs/a"}),
+            ("html", {"name": "karriere-b", "url": "https://www.karriere.at/jobs/b"}),
+            ("rss", {"name": "remoteok", "url": "https://remoteok.com/feed.rss"}),
+            ("rss", {"name": "broken", "url": "https://weworkremotely.com/feed.rss"}),
+        ]
+        plans = [
+            {"source_kind": kind, "source": s, "host": _source_host_key(s, kind), "max_retries": 0, "skip_reason": None}
+            for kind, s in sources
+        ]
+        with patch("job_search.pipeline._fetch_source_jobs", side_effect=fake_fetch_source_jobs):
+            outcomes = _run_source_fetch_stage(plans, max_workers=4, per_host_concurrency=1, backoff_seconds=0)
+
+        self.assertEqual(peak["karriere.at"], 1)
+        self.assertEqual(len(outcomes), 4)
+        ordered = [outcomes[id(p)] for p in plans]
+        self.assertEqual([o["success"] for o in ordered], [True, True, True, False])
+        self.assertEqual(ordered[3]["error_text"], "boom")
+        self.assertEqual(ordered[0]["jobs"][0]["id"], "karriere-a")
+
 
 if __name__ == "__main__":
     unittest.main()
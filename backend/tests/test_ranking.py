@@ -1,6 +1,6 @@
 import unittest
 
-from job_search.ranking import score_job, skill_in_text
+from job_search.ranking import score_job, skill_in_text, triage_job
 
 
 PROFILE = {
@@ -39,6 +39,18 @@ class RankingTests(unittest.TestCase):
         self.assertEqual(tier, "B")
         self.assertIn("local-first role floor", reasons)
 
+    def test_rule_settled_triage_rows_use_configured_tier_thresholds(self):
+        job = {
+            "title": "Software Engineer",
+            "description": "Build backend services",
+            "location": "Innsbruck",
+            "source_type": "innsbruck",
+            "remote_hint": False,
+        }
+        needs_llm, fields = triage_job(job, PROFILE, CONSTRAINTS, min_rule_score=60, tier_thresholds={"A": 50, "B": 30})
+        self.assertFalse(needs_llm)
+        self.assertEqual((fields["score"], fields["tier"], fields["scored_by"]), (55, "A", "rules"))
+
     def test_disallowed_geo_remote_is_rejected(self):
         job = {
             "title": "Senior Platform Engineer",
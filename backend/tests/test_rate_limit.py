@@ -0,0 +1,58 @@
+import threading
+import time
+import unittest
+
+from job_search.rate_limit import HostRateLimiter, delay_range_to_pace, map_in_context
+
+
+class RateLimitTests(unittest.TestCase):
+    def test_same_host_is_spaced_while_other_hosts_overlap(self):
+        limiter = HostRateLimiter()
+        limiter.configure_host("stepstone.at", interval_sec=0.15, max_in_flight=4)
+        starts: dict[str, list[float]] = {"stepstone.at": [], "indeed.com": []}
+        lock = threading.Lock()
+
+        def fetch(url: str):
+            with limiter.acquire(url):
+                with lock:
+                    host = "stepstone.at" if "stepstone" in url else "indeed.com"
+                    starts[host].append(time.monotonic())
+
+        urls = [f"https://www.stepstone.at/job/{i}" for i in range(3)] + [f"https://at.indeed.com/job/{i}" for i in range(3)]
+        began = time.monotonic()
+        map_in_context(fetch, urls, max_workers=6)
+
+        stepstone = sorted(starts["stepstone.at"])
+        self.assertTrue(all(b - a >= 0.13 for a, b in zip(stepstone, stepstone[1:])))
+        # indeed.com has no pace configured, so its fetches do not queue behind StepStone's.
+        self.assertTrue(all(t - began < 0.1 for t in starts["indeed.com"]))
+        self.assertGreater(limiter.waited_ms["stepstone.at"], 0)
+
+    def test_reconfiguring_a_host_keeps_the_lowest_in_flight_cap(self):
+        limiter = HostRateLimiter()
+        limiter.configure_host("stepstone.at", interval_sec=0.0, max_in_flight=4)
+        limiter.configure_host("stepstone.at", interval_sec=0.0, max_in_flight=1)
+        limiter.configure_host("stepstone.at", interval_sec=0.0, max_in_flight=3)
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def fetch(url: str):
+            with limiter.acquire(url):
+                with lock:
+                    active["now"] += 1
+                    active["peak"] = max(active["peak"], active["now"])
+                time.sleep(0.02)
+                with lock:
+                    active["now"] -= 1
+
+        map_in_context(fetch, [f"https://www.stepstone.at/job/{i}" for i in range(4)], max_workers=4)
+
+        self.assertEqual(active["peak"], 1)
+
+    def test_delay_range_maps_to_interval_and_jitter(self):
+        self.assertEqual(delay_range_to_pace(500, 1300), (0.5, 0.8))
+        self.assertEqual(delay_range_to_pace(0, 0), (0.0, 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
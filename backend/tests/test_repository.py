@@ -61,6 +61,10 @@ class RepositoryTests(unittest.TestCase):
                     "source_errors": 0,
                     "error_message": None,
                     "summary": {"total": 1},
+                    "llm_prompt_tokens": 1200,
+                    "llm_completion_tokens": 300,
+                    "llm_cached_tokens": 800,
+                    "llm_cost_usd": 0.0008,
                 }
             )
             job = JobRecord.from_job(
@@ -120,6 +124,9 @@ class RepositoryTests(unittest.TestCase):
             self.assertEqual(runs_count, 1)
             self.assertEqual(rankings_count, 1)
             self.assertEqual(ranking_score, 77)
+            stored_run = repo.get_run("run-1")
+            self.assertEqual((stored_run["llm_prompt_tokens"], stored_run["llm_cached_tokens"]), (1200, 800))
+            self.assertAlmostEqual(stored_run["llm_cost_usd"], 0.0008)
 
     def test_search_ranked_jobs_sorts_newest_with_mixed_published_formats(self):
         with tempfile.TemporaryDirectory() as td:
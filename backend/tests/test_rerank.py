@@ -0,0 +1,226 @@
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from job_search.api_server import serve_api
+from job_search.json_io import save_json
+from job_search.llm_cache_store import LlmParseCache
+from job_search.models import JobRankingRecord, JobRecord, PipelineRunRecord, SourceFetchEventRecord
+from job_search.ranking import pre_triage_reject_reasons
+from job_search.rerank import rerank_job, rerank_run
+from job_search.storage.repository import JobSearchRepository
+
+_PROFILE = {
+    "target_titles": ["Platform Engineer"],
+    "must_have_any": ["senior"],
+    "skills": ["python", "kubernetes"],
+    "preferred_keywords": ["platform"],
+    "exclude_keywords": ["junior"],
+}
+
+_JOBS = [
+    {
+        "id": "job:llm",
+        "source": "Fixture",
+        "source_type": "remote",
+        "title": "Senior Platform Engineer",
+        "company": "ACME",
+        "location": "Remote, Europe",
+        "url": "https://jobs.example.com/llm",
+        "description": "Python and Kubernetes platform team, remote in Europe.",
+    },
+    {
+        "id": "job:rules",
+        "source": "Fixture",
+        "source_type": "remote",
+        "title": "Platform Engineer",
+        "company": "Beta",
+        "location": "Remote",
+        "url": "https://jobs.example.com/rules",
+        "description": "Python platform role, remote (US only).",
+    },
+]
+
+
+def _seed(root: Path) -> JobSearchRepository:
+    repo = JobSearchRepository(
+        db_url=f"sqlite:///{root / 'rerank.sqlite'}",
+        migrations_dir=Path(__file__).resolve().parents[1] / "db/migrations",
+        auto_migrate=True,
+    )
+    repo.initialize()
+    repo.persist_pipeline_snapshot(
+        run=PipelineRunRecord.from_run_record(
+            {
+                "run_id": "run-src",
+                "started_at": "2026-01-02T09:00:00+00:00",
+                "status": "success",
+                "llm_enabled": True,
+                "llm_model": "gpt-5-mini",
+                "summary": {"llm": {"usage": {"prompt_version": "v5"}}},
+            }
+        ),
+        jobs=[JobRecord.from_job(job) for job in _JOBS],
+        rankings=[
+            JobRankingRecord.from_ranked_job(
+                "run-src", {"id": "job:llm", "score": 66, "tier": "B", "scored_by": "llm:gpt-5-mini:live"}
+            ),
+            JobRankingRecord.from_ranked_job("run-src", {"id": "job:rules", "score": 40, "tier": "C"}),
+        ],
+        source_events=[
+            SourceFetchEventRecord.from_dict(
+                {"run_id": "run-src", "source_name": "Fixture", "attempts": 1, "success": True, "jobs_fetched": 2}
+            )
+        ],
+    )
+    for path, payload in (
+        ("config/profile.json", _PROFILE),
+        # The US-only job is now a hard geo reject and tier A starts at 60.
+        ("config/constraints.json", {"disallowed_remote_markers": ["us only"]}),
+        ("config/scoring.json", {"tier_thresholds": {"A": 60, "B": 40}, "pre_triage": {"enabled": True}}),
+    ):
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        save_json(root / path, payload)
+    cache = LlmParseCache(root / "data" / "llm_parse_cache.sqlite")
+    cache.put(
+        "k1",
+        {"is_job_posting": True, "score": 66, "reasons": ["cached"]},
+        model="gpt-5-mini",
+        prompt_version="v5",
+        job_url="https://jobs.example.com/llm",
+    )
+    cache.close()
+    return repo
+
+
+class RerankTests(unittest.TestCase):
+    def test_rerank_writes_derived_run_from_cache_and_current_config(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            repo = _seed(root)
+            with (
+                patch("job_search.rerank.CONFIG", root / "config"),
+                patch("job_search.rerank.DATA", root / "data"),
+            ):
+                summary = rerank_run(repo, "run-src", page_size=1, run_id="run-derived")
+
+            self.assertEqual(summary["rerank_of"], "run-src")
+            self.assertEqual(summary["tiers"], {"A": 1, "B": 0, "C": 1})
+            self.assertEqual(summary["rerank"]["llm_cache_hits"], 1)
+            self.assertEqual(summary["rerank"]["tier_changes"], 1)
+            rows = {row["job_id"]: row for page in repo.iter_run_rankings("run-derived") for row in page}
+            self.assertEqual((rows["job:llm"]["score"], rows["job:llm"]["tier"]), (66, "A"))
+            self.assertEqual(rows["job:llm"]["scored_by"], "llm:gpt-5-mini:cache")
+            self.assertEqual((rows["job:rules"]["score"], rows["job:rules"]["reasons"]), (0, ["geo restricted remote"]))
+            run = repo.get_run("run-derived")
+            self.assertEqual((run["status"], run["total_jobs"], run["a_tier"]), ("success", 2, 1))
+            # The source run is untouched.
+            self.assertEqual(len([r for page in repo.iter_run_rankings("run-src") for r in page]), 2)
+
+    def test_rerank_runs_stay_out_of_source_health_and_yield_windows(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            repo = _seed(root)
+            health = repo.get_source_health(window_runs=1, stale_after_hours=365 * 24)
+            source_yield = repo.get_source_yield(window_runs=1)
+            with (
+                patch("job_search.rerank.CONFIG", root / "config"),
+                patch("job_search.rerank.DATA", root / "data"),
+            ):
+                rerank_run(repo, "run-src", run_id="run-derived")
+
+            self.assertEqual(repo.get_run("run-derived")["derived_from"], "run-src")
+            self.assertEqual([row["source_name"] for row in health], ["Fixture"])
+            self.assertEqual(repo.get_source_health(window_runs=1, stale_after_hours=365 * 24), health)
+            self.assertEqual(source_yield, {"Fixture": 0.5})
+            self.assertEqual(repo.get_source_yield(window_runs=1), source_yield)
+            urls, _ = repo.get_recent_run_job_urls(window_runs=1)
+            self.assertEqual(len(urls), 2)
+
+    def test_geo_rejects_are_settled_by_rules_only_under_pre_triage(self):
+        job = _JOBS[1]
+        stored = {"job_id": job["id"], "score": 55, "tier": "B", "scored_by": "llm:gpt-5-mini:live"}
+        cached = {"score": 55, "reasons": ["cached"], "model": "gpt-5-mini"}
+        constraints = {"disallowed_remote_markers": ["us only"]}
+
+        kept = rerank_job(job, stored, cached, _PROFILE, constraints)
+        settled = rerank_job(
+            job,
+            stored,
+            cached,
+            _PROFILE,
+            constraints,
+            hard_reject_reasons=pre_triage_reject_reasons({"enabled": True}),
+        )
+
+        self.assertEqual((kept["score"], kept["scored_by"]), (55, "llm:gpt-5-mini:cache"))
+        self.assertEqual((settled["score"], settled["scored_by"]), (0, "rules"))
+        self.assertEqual(pre_triage_reject_reasons({"enabled": False, "hard_reject_reasons": ["x"]}), ())
+        self.assertEqual(
+            pre_triage_reject_reasons({"enabled": True, "reject_outside_target_location": True})[-1],
+            "not remote and outside target location",
+        )
+
+    def test_rerank_endpoint_refuses_while_a_pipeline_run_is_in_progress(self):
+        with tempfile.TemporaryDirectory() as td:
+            repo = _seed(Path(td))
+            server = serve_api(repo=repo, host="127.0.0.1", port=0)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            host, port = server.server_address
+            try:
+                with (
+                    patch("job_search.api_server.PipelineRunController.get_active", return_value={"running": True}),
+                    patch("job_search.api_server.rerank_run") as mocked_rerank,
+                ):
+                    with self.assertRaises(HTTPError) as busy:
+                        urlopen(
+                            Request(f"http://{host}:{port}/api/runs/run-src/rerank", method="POST", data=b""),
+                            timeout=5,
+                        )
+            finally:
+                server.shutdown()
+                thread.join(timeout=3)
+                server.server_close()
+
+            self.assertEqual(busy.exception.code, 409)
+            busy.exception.close()
+            mocked_rerank.assert_not_called()
+
+    def test_rerank_endpoint_creates_run_and_404s_unknown_runs(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            repo = _seed(root)
+            server = serve_api(repo=repo, host="127.0.0.1", port=0)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            host, port = server.server_address
+            base = f"http://{host}:{port}"
+            try:
+                with (
+                    patch("job_search.rerank.CONFIG", root / "config"),
+                    patch("job_search.rerank.DATA", root / "data"),
+                ):
+                    rerank_req = Request(base + "/api/runs/run-src/rerank", method="POST", data=b"")
+                    with urlopen(rerank_req, timeout=5) as resp:
+                        created = json.loads(resp.read().decode("utf-8"))
+                    with self.assertRaises(HTTPError) as missing:
+                        urlopen(Request(base + "/api/runs/nope/rerank", method="POST", data=b""), timeout=5)
+            finally:
+                server.shutdown()
+                thread.join(timeout=3)
+                server.server_close()
+
+            self.assertEqual(created["run"]["rerank_of"], "run-src")
+            self.assertEqual(missing.exception.code, 404)
+            missing.exception.close()
+            self.assertEqual(len(repo.get_recent_runs(limit=5)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()